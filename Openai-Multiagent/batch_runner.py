@@ -0,0 +1,214 @@
+"""
+Runs many inputs through an agent concurrently, for load tests and fleet sizing.
+
+- At most `concurrency` runs are in flight. Inputs are pulled lazily from any
+  iterable or async iterable, so a long or endless stream is fine.
+- All runs share one AsyncOpenAI client and its connection pool.
+- Results are yielded as runs finish, not in input order. Each RunRecord carries
+  its latency and token usage.
+
+Against the offline stub from function-calling/, which only serves the
+Responses API (so leave --chat-completions off):
+
+    python ../function-calling/stub_llm_server.py --port 8100 --latency-ms 300 --jitter-ms 100
+    python batch_runner.py --base-url http://127.0.0.1:8100/v1 --repeat 200 --concurrency 32
+
+Against OpenAI (OPENAI_API_KEY) or a vLLM server, with one input per line:
+
+    python batch_runner.py --inputs questions.txt --concurrency 8 --jsonl runs.jsonl
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Union
+
+import httpx
+from agents import Agent, OpenAIProvider, RunConfig, Runner
+from openai import AsyncOpenAI
+
+from agent import news_agent
+
+Inputs = Union[Iterable[str], AsyncIterable[str]]
+
+
+@dataclass
+class RunRecord:
+    index: int
+    input: str
+    output: Optional[str]
+    error: Optional[str]
+    latency_s: float
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+
+
+class BatchRunner:
+    """
+    - agent: starting agent of the graph (handoffs are followed as usual)
+    - concurrency: max runs in flight
+    - client: shared AsyncOpenAI; built from base_url/api_key when not given
+    """
+
+    def __init__(self, agent: Agent, concurrency: int = 8, model: str = "gpt-4o-mini",
+                 base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 client: Optional[AsyncOpenAI] = None, max_turns: int = 10, use_responses: bool = True):
+        self.agent = agent
+        self.concurrency = concurrency
+        self.max_turns = max_turns
+        # close() only closes a client built here; a passed-in one belongs to the caller
+        self._owns_client = client is None
+        if client is None:
+            # Pool sized to the concurrency so runs don't queue for connections
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+                timeout=httpx.Timeout(120.0, connect=5.0),
+            )
+            client = AsyncOpenAI(
+                base_url=base_url,
+                api_key=api_key or os.environ.get("OPENAI_API_KEY") or "EMPTY",
+                http_client=http_client,
+            )
+        self.client = client
+        self.run_config = RunConfig(
+            model=model,
+            model_provider=OpenAIProvider(openai_client=client, use_responses=use_responses),
+            # Traces go to OpenAI; pointless (and failing) against a stub or local server
+            tracing_disabled=base_url is not None,
+        )
+
+    async def run_one(self, index: int, text: str) -> RunRecord:
+        started = time.perf_counter()
+        try:
+            result = await Runner.run(self.agent, text, max_turns=self.max_turns, run_config=self.run_config)
+        except Exception as e:
+            return RunRecord(index, text, None, f"{type(e).__name__}: {e}", time.perf_counter() - started)
+        usage = result.context_wrapper.usage
+        return RunRecord(
+            index, text, str(result.final_output), None, time.perf_counter() - started,
+            requests=usage.requests,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            total_tokens=usage.total_tokens,
+        )
+
+    async def stream(self, inputs: Inputs) -> AsyncIterator[RunRecord]:
+        """Run every input, yielding each record as soon as its run finishes."""
+        source = _aiter(inputs)
+        pending = set()
+        index = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self.concurrency:
+                    try:
+                        text = await source.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.create_task(self.run_one(index, text)))
+                    index += 1
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # The consumer stopped early (break, error, cancellation): don't leave runs behind
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await source.aclose()
+
+    async def close(self):
+        if self._owns_client:
+            await self.client.close()
+
+
+async def _aiter(inputs: Inputs) -> AsyncIterator[str]:
+    if hasattr(inputs, "__aiter__"):
+        async for item in inputs:
+            yield item
+    else:
+        for item in inputs:
+            yield item
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else float("nan")
+
+
+def summarize(records: List[RunRecord], elapsed: float) -> Dict[str, Any]:
+    ok = [record for record in records if record.error is None]
+    latencies = [record.latency_s for record in ok]
+    return {
+        "runs": len(records),
+        "errors": len(records) - len(ok),
+        "elapsed_s": round(elapsed, 2),
+        "runs_per_s": round(len(ok) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_s": round(statistics.median(latencies), 3) if latencies else None,
+        "p95_s": round(percentile(latencies, 95), 3) if latencies else None,
+        "llm_requests": sum(record.requests for record in ok),
+        "input_tokens": sum(record.input_tokens for record in ok),
+        "output_tokens": sum(record.output_tokens for record in ok),
+        "tokens_per_run": round(sum(record.total_tokens for record in ok) / len(ok), 1) if ok else 0.0,
+    }
+
+
+def read_inputs(path: Optional[str], repeat: int) -> Iterable[str]:
+    if path is None:
+        lines = ["What is the latest news?"]
+    else:
+        with (sys.stdin if path == "-" else open(path)) as f:
+            lines = [line.strip() for line in f if line.strip()]
+    for _ in range(repeat):
+        yield from lines
+
+
+async def run(args) -> Dict[str, Any]:
+    runner = BatchRunner(news_agent, concurrency=args.concurrency, model=args.model, base_url=args.base_url,
+                         max_turns=args.max_turns, use_responses=not args.chat_completions)
+    records: List[RunRecord] = []
+    out = open(args.jsonl, "w") if args.jsonl else None
+    started = time.perf_counter()
+    try:
+        async for record in runner.stream(read_inputs(args.inputs, args.repeat)):
+            records.append(record)
+            if out is not None:
+                out.write(json.dumps(asdict(record)) + "\n")
+            if args.verbose:
+                status = record.error or (record.output or "")[:60]
+                print(f"#{record.index} {record.latency_s * 1000:.0f} ms, {record.total_tokens} tokens: {status}")
+    finally:
+        if out is not None:
+            out.close()
+        await runner.close()
+    return summarize(records, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--inputs", help="file with one input per line ('-' for stdin)")
+    parser.add_argument("--repeat", type=int, default=1, help="run the inputs this many times")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--base-url", help="OpenAI-compatible endpoint, e.g. a vLLM server or the stub")
+    parser.add_argument("--chat-completions", action="store_true",
+                        help="use /chat/completions, not /responses (vLLM or OpenAI; the stub has no such route)")
+    parser.add_argument("--max-turns", type=int, default=10)
+    parser.add_argument("--jsonl", help="write one record per run to this file")
+    parser.add_argument("--verbose", action="store_true", help="print each run as it finishes")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# batch_runner imports agent.py by bare name; the stub server lives in function-calling/
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "function-calling"))
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from openai import AsyncOpenAI
+
+from agent import news_agent
+from batch_runner import BatchRunner, summarize
+from stub_llm_server import StubLLMServer, StubScript
+
+
+@pytest.fixture
+def stub():
+    server = StubLLMServer(StubScript(latency_ms=100)).start()
+    yield server
+    server.stop()
+
+
+def run_batch(stub, inputs, concurrency):
+    async def run():
+        runner = BatchRunner(news_agent, concurrency=concurrency, base_url=stub.base_url, api_key="stub")
+        try:
+            return [record async for record in runner.stream(inputs)]
+        finally:
+            await runner.close()
+    return asyncio.run(run())
+
+
+def test_runs_every_input_with_bounded_concurrency(stub):
+    records = run_batch(stub, [f"question {i}" for i in range(12)], concurrency=4)
+    assert sorted(record.index for record in records) == list(range(12))
+    assert all(record.error is None and record.output == "Hello." for record in records)
+    assert stub.script.max_in_flight == 4
+    assert stub.script.requests == 12
+
+
+def test_records_usage_and_latency(stub):
+    async def inputs():
+        for text in ("a", "b", "c"):
+            yield text
+
+    records = run_batch(stub, inputs(), concurrency=2)
+    for record in records:
+        assert record.requests == 1
+        assert record.input_tokens > 0 and record.output_tokens > 0
+        assert record.total_tokens == record.input_tokens + record.output_tokens
+        assert record.latency_s >= 0.1
+    summary = summarize(records, elapsed=1.0)
+    assert summary["runs"] == 3 and summary["errors"] == 0
+    assert summary["llm_requests"] == 3
+    assert summary["input_tokens"] == sum(record.input_tokens for record in records)
+
+
+def test_failed_runs_are_recorded_not_raised(stub):
+    stub.script.error_rate = 1.0
+    records = run_batch(stub, ["x"], concurrency=1)
+    assert records[0].output is None
+    assert "503" in records[0].error
+    assert summarize(records, elapsed=1.0)["errors"] == 1
+
+
+def test_stopping_the_stream_early_cancels_runs_in_flight(stub):
+    async def run():
+        runner = BatchRunner(news_agent, concurrency=4, base_url=stub.base_url, api_key="stub")
+        try:
+            records = runner.stream([f"question {i}" for i in range(12)])
+            async for _ in records:
+                break
+            await records.aclose()
+            return asyncio.all_tasks() - {asyncio.current_task()}
+        finally:
+            await runner.close()
+
+    assert asyncio.run(run()) == set()
+    assert stub.script.requests < 12
+
+
+def test_close_leaves_a_borrowed_client_open(stub):
+    async def run():
+        borrowed = AsyncOpenAI(base_url=stub.base_url, api_key="stub")
+        runner = BatchRunner(news_agent, client=borrowed)
+        await runner.close()
+        owned = BatchRunner(news_agent, base_url=stub.base_url, api_key="stub")
+        await owned.close()
+        try:
+            return borrowed.is_closed(), owned.client.is_closed()
+        finally:
+            await borrowed.close()
+
+    assert asyncio.run(run()) == (False, True)
@@ -1,11 +1,24 @@
 import asyncio
 import json
-import queue
+import re
+import time
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union, Callable
-from openai import OpenAI
-from tools import mineflayer_tools
+from typing import Any, Dict, List, Literal, Optional, Sequence, Union
+from llm_client import LLMClient
+from model_router import ModelRouter
+from sessions import SessionStore
+from prompt_builder import PromptBuilder, PrefixCacheStats
+from actions import ActionTracker
+from bridge_profiler import BridgeProfiler
+from context_cache import GameContextCache, context_delta
+from tool_registry import ToolArgumentError, ToolRegistry, UnknownToolError, tool
+from tool_router import ToolRouter
+from tool_cache import ToolResultCache
+from whisper_scheduler import WhisperScheduler
+from delegation import DEFAULT_AGENTS, DelegatedTask, DelegationScheduler, SubAgent
 import traceback
+from contextlib import nullcontext
 
 # -----------------------------
 # Data models
@@ -15,6 +28,14 @@ class WhisperMessage:
     username: str
     message: str
     timestamp: float
+    kind: str = "whisper"  # or "task_update": a delegated task finished
+
+# Player whose conversation is running in the current task; processor tools that
+# act on behalf of "the player" (delegation, movement progress) read it
+_current_player: ContextVar[Optional[str]] = ContextVar("whisper_current_player", default=None)
+
+# Fractions of a move at which the player is told how far the bot has got
+MOVE_PROGRESS_MILESTONES = (0.25, 0.5, 0.75)
 
 # A simplified view of OpenAI Responses SDK result units
 @dataclass
@@ -24,50 +45,168 @@ class ResponseOutputMessage:
     # Optional metadata / extra fields can be added as needed
 
 # -----------------------------
-# Delegation primitives
+# Streaming helpers
 # -----------------------------
-@dataclass
-class DelegatedTask:
-    id: str
-    description: str
-    status: str  # pending, running, done, failed
-    result: Optional[Dict[str, Any]] = None
-    assigned_agent: Optional[str] = None  # e.g., "builder", "miner"
+class SentenceChunker:
+    """Buffers streamed text deltas and releases them as sentence-sized chunks."""
+
+    SENTENCE_END = re.compile(r"[.!?](?=\s)")
+
+    def __init__(self, max_chars: int = 200):
+        self.max_chars = max_chars
+        self.buffer = ""
+
+    def feed(self, delta: str) -> List[str]:
+        self.buffer += delta
+        chunks = []
+        while True:
+            match = self.SENTENCE_END.search(self.buffer)
+            if match:
+                cut = match.end()
+            elif len(self.buffer) >= self.max_chars:
+                # No sentence boundary yet; break at the last space so words stay whole
+                cut = self.buffer.rfind(" ", 0, self.max_chars) + 1 or self.max_chars
+            else:
+                break
+            chunk = self.buffer[:cut].replace("\n", " ").strip()
+            self.buffer = self.buffer[cut:]
+            if chunk:
+                chunks.append(chunk)
+        return chunks
+
+    def flush(self) -> List[str]:
+        chunk = self.buffer.replace("\n", " ").strip()
+        self.buffer = ""
+        return [chunk] if chunk else []
 
 
 class WhisperMessageProcessor:
-    def __init__(self, openai_client: OpenAI, minecraft_bot, GoalNear, model: str = "gpt-4o-mini"):
-        self.client = openai_client
+    def __init__(self, llm_client: Union[LLMClient, ModelRouter], minecraft_bot, GoalNear, model: str = "gpt-4o-mini",
+                 max_concurrent_conversations: int = 8, stream: bool = False,
+                 session_store: Optional[SessionStore] = None, summarize_sessions: bool = False,
+                 move_timeout: float = 60.0, profiler: Optional[BridgeProfiler] = None,
+                 context_cache: Optional[GameContextCache] = None, context_deltas: bool = True,
+                 toolset: Any = None, route_tools: bool = False,
+                 scheduler: Optional[WhisperScheduler] = None, cancel_superseded: bool = False,
+                 agents: Optional[Sequence[SubAgent]] = None, max_delegated_tasks: int = 2,
+                 tool_cache: Optional[ToolResultCache] = None):
+        # Shared async client with a pooled HTTP connection, or a ModelRouter over several
+        # backends (self.model is then replaced by the routed backend's)
+        self.client = llm_client
+        # Opt-in bridge instrumentation: every access to the bot proxy is counted and timed
+        self.profiler = profiler
+        if profiler is not None:
+            minecraft_bot = profiler.wrap(minecraft_bot, "bot")
         self.bot = minecraft_bot
         self.model = model
-        self.whisper_queue: "queue.Queue[WhisperMessage]" = queue.Queue()
+        # Fair, bounded intake: producers on other threads hand whispers to the loop with
+        # call_soon_threadsafe; workers await the scheduler's next pick (per-player fair
+        # queuing, priorities, rate limits, drop/merge on overflow)
+        self.scheduler = scheduler or WhisperScheduler()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
         self.running = False
         self.processor_task: Optional[asyncio.Task] = None
         self.GoalNear = GoalNear  # Used for pathfinding goals
-
-        # Task delegation queues and state
-        self.delegated_tasks: Dict[str, DelegatedTask] = {}
-        self.delegate_handlers: Dict[str, Callable[[DelegatedTask], asyncio.Task]] = {
-            # Example: "miner": self._delegate_to_miner, "builder": self._delegate_to_builder
+        # Long-running movements are awaited until the bot arrives, fails or times out
+        self.actions = ActionTracker(minecraft_bot, default_timeout=move_timeout)
+        # Streaming mode: dispatch tool calls and whisper text while the model is still generating
+        self.stream = stream
+        # Per-player memory across whispers; old turns are summarized (or dropped) over budget
+        self.sessions = session_store or SessionStore()
+        if summarize_sessions and self.sessions.summarizer is None:
+            self.sessions.summarizer = self._summarize_history
+        # Tools offered to the model: the @tool methods of `toolset` (e.g. a MinecraftBot
+        # wrapping the same bot) plus the processor's own, which win on name clashes
+        registries = [ToolRegistry.from_class(type(toolset)).bind(toolset)] if toolset is not None else []
+        self.tools = ToolRegistry.combine(*registries, self.tool_registry.bind(self))
+        # Stable prompt prefix for vLLM prefix caching, and the hit rate the backend reports
+        self.prompt_builder = PromptBuilder(self.tools.schemas())
+        # Optional per-request tool subsets chosen locally from the whisper and the tools
+        # the player used recently; falls back to the full set when unsure
+        self.tool_router = ToolRouter(self.tools) if route_tools else None
+        self.prefix_cache_stats = PrefixCacheStats()
+        # Event-maintained game context; with context_deltas, the context is kept in the
+        # conversation and later requests only carry the fields that changed
+        self.context_cache = context_cache
+        self.context_deltas = context_deltas
+        # Serializes exclusive tools (movement, digging, placing...) on this bot
+        self._body_lock = asyncio.Lock()
+        # Optional cache for read-only tools marked cacheable (look_around...),
+        # so the model re-asking within a conversation doesn't cost a bridge scan
+        self.tool_cache = tool_cache
+
+        # Worker pool: whispers from different players run concurrently, up to this many;
+        # the scheduler never hands out a player that is already in flight, so each
+        # player's whispers are still handled strictly in order
+        self.max_concurrent_conversations = max_concurrent_conversations
+        self._workers: List[asyncio.Task] = []
+        # Running conversation per player. With cancel_superseded, a new whisper from a
+        # player cancels it (stopping any movement); the queued whispers, coalesced by
+        # the scheduler, then run as the next turn with the cancelled one in history
+        self.cancel_superseded = cancel_superseded
+        self._conversations: Dict[str, asyncio.Task] = {}
+        self.superseded = 0
+
+        # Task delegation: sub-agents run long jobs as their own asyncio tasks, so the
+        # delegating conversation ends at once; a finished task comes back to the player's
+        # conversation as a "task_update" turn through the scheduler
+        self.delegate_handlers = {
+            agent.name: agent.handler(self)
+            for agent in (DEFAULT_AGENTS if agents is None else agents)
+            if self.prompt_builder.tool_subset(agent.tools)
         }
+        self.delegation = DelegationScheduler(
+            self.delegate_handlers, max_running=max_delegated_tasks, on_complete=self._on_delegated_done
+        )
+        self.delegated_tasks: Dict[str, DelegatedTask] = self.delegation.tasks
 
     # -----------------------------
     # Public API
     # -----------------------------
     def add_whisper(self, username: str, message: str):
+        """Queue a whisper. Safe to call from any thread (e.g. the JS bridge thread)."""
         whisper_msg = WhisperMessage(
             username=username,
             message=message,
-            timestamp=asyncio.get_event_loop().time() if asyncio._get_running_loop() else 0.0
+            timestamp=time.monotonic()
         )
-        self.whisper_queue.put(whisper_msg)
+        self._enqueue(whisper_msg)
         print(f"Added whisper from {username}: {message}")
 
+    def _enqueue(self, whisper_msg: WhisperMessage):
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            # Processor not started yet; the scheduler binds to the loop on first use
+            self._schedule(whisper_msg)
+            return
+        try:
+            on_loop_thread = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop_thread = False
+        if on_loop_thread:
+            self._schedule(whisper_msg)
+        else:
+            loop.call_soon_threadsafe(self._schedule, whisper_msg)
+
+    def _schedule(self, whisper_msg: WhisperMessage):
+        if not self.scheduler.put(whisper_msg):
+            print(f"Whisper queue full, dropped whisper from {whisper_msg.username}: {whisper_msg.message}")
+            return
+        # Only the player supersedes their turn; a delegated task update waits behind it,
+        # since the scheduler never hands out a player whose turn is still running
+        if self.cancel_superseded and whisper_msg.kind == "whisper":
+            conversation = self._conversations.get(whisper_msg.username)
+            if conversation is not None and not conversation.done():
+                print(f"Cancelling superseded conversation with {whisper_msg.username}")
+                self.superseded += 1
+                conversation.cancel()
+
     def start_processing(self):
         if self.running:
             print("Whisper processor already running")
             return
         self.running = True
+        self.loop = asyncio.get_running_loop()
         self.processor_task = asyncio.create_task(self._process_loop())
         print("Whisper message processor started")
 
@@ -75,58 +214,100 @@ class WhisperMessageProcessor:
         self.running = False
         if self.processor_task:
             self.processor_task.cancel()
+        for worker in self._workers:
+            worker.cancel()
+        self.actions.cancel_all()
+        self.delegation.cancel_all()
+        self._workers.clear()
+        self.scheduler.clear()
         print("Whisper message processor stopped")
 
     async def _process_loop(self):
+        # Fixed pool of workers pulling from the scheduler
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.max_concurrent_conversations)
+        ]
+        await asyncio.gather(*self._workers)
+
+    async def _get_next_whisper(self) -> WhisperMessage:
+        # Suspends until the scheduler has an eligible whisper; no polling while idle
+        return await self.scheduler.get()
+
+    async def _worker(self):
         while self.running:
             whisper_msg = await self._get_next_whisper()
-            if not whisper_msg:
-                await asyncio.sleep(0.1)
-                continue
+            username = whisper_msg.username
             print("Processing whisper:", whisper_msg)
-            await self._process_whisper_message(whisper_msg)
-            await asyncio.sleep(0.1)
-
-    async def _get_next_whisper(self) -> Optional[WhisperMessage]:
-        try:
-            return self.whisper_queue.get_nowait()
-        except queue.Empty:
-            return None
+            # Own task so a superseding whisper can cancel the conversation, not the worker
+            conversation = asyncio.create_task(self._process_whisper_message(whisper_msg))
+            self._conversations[username] = conversation
+            try:
+                await asyncio.wait({conversation})
+            except asyncio.CancelledError:
+                conversation.cancel()
+                raise
+            finally:
+                self._conversations.pop(username, None)
+                self.scheduler.done(username)
+            if conversation.cancelled():
+                print(f"Conversation with {username} superseded")
+            elif conversation.exception() is not None:
+                e = conversation.exception()
+                print(f"Error processing whisper from {username}: {e}")
+                traceback.print_exception(type(e), e, e.__traceback__)
 
     # -----------------------------
     # Core GPT workflow per whisper
     # -----------------------------
     async def _process_whisper_message(self, whisper_msg: WhisperMessage):
         print(f"Processing whisper from {whisper_msg.username}: {whisper_msg.message}")
-        conversation: List[Dict[str, Union[str, Any]]] = [
-            {
-                "role": "system",
-                "content": (
-                    "You are a Minecraft bot assistant. You can perform actions in Minecraft "
-                    "using function calls. When a user asks you to do something, use the appropriate "
-                    "functions to accomplish their request. If they're just talking, respond normally. "
-                    "Always give the absolute coordinate values for arguments. If you need relative ones, "
-                    "first query the current absolute coordinates and then calculate the relative ones. "
-                    "If more steps are needed after a function call, concisely state the next steps. "
-                    "If the task is large or long-running, you may delegate subtasks to specialized agents "
-                    "and mark this conversation pending until delegated tasks complete. Prefer delegation "
-                    "when the whisper queue is not empty."
-                    "If you need a reply based on the function call result, explicitly say it by response message"
-                    "Never use markdown formatting in your responses. "
-                    "Always use whisper function to send message to the user."
-                )
-            },
-            {
-                "role": "user",
-                "content": f"Message from {whisper_msg.username}: {whisper_msg.message}"
-            },
-            {
-                "role": "system",
-                "content": f"Game context: {self.get_game_context()}"
-            }
-        ]
+        _current_player.set(whisper_msg.username)
+        session = self.sessions.get(whisper_msg.username)
+        if whisper_msg.kind == "task_update":
+            turn: List[Dict[str, Any]] = [
+                {
+                    "role": "system",
+                    "content": f"Delegated task update for {whisper_msg.username}: {whisper_msg.message}"
+                }
+            ]
+        else:
+            turn = [
+                {
+                    "role": "user",
+                    "content": f"Message from {whisper_msg.username}: {whisper_msg.message}"
+                }
+            ]
+        conversation: List[Dict[str, Union[str, Any]]] = self.prompt_builder.conversation(
+            session.messages(), turn
+        )
 
-        await self._handle_gpt_conversation(conversation, whisper_msg)
+        turn_start = len(conversation) - len(turn)
+        try:
+            await self._handle_gpt_conversation(conversation, whisper_msg)
+        finally:
+            # Keep the user message and everything the assistant added for this whisper
+            await self.sessions.record_turn(session, conversation[turn_start:])
+
+    async def _summarize_history(self, previous_summary: str, messages: List[Dict[str, Any]]) -> str:
+        transcript = "\n".join(f"{m.get('role')}: {m.get('content')}" for m in messages)
+        response = await self.client.create_response(
+            purpose="summary",
+            model=self.model,
+            input=[
+                {
+                    "role": "system",
+                    "content": (
+                        "Summarize this Minecraft bot conversation in at most three sentences. "
+                        "Keep player requests, coordinates, items and unfinished tasks."
+                    )
+                },
+                {
+                    "role": "user",
+                    "content": f"Previous summary: {previous_summary or 'none'}\n\nNew messages:\n{transcript}"
+                }
+            ]
+        )
+        return getattr(response, "output_text", "") or ""
 
     async def _handle_gpt_conversation(self, conversation: List[Dict], whisper_msg: WhisperMessage):
         max_iterations = 10
@@ -138,40 +319,21 @@ class WhisperMessageProcessor:
                 print("\n" + "-" * 70 + "\n")
                 print(f"Conversation #{iteration+1}:", conversation)
 
-                response_units = await self._send_to_gpt(conversation)
-                if not response_units:
-                    break
-                
-                print('\nResponses: ', response_units)
-
-                for unit in response_units:
-
-                    # If plain text assistant message
-                    if hasattr(unit, 'content'):
-                        final_text = unit.content[0].text.replace("\n", " ").strip() if unit.content else str(unit)
-                        self.bot.whisper(whisper_msg.username, final_text)
-                        conversation.append({"role": "assistant", "content": final_text})
-                        print('\nSent response to user:', final_text)
-                        continue
-
-                    # Otherwise treat as tool/function call unit following OpenAI Responses API schema
-                    tool_calls = []
-                    if hasattr(unit, "type") and getattr(unit, "type") == "function_call":
-                        tool_calls = [unit]
+                # The first turn picks tools; later ones follow tool results and mostly write
+                # the answer. A ModelRouter sends them to different models, a plain client ignores it
+                purpose = "tool" if iteration == 0 else "final"
+                with self._profile_turn(f"{whisper_msg.username}#{iteration + 1}"):
+                    if self.stream:
+                        response_units = await self._stream_turn(conversation, whisper_msg, purpose)
+                        if not response_units:
+                            break
                     else:
-                        raise ValueError(f"Unexpected response unit type: {type(unit)}. Expected function call or text message.")
-
-                    # Execute requested tool calls
-                    print(f"\nExecuting tool calls: {tool_calls}")
-                    function_results = await self._execute_function_calls(tool_calls)
-
-                    # Append status summary to conversation
-                    if function_results:
-                        # Summarize single call result status or short JSON
-                        summary = function_results[0].get("status") or json.dumps(function_results[0])[:500]
-                        conversation.append({"role": "assistant", "content": str(function_results)})
-                        print("done with this function call\n")
-                
+                        response_units = await self._send_to_gpt(conversation, whisper_msg, purpose)
+                        if not response_units:
+                            break
+                        print('\nResponses: ', response_units)
+                        await self._apply_response_units(response_units, conversation, whisper_msg)
+
                 if hasattr(response_units[-1], 'content'):
                     # If the last response was a text message, we can stop here
                     break
@@ -180,51 +342,254 @@ class WhisperMessageProcessor:
                     break
 
                 iteration += 1
-                await asyncio.sleep(0.1)
 
         except Exception as e:
             print(f"Error processing whisper from {whisper_msg.username}: {e}")
             traceback.print_exc()
 
-    async def _send_to_gpt(self, conversation: List[Dict]) -> Optional[Any]:
-        # Using the Responses API with tool calling
-        # Note: For some SDK versions, messages field is `input`, and tools go in `tools`.
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: self.client.responses.create(
+    async def _apply_response_units(self, response_units, conversation: List[Dict], whisper_msg: WhisperMessage):
+        tool_calls = []
+        for unit in response_units:
+
+            # If plain text assistant message
+            if hasattr(unit, 'content'):
+                final_text = unit.content[0].text.replace("\n", " ").strip() if unit.content else str(unit)
+                self.bot.whisper(whisper_msg.username, final_text)
+                conversation.append({"role": "assistant", "content": final_text})
+                print('\nSent response to user:', final_text)
+                continue
+
+            # Otherwise treat as tool/function call unit following OpenAI Responses API schema
+            if hasattr(unit, "type") and getattr(unit, "type") == "function_call":
+                tool_calls.append(unit)
+            else:
+                raise ValueError(f"Unexpected response unit type: {type(unit)}. Expected function call or text message.")
+
+        if not tool_calls:
+            return
+
+        # Execute all tool calls of this response together; results come back in call order
+        print(f"\nExecuting tool calls: {tool_calls}")
+        self._note_tools_used(whisper_msg, [call.name for call in tool_calls])
+        function_results = await self._execute_function_calls(tool_calls)
+        for result in function_results:
+            conversation.append({"role": "assistant", "content": str([result])})
+        print("done with these function calls\n")
+
+    async def _stream_turn(self, conversation: List[Dict], whisper_msg: WhisperMessage,
+                           purpose: str = "tool") -> List[Any]:
+        """
+        One model turn in streaming mode. Each function call is dispatched as soon as
+        its arguments are complete, and text is whispered sentence by sentence.
+        Returns the completed output units in order, like _send_to_gpt.
+        """
+        started = time.monotonic()
+        first_action_at: Optional[float] = None
+        chunker = SentenceChunker()
+        output_units: List[Any] = []
+        dispatched: List[asyncio.Task] = []
+        streamed_items = set()  # message items whose text arrived as deltas
+
+        def whisper_chunks(chunks: List[str]):
+            nonlocal first_action_at
+            for chunk in chunks:
+                self.bot.whisper(whisper_msg.username, chunk)
+                if first_action_at is None:
+                    first_action_at = time.monotonic()
+
+        try:
+            stream = await self.client.stream_response(
+                purpose=purpose,
                 model=self.model,
-                input=conversation,
-                tools=mineflayer_tools,
+                input=self._request_input(conversation, whisper_msg),
+                tools=self._tools_for_request(whisper_msg),
                 tool_choice="auto"
             )
+            async for event in stream:
+                event_type = getattr(event, "type", None)
+
+                if event_type == "response.output_text.delta":
+                    streamed_items.add(getattr(event, "item_id", None))
+                    whisper_chunks(chunker.feed(event.delta))
+
+                elif event_type == "response.output_item.done":
+                    item = event.item
+                    output_units.append(item)
+                    if getattr(item, "type", None) == "function_call":
+                        print(f"\nDispatching streamed tool call: {item}")
+                        self._note_tools_used(whisper_msg, [item.name])
+                        dispatched.append(asyncio.create_task(self._execute_function_calls([item])))
+                        if first_action_at is None:
+                            first_action_at = time.monotonic()
+                    elif hasattr(item, "content"):
+                        whisper_chunks(chunker.flush())
+                        text = item.content[0].text.replace("\n", " ").strip() if item.content else ""
+                        if text and getattr(item, "id", None) not in streamed_items:
+                            # Some servers send only the finished item, with no deltas
+                            whisper_chunks(chunker.feed(text) + chunker.flush())
+                        if text:
+                            conversation.append({"role": "assistant", "content": text})
+                            print('\nSent response to user:', text)
+
+                elif event_type == "response.completed":
+                    self.prefix_cache_stats.record(getattr(event.response, "usage", None))
+
+                elif event_type in ("response.failed", "error"):
+                    raise RuntimeError(f"Streaming response failed: {event}")
+
+            whisper_chunks(chunker.flush())
+
+            # Fan in tool results in call order
+            for function_results in await asyncio.gather(*dispatched):
+                if function_results:
+                    conversation.append({"role": "assistant", "content": str(function_results)})
+        except BaseException:
+            for task in dispatched:
+                task.cancel()
+            raise
+
+        if first_action_at is not None:
+            print(f"\nTime to first action: {(first_action_at - started) * 1000:.0f} ms "
+                  f"(turn took {(time.monotonic() - started) * 1000:.0f} ms)")
+        return output_units
+
+    def _request_input(self, conversation: List[Dict], whisper_msg: Optional[WhisperMessage]) -> List[Dict]:
+        if not self.context_deltas or whisper_msg is None:
+            return self.prompt_builder.request_input(conversation, self.get_game_context())
+
+        # Context goes into the conversation (and so the session) as it is sent, which keeps
+        # the input append-only; only fields changed since the last one sent are included
+        session = self.sessions.get(whisper_msg.username)
+        current = self._read_game_context()
+        changes = context_delta(session.last_context, current)
+        if changes:
+            update = session.last_context is not None
+            conversation.append(self.prompt_builder.context_message(json.dumps(changes), update=update))
+            session.last_context = current
+        return list(conversation)
+
+    def _tools_for_request(self, whisper_msg: Optional[WhisperMessage]) -> List[Dict[str, Any]]:
+        if self.tool_router is None or whisper_msg is None:
+            return self.prompt_builder.tools
+        session = self.sessions.get(whisper_msg.username)
+        decision = self.tool_router.select(whisper_msg.message, session.recent_tools)
+        if decision.fallback:
+            return self.prompt_builder.tools
+        return self.prompt_builder.tool_subset(decision.names)
+
+    def _note_tools_used(self, whisper_msg: WhisperMessage, names: List[str]):
+        # Keeps called tools in the routed subset for the rest of this whisper and the next few
+        if self.tool_router is not None:
+            self.sessions.get(whisper_msg.username).note_tools(names)
+
+    async def _send_to_gpt(self, conversation: List[Dict], whisper_msg: Optional[WhisperMessage] = None,
+                           purpose: str = "tool") -> Optional[Any]:
+        # Using the Responses API with tool calling
+        # Note: For some SDK versions, messages field is `input`, and tools go in `tools`.
+        response = await self.client.create_response(
+            purpose=purpose,
+            model=self.model,
+            input=self._request_input(conversation, whisper_msg),
+            tools=self._tools_for_request(whisper_msg),
+            tool_choice="auto"
         )
+        self.prefix_cache_stats.record(getattr(response, "usage", None))
         # The SDK returns response.output as a list of units (messages/tool calls)
         return getattr(response, "output", None)
 
     async def _execute_function_calls(self, tool_calls) -> List[Dict[str, Any]]:
-        results: List[Dict[str, Any]] = []
-        for call in tool_calls:
-            # Normalize fields
-            function_name = getattr(call, "name", None) or getattr(call, "tool_name", None)
-            raw_args = getattr(call, "arguments", "{}")
-            if not function_name:
-                results.append({"error": "Missing function name"})
-                continue
+        # Independent calls run concurrently; gather keeps results in call order
+        return list(await asyncio.gather(*(self._execute_function_call(call) for call in tool_calls)))
+
+    async def _execute_function_call(self, call) -> Dict[str, Any]:
+        # Normalize fields
+        function_name = getattr(call, "name", None) or getattr(call, "tool_name", None)
+        raw_args = getattr(call, "arguments", "{}")
+        if not function_name:
+            return {"error": "Missing function name"}
+
+        try:
+            arguments = json.loads(raw_args) if isinstance(raw_args, str) else raw_args
+        except Exception:
+            arguments = {}
+        print(f"\nExecuting function: {function_name} with args: {arguments}")
+
+        spec = self.tools.get(function_name)
+        cached = self._cached_result(spec, arguments)
+        if cached is not None:
+            print(f"\nFunction {function_name} result (cached): {cached}")
+            return cached
+        generation = self.tool_cache.generation if self.tool_cache is not None else None
+
+        with self._profile_tool(function_name):
+            if spec is not None and spec.exclusive:
+                # One body per bot: movement/digging/placing never overlap, across all
+                # conversations. asyncio.Lock is FIFO, so they still run in call order.
+                async with self._body_lock:
+                    result = await self.handle_function_call(function_name, arguments)
+            else:
+                result = await self.handle_function_call(function_name, arguments)
+        print(f"\nFunction {function_name} result: {result}")
+        self._update_tool_cache(spec, arguments, result, generation)
+        return result
 
+    def _cached_result(self, spec, arguments) -> Optional[Dict[str, Any]]:
+        if self.tool_cache is None or not self.tool_cache.cacheable(spec):
+            return None
+        try:
+            kwargs = spec.validate(arguments)
+        except ToolArgumentError:
+            return None  # reported by the normal call path
+        hit, value = self.tool_cache.get(spec, kwargs)
+        if not hit:
+            return None
+        live = spec.metadata.get("live")
+        if live:
+            # Fields too volatile to cache are read fresh on every hit
             try:
-                arguments = json.loads(raw_args) if isinstance(raw_args, str) else raw_args
-            except Exception:
-                arguments = {}
-            print(f"\nExecuting function: {function_name} with args: {arguments}")
-        
-            result = await self.handle_function_call(function_name, arguments)
-            results.append(result)
-            print(f"\nFunction {function_name} result: {result}")
+                value = {**value, **getattr(self.tools.instance(spec.name), live)(**kwargs)}
+            except Exception as e:
+                print(f"Refreshing cached {spec.name} failed, calling it instead: {e}")
+                return None
+        return value
+
+    def _update_tool_cache(self, spec, arguments, result: Dict[str, Any], generation: Optional[int]):
+        if self.tool_cache is None or spec is None:
+            return
+        if spec.exclusive:
+            # The bot just acted; its own changes may not have been reported yet
+            self.tool_cache.invalidate_all()
+        elif self.tool_cache.cacheable(spec) and result.get("status") != "error" and "error" not in result:
+            self.tool_cache.put(spec, spec.validate(arguments), result, generation)
+
+    def _profile_turn(self, label: str):
+        return self.profiler.turn(label) if self.profiler else nullcontext()
 
-        return results
+    def _profile_tool(self, name: str):
+        return self.profiler.tool(name) if self.profiler else nullcontext()
 
     def get_queue_size(self) -> int:
-        return self.whisper_queue.qsize()
+        return self.scheduler.depth
+
+    def get_queue_metrics(self) -> Dict[str, Any]:
+        """Queue depth, drops/merges/coalescing and wait times from the scheduler."""
+        return {**self.scheduler.metrics(), "superseded": self.superseded}
+
+    def get_active_conversations(self) -> int:
+        return self.scheduler.in_flight()
+
+    def get_prefix_cache_stats(self) -> Dict[str, Any]:
+        return self.prefix_cache_stats.as_dict()
+
+    def get_delegated_tasks(self, username: Optional[str] = None) -> List[Dict[str, Any]]:
+        tasks = self.delegation.for_parent(username) if username else self.delegation.tasks.values()
+        return [task.as_dict() for task in tasks]
+
+    def get_tool_cache_stats(self) -> Optional[Dict[str, Any]]:
+        return self.tool_cache.stats.as_dict() if self.tool_cache is not None else None
+
+    def get_tool_routing_stats(self) -> Optional[Dict[str, Any]]:
+        return self.tool_router.stats.as_dict() if self.tool_router is not None else None
 
     def is_running(self) -> bool:
         return self.running
@@ -232,64 +597,167 @@ class WhisperMessageProcessor:
     # -----------------------------
     # Main function call handler
     # This is the adapter layer between GPT tool calls and the actual mineflayer bot API.
-    # It assumes `self.bot` exposes async methods compatible with the below signatures.
-    # If not, wrap callbacks or sync methods into asyncio with run_in_executor.
+    # Tools are looked up by name in self.tools and their arguments are checked
+    # against the generated schema before the method runs.
     # -----------------------------
     async def handle_function_call(self, function_name, parameters):
-        # World Info
         try:
-            
-            if function_name == "whisper":
-                return self.whisper(parameters)
-            elif function_name == 'move_to':
-                return self.move_to(parameters)
-
-            else:
-                return {"error": f"Unknown function: {function_name}"}
-            
+            result = await self.tools.dispatch(function_name, parameters)
+        except UnknownToolError:
+            return {"error": f"Unknown function: {function_name}"}
+        except ToolArgumentError as e:
+            return {"status": "error", "error": str(e)}
         except Exception as e:
             print(f"Error executing function {function_name} with params {parameters}: {e}")
             traceback.print_exc()
             return {"status": "error", "error": str(e)}
-        
+        if isinstance(result, dict):
+            return result
+        # MinecraftBot tools return plain values and raise on failure
+        return {"status": "success", "result": result}
+
+    def _on_delegated_done(self, task: DelegatedTask):
+        # Fan-in: the result becomes a turn in the delegating player's conversation
+        if not self.running or task.parent is None:
+            return
+        if task.status == "done":
+            outcome = task.result.get("summary", "") if isinstance(task.result, dict) else str(task.result)
+        else:
+            outcome = task.error or task.status
+        self._enqueue(WhisperMessage(
+            username=task.parent,
+            message=f"{task.id} ({task.assigned_agent}, \"{task.description}\") {task.status}: {outcome}",
+            timestamp=time.monotonic(),
+            kind="task_update"
+        ))
+
     # -----------------------------
     # Helper to expose current context
     # -----------------------------
     def get_game_context(self):
+        if self.context_cache is not None and self.context_cache.ready:
+            return self.context_cache.to_json()
+        return json.dumps(self._read_game_context())
+
+    def _read_game_context(self) -> Dict[str, Any]:
+        # Served from the event-maintained cache when attached; bridge reads otherwise
+        if self.context_cache is not None and self.context_cache.ready:
+            return self.context_cache.snapshot()
         pos = self.bot.entity.position
         health = getattr(self.bot, "health", None)
         food = getattr(self.bot, "food", None)
         time_of_day = getattr(getattr(self.bot, "time", None), "timeOfDay", None)
-        context = {
+        if getattr(self.bot, "thunderState", 0):
+            weather = "thunder"
+        elif getattr(self.bot, "isRaining", False):
+            weather = "rain"
+        else:
+            weather = "clear"
+        return {
             "position": {"x": round(pos.x), "y": round(pos.y), "z": round(pos.z)},
             "health": health,
             "food": food,
             "time": time_of_day,
-            "weather": "clear"  # placeholder unless weather detection is implemented
+            "weather": weather
         }
-        return json.dumps(context)
     
-    def whisper(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
-        """Send a whisper message to a player."""
-        username = parameters.get("username")
-        message = parameters.get("message")
+    # -----------------------------
+    # Processor tools
+    # -----------------------------
+    @tool(params={"username": "Player to whisper to", "message": "Message text"})
+    async def whisper(self, username: str, message: str) -> Dict[str, Any]:
+        """Send a private whisper to a player"""
         if not username or not message:
             return {"status": "error", "error": "Missing username or message"}
         
         self.bot.whisper(username, message)
         return {"status": "success", "message": f"Whispered to {username}: {message}"}
 
-    def move_to(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
-        """Move the bot to a specific position in the world."""
-        x = parameters.get("x")
-        y = parameters.get("y")
-        z = parameters.get("z")
-        if x is None or y is None or z is None:
-            return {"status": "error", "error": "Missing x, y, or z coordinates"}
+    @tool(params={"message": "Message text"}, keywords=("say", "announce", "everyone", "public"))
+    async def chat(self, message: str) -> Dict[str, Any]:
+        """Send a message to the global chat"""
+        if not message:
+            return {"status": "error", "error": "Missing message"}
+
+        self.bot.chat(message)
+        return {"status": "success", "message": f"Said in chat: {message}"}
+
+    @tool(
+        description=(
+            "Move the bot to a specific position in the world. Returns once the bot has "
+            "arrived or the move failed, with the final outcome and position"
+        ),
+        params={"timeout": "Seconds to wait before giving up"},
+        exclusive=True,
+        keywords=("go", "come", "walk", "travel", "here", "coordinates", "follow"),
+        route_always=True
+    )
+    async def move_to(self, x: float, y: float, z: float, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Move the bot to a specific position and wait until it arrives, fails or times out."""
+
+        player = _current_player.get()
+        milestones = list(MOVE_PROGRESS_MILESTONES)
+
+        def report_progress(action):
+            print(f"{action.id} to ({x}, {y}, {z}): {action.progress:.0%} after {action.elapsed:.0f}s")
+            # Tell the player once per milestone crossed, so a long walk isn't silent
+            reached = [milestone for milestone in milestones if action.progress >= milestone]
+            if reached and player:
+                del milestones[:len(reached)]
+                self.bot.whisper(player, f"On my way to ({x:g}, {y:g}, {z:g}): {action.progress:.0%} there")
 
         try:
-            self.bot.pathfinder.setGoal(self.GoalNear(x, y, z, 1))  # 1 block radius tolerance
-            return {"status": "success", "message": f"Moving to ({x}, {y}, {z})"}
+            goal = self.GoalNear(x, y, z, 1)  # 1 block radius tolerance
+            return await self.actions.move_to(x, y, z, goal, timeout=timeout, on_progress=report_progress)
         except Exception as e:
             traceback.print_exc()
-            return {"status": "error", "error": str(e)}
\ No newline at end of file
+            return {"status": "error", "error": str(e)}
+
+    @tool(
+        description="Stop the bot's current movement. Returns how far it had got",
+        keywords=("stop", "halt", "cancel", "stay", "wait", "freeze")
+    )
+    async def cancel_movement(self) -> Dict[str, Any]:
+        action = self.actions.current
+        if action is None or not self.actions.cancel(action.id):
+            return {"status": "error", "error": "The bot is not moving"}
+        return {"status": "success", "message": f"Stopped {action.id}", "target": action.target,
+                "progress": round(action.progress, 2)}
+
+    @tool(
+        description=(
+            "Hand a long-running job to a specialised agent (miner or builder). Returns at once "
+            "with a task id; the outcome arrives later as a delegated task update"
+        ),
+        params={"agent": "Agent to run the job", "description": "What to do, with absolute coordinates"},
+        keywords=("delegate", "mine", "dig", "build", "gather", "collect", "long", "task")
+    )
+    async def delegate_task(self, agent: Literal["miner", "builder"], description: str) -> Dict[str, Any]:
+        if agent not in self.delegate_handlers:
+            return {"status": "error", "error": f"No {agent} agent available, have {sorted(self.delegate_handlers)}"}
+        task = self.delegation.submit(agent, description, parent=_current_player.get())
+        return {"status": "success", "task_id": task.id, "task_status": task.status}
+
+    @tool(
+        description="Status of delegated tasks: one task by id, or all of this player's tasks",
+        params={"task_id": "Task id returned by delegate_task"},
+        keywords=("status", "progress", "task", "done", "finished")
+    )
+    async def get_task_status(self, task_id: Optional[str] = None) -> Dict[str, Any]:
+        if task_id:
+            task = self.delegation.get(task_id)
+            if task is None:
+                return {"status": "error", "error": f"Unknown task {task_id}"}
+            return {"status": "success", "tasks": [task.as_dict()]}
+        return {"status": "success", "tasks": self.get_delegated_tasks(_current_player.get())}
+
+    @tool(params={"task_id": "Task id returned by delegate_task"}, keywords=("cancel", "stop", "abort", "task"))
+    async def cancel_task(self, task_id: str) -> Dict[str, Any]:
+        """Cancel a pending or running delegated task"""
+        if not self.delegation.cancel(task_id):
+            return {"status": "error", "error": f"No pending or running task {task_id}"}
+        return {"status": "success", "message": f"Cancelling {task_id}"}
+
+
+# Schemas for the processor's own tools, generated once at import
+WhisperMessageProcessor.tool_registry = ToolRegistry.from_class(WhisperMessageProcessor)
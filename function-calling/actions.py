@@ -0,0 +1,194 @@
+import asyncio
+import itertools
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# -----------------------------
+# Long-running bot actions
+# -----------------------------
+@dataclass
+class TrackedAction:
+    id: str
+    name: str
+    target: Dict[str, float]
+    status: str = "running"  # running, arrived, no_path, path_timeout, timeout, cancelled, superseded, failed
+    progress: float = 0.0  # 0..1, fraction of the initial distance covered
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+
+ProgressCallback = Callable[[TrackedAction], None]
+
+
+class ActionTracker:
+    """
+    Runs pathfinder goals as awaitable actions.
+
+    Completion is event-driven (goal_reached / path_update / path_stop), with a
+    timeout as the backstop; position is only read every progress_interval seconds
+    to report progress. Starting a new movement
+    supersedes the running one, and cancel() stops the pathfinder.
+    """
+
+    def __init__(self, bot, progress_interval: float = 1.0, default_timeout: float = 60.0):
+        self.bot = bot
+        self.progress_interval = progress_interval
+        self.default_timeout = default_timeout
+        self.current: Optional[TrackedAction] = None
+        self.history: List[TrackedAction] = []
+        self._ids = itertools.count(1)
+        self._finishers: Dict[str, Callable[[str, Optional[str]], None]] = {}
+
+    async def move_to(self, x: float, y: float, z: float, goal, timeout: Optional[float] = None,
+                      on_progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        if self.current is not None and not self.current.done:
+            self.cancel(self.current.id, status="superseded")
+
+        loop = asyncio.get_running_loop()
+        done: "asyncio.Future[Tuple[str, Optional[str]]]" = loop.create_future()
+        action = TrackedAction(id=f"move-{next(self._ids)}", name="move_to", target={"x": x, "y": y, "z": z})
+        self.current = action
+        self.history = (self.history + [action])[-20:]
+
+        def finish(status: str, error: Optional[str] = None):
+            if not done.done():
+                done.set_result((status, error))
+
+        # Pathfinder events arrive on the JS bridge thread, with the emitter first
+        def on_goal_reached(this, *args):
+            loop.call_soon_threadsafe(finish, "arrived")
+
+        def on_path_update(this, results=None, *args):
+            status = getattr(results, "status", None)
+            if status == "noPath":
+                loop.call_soon_threadsafe(finish, "no_path", "No path to target")
+            elif status == "timeout":
+                loop.call_soon_threadsafe(finish, "path_timeout", "Pathfinding timed out")
+
+        def on_path_stop(this, *args):
+            loop.call_soon_threadsafe(finish, "cancelled", "Pathfinder stopped")
+
+        listeners = [
+            ("goal_reached", on_goal_reached),
+            ("path_update", on_path_update),
+            ("path_stop", on_path_stop),
+        ]
+        for event, handler in listeners:
+            self.bot.on(event, handler)
+        self._finishers[action.id] = finish
+
+        timeout = timeout if timeout is not None else self.default_timeout
+        deadline = time.monotonic() + timeout
+        try:
+            start_distance = self._distance_to(action.target)
+            self.bot.pathfinder.setGoal(goal)
+            while not done.done():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    finish("timeout", f"Did not arrive within {timeout:g}s")
+                    self._stop_pathfinder()
+                    break
+                try:
+                    await asyncio.wait_for(asyncio.shield(done), timeout=min(self.progress_interval, remaining))
+                except asyncio.TimeoutError:
+                    self._update_progress(action, start_distance)
+                    if on_progress:
+                        on_progress(action)
+            status, error = done.result()
+        except asyncio.CancelledError:
+            self._stop_pathfinder()
+            self._complete(action, "cancelled", "Action cancelled")
+            raise
+        except Exception as e:
+            status, error = "failed", str(e)
+        finally:
+            self._finishers.pop(action.id, None)
+            for event, handler in listeners:
+                try:
+                    self.bot.removeListener(event, handler)
+                except Exception:
+                    pass
+
+        if status == "arrived":
+            action.progress = 1.0
+        self._complete(action, status, error)
+        return self._result(action)
+
+    def cancel(self, action_id: Optional[str] = None, status: str = "cancelled") -> bool:
+        """Cancel a running action (the current one by default). Must be called on the loop thread."""
+        action_id = action_id or (self.current.id if self.current else None)
+        finish = self._finishers.get(action_id)
+        if finish is None:
+            return False
+        finish(status, "Replaced by a new movement" if status == "superseded" else "Action cancelled")
+        if status != "superseded":
+            # A superseding goal replaces this one; otherwise stop moving
+            self._stop_pathfinder()
+        return True
+
+    def cancel_all(self):
+        for action_id in list(self._finishers):
+            self.cancel(action_id)
+
+    def get(self, action_id: str) -> Optional[TrackedAction]:
+        for action in self.history:
+            if action.id == action_id:
+                return action
+        return None
+
+    # -----------------------------
+    # Helpers
+    # -----------------------------
+    def _distance_to(self, target: Dict[str, float]) -> float:
+        pos = self.bot.entity.position
+        return math.sqrt((pos.x - target["x"]) ** 2 + (pos.y - target["y"]) ** 2 + (pos.z - target["z"]) ** 2)
+
+    def _update_progress(self, action: TrackedAction, start_distance: float):
+        try:
+            distance = self._distance_to(action.target)
+        except Exception:
+            return
+        if start_distance > 0:
+            action.progress = max(0.0, min(1.0, 1 - distance / start_distance))
+
+    def _stop_pathfinder(self):
+        try:
+            self.bot.pathfinder.setGoal(None)
+        except Exception as e:
+            print(f"Failed to stop pathfinder: {e}")
+
+    def _complete(self, action: TrackedAction, status: str, error: Optional[str]):
+        if action.done:
+            return
+        action.status = status
+        action.error = error
+        action.finished_at = time.monotonic()
+
+    def _result(self, action: TrackedAction) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "status": "success" if action.status == "arrived" else "error",
+            "outcome": action.status,
+            "action_id": action.id,
+            "target": action.target,
+            "progress": round(action.progress, 2),
+            "elapsed": round(action.elapsed, 1),
+        }
+        try:
+            pos = self.bot.entity.position
+            result["position"] = {"x": round(pos.x), "y": round(pos.y), "z": round(pos.z)}
+        except Exception:
+            pass
+        if action.error:
+            result["error"] = action.error
+        return result
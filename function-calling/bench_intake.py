@@ -0,0 +1,119 @@
+"""
+Enqueue-to-dispatch latency benchmark for WhisperMessageProcessor intake.
+
+Compares the old polling intake (queue.Queue + get_nowait + 0.1 s sleeps) with the
+asyncio-native intake. Whispers are added from a separate thread, the same way the
+JS bridge thread calls add_whisper, and the time until _process_whisper_message
+starts is recorded.
+
+    python bench_intake.py --messages 50 --interval 0.05
+"""
+import argparse
+import asyncio
+import queue
+import statistics
+import threading
+import time
+from typing import List
+
+from WhisperProcessor import WhisperMessage, WhisperMessageProcessor
+
+
+class _RecordingMixin:
+    """Records dispatch latency instead of talking to the LLM."""
+
+    def _init_recording(self, expected: int):
+        self.latencies: List[float] = []
+        self.expected = expected
+        self.finished = asyncio.Event()
+
+    async def _process_whisper_message(self, whisper_msg: WhisperMessage):
+        self.latencies.append(time.monotonic() - whisper_msg.timestamp)
+        if len(self.latencies) >= self.expected:
+            self.finished.set()
+
+
+class EventDrivenProcessor(_RecordingMixin, WhisperMessageProcessor):
+    pass
+
+
+class PollingProcessor(_RecordingMixin, WhisperMessageProcessor):
+    """Replica of the previous polling intake, kept here for comparison."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.legacy_queue: "queue.Queue[WhisperMessage]" = queue.Queue()
+
+    def _enqueue(self, whisper_msg: WhisperMessage):
+        self.legacy_queue.put(whisper_msg)
+
+    async def _process_loop(self):
+        while self.running:
+            try:
+                whisper_msg = self.legacy_queue.get_nowait()
+            except queue.Empty:
+                await asyncio.sleep(0.1)
+                continue
+            await self._process_whisper_message(whisper_msg)
+            await asyncio.sleep(0.1)
+
+
+def _producer(processor: WhisperMessageProcessor, count: int, interval: float):
+    for i in range(count):
+        processor.add_whisper(f"player{i % 4}", f"message {i}")
+        time.sleep(interval)
+
+
+async def run_case(processor_cls, count: int, interval: float) -> List[float]:
+    processor = processor_cls(None, None, None)
+    processor._init_recording(count)
+    processor.start_processing()
+
+    producer = threading.Thread(target=_producer, args=(processor, count, interval), daemon=True)
+    producer.start()
+    await asyncio.wait_for(processor.finished.wait(), timeout=count * (interval + 0.5) + 5)
+    processor.stop_processing()
+    producer.join()
+    return processor.latencies
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def report(name: str, latencies: List[float]):
+    ms = [value * 1000 for value in latencies]
+    print(
+        f"{name:<14} n={len(ms):<4} "
+        f"mean={statistics.mean(ms):7.2f} ms  "
+        f"p50={_percentile(ms, 50):7.2f} ms  "
+        f"p95={_percentile(ms, 95):7.2f} ms  "
+        f"max={max(ms):7.2f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.05, help="seconds between whispers")
+    args = parser.parse_args()
+
+    # Silence the per-message prints so they don't skew timings
+    import builtins
+    real_print = builtins.print
+    builtins.print = lambda *a, **k: None
+    try:
+        before = await run_case(PollingProcessor, args.messages, args.interval)
+        after = await run_case(EventDrivenProcessor, args.messages, args.interval)
+    finally:
+        builtins.print = real_print
+
+    print(f"enqueue-to-dispatch latency, {args.messages} whispers every {args.interval * 1000:.0f} ms")
+    report("polling", before)
+    report("event-driven", after)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,192 @@
+"""
+Offline end-to-end load benchmark for WhisperMessageProcessor.
+
+N simulated players whisper at a given rate (seeded Poisson arrivals) from a
+separate thread, the way the JS bridge thread delivers them. The processor runs
+unmodified against a FakeBot and the scripted stub Responses server, over the
+real LLMClient and HTTP. Each whisper carries an id ("#17 ...") that the stub
+echoes in its reply, so whisper-to-reply latency is matched exactly.
+
+Reports throughput, p50/p95/p99 whisper-to-reply latency and LLM calls per whisper.
+
+    python bench_load.py --players 20 --rate 0.5 --duration 20 --latency-ms 300 --jitter-ms 150
+    python bench_load.py --players 20 --rate 0.5 --stream --concurrency 4
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import random
+import re
+import statistics
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from fake_bot import FakeBot, GoalNear
+from llm_client import LLMClient, LLMClientConfig
+from stub_llm_server import StubLLMServer, StubScript
+from WhisperProcessor import WhisperMessageProcessor
+from whisper_scheduler import WhisperScheduler
+
+WHISPER_ID = re.compile(r"#(\d+)")
+TEMPLATES = [
+    "come to {x} 64 {z}",
+    "go to the tree at {x} 65 {z}",
+    "hi, how are you",
+    "walk over to {x} 63 {z} please",
+    "what can you do",
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), round(q / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def build_schedule(players: int, rate: float, duration: float, seed: int) -> List[Tuple[float, str, str]]:
+    """(send offset in seconds, player, message) sorted by time."""
+    rng = random.Random(seed)
+    schedule = []
+    for p in range(players):
+        player = f"player{p}"
+        t = rng.expovariate(rate)
+        while t < duration:
+            template = rng.choice(TEMPLATES)
+            schedule.append((t, player, template.format(x=rng.randint(-50, 50), z=rng.randint(-50, 50))))
+            t += rng.expovariate(rate)
+    schedule.sort()
+    return [(t, player, f"#{i} {text}") for i, (t, player, text) in enumerate(schedule)]
+
+
+class LoadRecorder:
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.sent_at: Dict[str, float] = {}
+        self.latencies: List[float] = []
+        self.first_sent = None
+        self.last_reply = None
+        self.lock = threading.Lock()
+        self.all_answered = threading.Event()
+
+    def sent(self, whisper_id: str):
+        now = time.monotonic()
+        with self.lock:
+            self.sent_at[whisper_id] = now
+            if self.first_sent is None:
+                self.first_sent = now
+
+    def on_whisper(self, username: str, message: str):
+        now = time.monotonic()
+        with self.lock:
+            for whisper_id in WHISPER_ID.findall(message):
+                sent = self.sent_at.pop(whisper_id, None)
+                if sent is not None:
+                    self.latencies.append(now - sent)
+                    self.last_reply = now
+            if len(self.latencies) >= self.expected:
+                self.all_answered.set()
+
+
+def generate(processor: WhisperMessageProcessor, schedule, recorder: LoadRecorder):
+    start = time.monotonic()
+    for offset, player, message in schedule:
+        delay = start + offset - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        recorder.sent(WHISPER_ID.match(message).group(1))
+        processor.add_whisper(player, message)
+
+
+async def run(args) -> Dict[str, float]:
+    server = None
+    script = None
+    base_url = args.base_url
+    if base_url is None:
+        script = StubScript(tool_rounds=args.tool_rounds, latency_ms=args.latency_ms,
+                            jitter_ms=args.jitter_ms, seed=args.seed)
+        server = StubLLMServer(script).start()
+        base_url = server.base_url
+
+    schedule = build_schedule(args.players, args.rate, args.duration, args.seed)
+    recorder = LoadRecorder(len(schedule))
+    bot = FakeBot(speed=args.speed, on_whisper=recorder.on_whisper)
+    client = LLMClient(LLMClientConfig(base_url=base_url, api_key="stub", max_retries=0))
+    processor = WhisperMessageProcessor(
+        client, bot, GoalNear, model="stub",
+        max_concurrent_conversations=args.concurrency,
+        stream=args.stream,
+        scheduler=WhisperScheduler(coalesce=not args.no_coalesce, coalesce_window=args.coalesce_window),
+        cancel_superseded=args.cancel_superseded
+    )
+
+    logs = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with logs:
+            processor.start_processing()
+            generator = threading.Thread(target=generate, args=(processor, schedule, recorder), daemon=True)
+            generator.start()
+            await asyncio.get_running_loop().run_in_executor(
+                None, recorder.all_answered.wait, args.duration + args.drain_timeout
+            )
+            processor.stop_processing()
+    finally:
+        await client.aclose()
+        if server is not None:
+            server.stop()
+
+    latencies = recorder.latencies
+    elapsed = (recorder.last_reply or time.monotonic()) - (recorder.first_sent or time.monotonic())
+    results = {
+        "whispers": len(schedule),
+        "answered": len(latencies),
+        "elapsed_s": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000 if latencies else float("nan"),
+    }
+    if script is not None:
+        results["llm_calls"] = script.requests
+        results["llm_calls_per_whisper"] = script.requests / len(schedule) if schedule else 0.0
+        results["max_llm_in_flight"] = script.max_in_flight
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=0.5, help="whispers per second per player")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of whisper traffic")
+    parser.add_argument("--drain-timeout", type=float, default=60.0, help="seconds to wait for replies afterwards")
+    parser.add_argument("--concurrency", type=int, default=8, help="max_concurrent_conversations")
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--tool-rounds", type=int, default=1, help="move_to calls before the stub replies")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--speed", type=float, default=200.0, help="fake pathfinder speed, blocks/s")
+    parser.add_argument("--no-coalesce", action="store_true", help="run every whisper as its own turn")
+    parser.add_argument("--coalesce-window", type=float, default=0.0, help="debounce seconds per player")
+    parser.add_argument("--cancel-superseded", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-url", help="use an already running server instead of the built-in stub")
+    parser.add_argument("--verbose", action="store_true", help="keep the processor's logs")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"Whispers answered:     {results['answered']}/{results['whispers']} in {results['elapsed_s']:.1f}s")
+    print(f"Throughput:            {results['throughput']:.2f} replies/s")
+    print(f"Whisper-to-reply:      p50 {results['p50_ms']:.0f} ms, p95 {results['p95_ms']:.0f} ms, "
+          f"p99 {results['p99_ms']:.0f} ms (mean {results['mean_ms']:.0f} ms)")
+    if "llm_calls" in results:
+        print(f"LLM calls:             {results['llm_calls']} ({results['llm_calls_per_whisper']:.2f} per whisper, "
+              f"max {results['max_llm_in_flight']} in flight)")
+
+
+if __name__ == "__main__":
+    main()
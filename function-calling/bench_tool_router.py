@@ -0,0 +1,69 @@
+"""
+Tool-subset routing benchmark.
+
+Replays a whisper corpus (JSON lines: message, expected tools, optional recent
+tools from the session) through ToolRouter and reports:
+
+- schema tokens per request with the full tool set vs the routed subset
+- recall: share of whispers whose expected tools were all sent
+- fallback rate: share of whispers that got the full set
+
+    python bench_tool_router.py --corpus tool_router_corpus.jsonl --max-tools 4 --min-score 0.15
+
+Needs the bridge to import functions.MinecraftBot, like the agent itself.
+"""
+import argparse
+import json
+import statistics
+import time
+
+from functions import MinecraftBot
+from tool_registry import ToolRegistry
+from tool_router import ToolRouter, schema_tokens
+from WhisperProcessor import WhisperMessageProcessor
+
+
+def load_corpus(path: str):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default="tool_router_corpus.jsonl")
+    parser.add_argument("--max-tools", type=int, default=4)
+    parser.add_argument("--min-score", type=float, default=0.15)
+    parser.add_argument("--verbose", action="store_true", help="print every miss")
+    args = parser.parse_args()
+
+    # Same tool set the agent offers: MinecraftBot actions plus the processor's own
+    registry = ToolRegistry.combine(MinecraftBot.tool_registry, WhisperMessageProcessor.tool_registry)
+    router = ToolRouter(registry, max_tools=args.max_tools, min_score=args.min_score)
+    corpus = load_corpus(args.corpus)
+
+    full_tokens = schema_tokens(registry.schemas())
+    routed_tokens, hits, select_times = [], 0, []
+    for sample in corpus:
+        started = time.perf_counter()
+        decision = router.select(sample["message"], sample.get("recent", ()))
+        select_times.append(time.perf_counter() - started)
+        routed_tokens.append(schema_tokens(registry.schemas(decision.names)))
+        if set(sample["expected"]) <= set(decision.names):
+            hits += 1
+        elif args.verbose:
+            print(f"MISS {sample['message']!r}: expected {sample['expected']}, sent {decision.names}")
+
+    stats = router.stats.as_dict()
+    mean_routed = statistics.mean(routed_tokens)
+    print(f"Whispers:              {len(corpus)} ({len(registry)} tools registered)")
+    print(f"Schema tokens/request: full {full_tokens}, routed mean {mean_routed:.0f} "
+          f"({1 - mean_routed / full_tokens:.0%} saved)")
+    print(f"Tools sent/request:    {stats['avg_tools_sent']} of {stats['tools_available']}")
+    print(f"Recall:                {hits / len(corpus):.1%}")
+    print(f"Fallback rate:         {stats['fallback_rate']:.1%}")
+    print(f"Selection time:        {statistics.mean(select_times) * 1e6:.0f} us mean")
+    print(f"Saved over a 10-iteration whisper: ~{(full_tokens - mean_routed) * 10:.0f} tokens")
+
+
+if __name__ == "__main__":
+    main()
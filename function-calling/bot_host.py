@@ -0,0 +1,362 @@
+"""
+Runs many GPTMinecraftBots from one config file.
+
+Bots are packed several to a worker process. Each worker has one event loop,
+one LLMClient connection pool and one Node bridge, which all of its bots
+share. The workers are spread over the machine's cores, and a supervisor
+restarts any worker that crashes or stops sending heartbeats. Inside a
+worker, a bot that gets disconnected logs back in with backoff.
+
+    python bot_host.py bots.json
+    python bot_host.py bots.json --workers 4 --status-interval 30
+
+Config (JSON), where per-bot keys override "defaults":
+
+    {
+      "workers": null,            # max processes, default os.cpu_count()
+      "bots_per_worker": 8,       # packing target; more bots than cores * this share processes
+      "login_interval": 1.0,      # seconds between logins in a worker (server connection throttle)
+      "llm": {"base_url": "http://localhost:8000/v1", "max_connections": 32},
+      "router": null,             # or a ModelRouter config (model_router.py); replaces "llm"
+      "defaults": {"host": "localhost", "port": 25565, "version": "1.21.1", "model": "gpt-4o-mini"},
+      "bots": [{"username": "Miner1"}, {"username": "Builder1", "stream": true}]
+    }
+
+"agent_module" can name another file that defines GPTMinecraftBot, for
+example tests/fake_agent.py, a stand-in on fake_bot for offline runs.
+
+Bot keys named in AGENT_KEYS go to GPTMinecraftBot. All other keys go to
+mineflayer.createBot.
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+AGENT_KEYS = ("model", "stream", "route_tools", "max_concurrent_conversations")
+DEFAULT_AGENT_MODULE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "minecraft-fcagent.py")
+
+
+# -----------------------------
+# Config and sharding
+# -----------------------------
+def load_config(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        config = json.load(f)
+    defaults = config.get("defaults", {})
+    bots = [{**defaults, **bot} for bot in config.get("bots", [])]
+    names = [bot.get("username") for bot in bots]
+    if not bots or None in names or len(set(names)) != len(names):
+        raise ValueError("Config needs a non-empty 'bots' list with a unique 'username' for each bot")
+    config["bots"] = bots
+    return config
+
+
+def worker_count(bots: int, max_workers: Optional[int] = None, bots_per_worker: int = 8) -> int:
+    """Just enough processes to hold bots_per_worker bots each, capped by the core count."""
+    cap = max_workers or os.cpu_count() or 1
+    return max(1, min(cap, bots, math.ceil(bots / max(1, bots_per_worker))))
+
+
+def shard(bots: List[Dict[str, Any]], workers: int) -> List[List[Dict[str, Any]]]:
+    """Round-robin by config order, so a bot always lands on the same worker."""
+    return [bots[i::workers] for i in range(workers)]
+
+
+# -----------------------------
+# Worker process
+# -----------------------------
+def load_agent_module(path: str = DEFAULT_AGENT_MODULE):
+    # minecraft-fcagent.py isn't importable by name because of the hyphen
+    spec = importlib.util.spec_from_file_location("minecraft_fcagent", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class BotSlot:
+    """One configured bot in a worker: the running GPTMinecraftBot and its reconnect state."""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.username = config["username"]
+        self.agent_kwargs = {"model": "gpt-4o-mini", **{key: config[key] for key in AGENT_KEYS if key in config}}
+        self.minecraft_config = {key: value for key, value in config.items() if key not in AGENT_KEYS}
+        self.agent = None
+        self.connects = 0
+        self.last_error: Optional[str] = None
+
+    def status(self) -> Dict[str, Any]:
+        processor = getattr(self.agent, "processor", None)
+        connected = self.agent is not None and not self.agent.ended.is_set()
+        return {
+            "connected": connected,
+            "connects": self.connects,
+            "queue": processor.get_queue_size() if connected else 0,
+            "active": processor.get_active_conversations() if connected else 0,
+            "last_error": self.last_error,
+        }
+
+
+async def run_slot(slot: BotSlot, agent_module, llm_client, stop: asyncio.Event,
+                   start_delay: float, reconnect_delay: float, reconnect_max_delay: float):
+    """Keeps one bot logged in until stop is set."""
+    await asyncio.sleep(start_delay)
+    failures = 0
+    while not stop.is_set():
+        slot.connects += 1
+        started = time.monotonic()
+        slot.agent = None
+        try:
+            slot.agent = agent_module.GPTMinecraftBot(
+                openai_api_key=None,
+                minecraft_config=slot.minecraft_config,
+                llm_client=llm_client,
+                **slot.agent_kwargs
+            )
+            ended = asyncio.create_task(slot.agent.ended.wait())
+            stopping = asyncio.create_task(stop.wait())
+            await asyncio.wait({ended, stopping}, return_when=asyncio.FIRST_COMPLETED)
+            ended.cancel()
+            stopping.cancel()
+            slot.last_error = None if stop.is_set() else f"disconnected: {slot.agent.end_reason}"
+        except Exception as e:
+            traceback.print_exc()
+            slot.last_error = str(e)
+        finally:
+            if slot.agent is not None:
+                slot.agent.stop()
+        if stop.is_set():
+            break
+        # A session that stayed up for a while resets the backoff
+        failures = 1 if time.monotonic() - started > reconnect_max_delay else failures + 1
+        delay = min(reconnect_max_delay, reconnect_delay * 2 ** (failures - 1))
+        print(f"{slot.username} {slot.last_error}; reconnecting in {delay:.0f}s")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def worker_main(worker_id: int, bots: List[Dict[str, Any]], options: Dict[str, Any],
+                      heartbeats, stop_event):
+    from llm_client import LLMClient, LLMClientConfig
+    from model_router import ModelRouter
+
+    agent_module = load_agent_module(options.get("agent_module") or DEFAULT_AGENT_MODULE)
+    # One pooled client (or router over several backends) for every bot in this process
+    if options.get("router"):
+        llm_client = ModelRouter.from_config(options["router"])
+    else:
+        llm_client = LLMClient(LLMClientConfig(**options.get("llm", {})))
+    stop = asyncio.Event()
+    slots = [BotSlot(config) for config in bots]
+    login_interval = options.get("login_interval", 1.0)
+    runners = [
+        asyncio.create_task(run_slot(
+            slot, agent_module, llm_client, stop,
+            start_delay=i * login_interval,
+            reconnect_delay=options.get("reconnect_delay", 5.0),
+            reconnect_max_delay=options.get("reconnect_max_delay", 120.0)
+        ))
+        for i, slot in enumerate(slots)
+    ]
+    print(f"Worker {worker_id} (pid {os.getpid()}) running {len(slots)} bots: "
+          f"{', '.join(slot.username for slot in slots)}")
+
+    # Heartbeats come from the event loop itself, so a wedged loop shows up as silence
+    interval = options.get("heartbeat_interval", 2.0)
+    try:
+        while not stop_event.is_set():
+            heartbeats.put({
+                "worker": worker_id,
+                "pid": os.getpid(),
+                "time": time.time(),
+                "bots": {slot.username: slot.status() for slot in slots},
+            })
+            await asyncio.sleep(interval)
+    finally:
+        stop.set()
+        await asyncio.gather(*runners, return_exceptions=True)
+        await llm_client.aclose()
+
+
+def run_worker(worker_id: int, bots: List[Dict[str, Any]], options: Dict[str, Any], heartbeats, stop_event):
+    # Ctrl-C goes to the whole process group; the supervisor decides how workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(worker_main(worker_id, bots, options, heartbeats, stop_event))
+
+
+# -----------------------------
+# Supervisor
+# -----------------------------
+@dataclass
+class WorkerState:
+    worker_id: int
+    bots: List[Dict[str, Any]]
+    process: Optional[multiprocessing.Process] = None
+    started_at: float = 0.0
+    last_heartbeat: float = 0.0
+    ready: bool = False           # first heartbeat received
+    restarts: int = 0
+    failures: int = 0             # consecutive short-lived runs, for backoff
+    restart_at: Optional[float] = None
+    bot_status: Dict[str, Any] = field(default_factory=dict)
+
+
+class BotHost:
+    """
+    Starts the worker processes and keeps them healthy.
+
+    A worker that exits or sends no heartbeat for heartbeat_timeout seconds is
+    killed and started again (startup_timeout until its first heartbeat, since
+    importing and logging in takes a while). Restarts back off exponentially while a worker
+    keeps failing within stable_after seconds of starting.
+    """
+
+    def __init__(self, config: Dict[str, Any], heartbeat_timeout: float = 30.0, startup_timeout: float = 120.0,
+                 restart_delay: float = 2.0, restart_max_delay: float = 60.0, stable_after: float = 60.0):
+        self.config = config
+        self.heartbeat_timeout = heartbeat_timeout
+        self.startup_timeout = startup_timeout
+        self.restart_delay = restart_delay
+        self.restart_max_delay = restart_max_delay
+        self.stable_after = stable_after
+        # spawn, not fork: each worker must start its own Node bridge from scratch
+        self.context = multiprocessing.get_context("spawn")
+        self.heartbeats = self.context.Queue()
+        self.stop_event = self.context.Event()
+        self.options = {key: value for key, value in config.items() if key not in ("bots", "defaults")}
+        bots = config["bots"]
+        count = worker_count(len(bots), config.get("workers"), config.get("bots_per_worker", 8))
+        self.workers = [WorkerState(i, shard_bots) for i, shard_bots in enumerate(shard(bots, count))]
+
+    def start(self):
+        for worker in self.workers:
+            self._spawn(worker)
+
+    def _spawn(self, worker: WorkerState):
+        worker.process = self.context.Process(
+            target=run_worker,
+            args=(worker.worker_id, worker.bots, self.options, self.heartbeats, self.stop_event),
+            name=f"bot-worker-{worker.worker_id}",
+            daemon=True
+        )
+        worker.process.start()
+        worker.started_at = worker.last_heartbeat = time.monotonic()
+        worker.ready = False
+        worker.restart_at = None
+
+    def check(self):
+        """Drain heartbeats, then restart workers that died or went silent."""
+        self._drain_heartbeats()
+        now = time.monotonic()
+        for worker in self.workers:
+            if worker.restart_at is not None:
+                if now >= worker.restart_at:
+                    worker.restarts += 1
+                    print(f"Restarting worker {worker.worker_id} (restart #{worker.restarts})")
+                    self._spawn(worker)
+                continue
+            if not worker.process.is_alive():
+                self._schedule_restart(worker, f"exited with code {worker.process.exitcode}")
+            elif now - worker.last_heartbeat > (self.heartbeat_timeout if worker.ready else self.startup_timeout):
+                worker.process.kill()
+                worker.process.join(5)
+                self._schedule_restart(worker, f"no heartbeat for {now - worker.last_heartbeat:.0f}s")
+
+    def _drain_heartbeats(self):
+        while True:
+            try:
+                beat = self.heartbeats.get_nowait()
+            except queue.Empty:
+                return
+            worker = self.workers[beat["worker"]]
+            # Ignore late beats from a process that was already replaced
+            if worker.process is not None and worker.process.pid == beat["pid"]:
+                worker.last_heartbeat = time.monotonic()
+                worker.ready = True
+                worker.bot_status = beat["bots"]
+
+    def _schedule_restart(self, worker: WorkerState, reason: str):
+        uptime = time.monotonic() - worker.started_at
+        worker.failures = 1 if uptime > self.stable_after else worker.failures + 1
+        delay = min(self.restart_max_delay, self.restart_delay * 2 ** (worker.failures - 1))
+        print(f"Worker {worker.worker_id} {reason} after {uptime:.0f}s; restarting in {delay:.0f}s")
+        worker.bot_status = {}
+        worker.restart_at = time.monotonic() + delay
+
+    def status(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {
+                "worker": worker.worker_id,
+                "pid": worker.process.pid if worker.process is not None else None,
+                "alive": worker.restart_at is None and worker.process is not None and worker.process.is_alive(),
+                "ready": worker.ready,
+                "heartbeat_age": round(now - worker.last_heartbeat, 1),
+                "restarts": worker.restarts,
+                "bots": worker.bot_status,
+            }
+            for worker in self.workers
+        ]
+
+    def stop(self, timeout: float = 10.0):
+        """Ask workers to log their bots out, then terminate any that don't exit in time."""
+        self.stop_event.set()
+        deadline = time.monotonic() + timeout
+        for worker in self.workers:
+            if worker.process is not None:
+                worker.process.join(max(0.0, deadline - time.monotonic()))
+                if worker.process.is_alive():
+                    worker.process.terminate()
+                    worker.process.join(1)
+
+    def run(self, check_interval: float = 1.0, status_interval: Optional[float] = None):
+        """Supervise until SIGINT/SIGTERM."""
+        signal.signal(signal.SIGTERM, _interrupt)
+        self.start()
+        bots = sum(len(worker.bots) for worker in self.workers)
+        print(f"Bot host running {bots} bots in {len(self.workers)} worker processes")
+        last_status = time.monotonic()
+        try:
+            while True:
+                time.sleep(check_interval)
+                self.check()
+                if status_interval and time.monotonic() - last_status >= status_interval:
+                    last_status = time.monotonic()
+                    print(json.dumps(self.status()))
+        except KeyboardInterrupt:
+            print("Stopping bot host")
+        finally:
+            self.stop()
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("config", help="JSON config file")
+    parser.add_argument("--workers", type=int, help="override the config's max worker processes")
+    parser.add_argument("--heartbeat-timeout", type=float, default=30.0)
+    parser.add_argument("--status-interval", type=float, help="print worker and bot status every N seconds")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    if args.workers:
+        config["workers"] = args.workers
+    BotHost(config, heartbeat_timeout=args.heartbeat_timeout).run(status_interval=args.status_interval)
+
+
+if __name__ == "__main__":
+    main()
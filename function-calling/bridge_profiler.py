@@ -0,0 +1,353 @@
+"""
+Opt-in instrumentation for the `javascript` bridge.
+
+Wrap a mineflayer bot proxy with BridgeProfiler.wrap() and every attribute read,
+write, call, index and iteration on it (and on the proxies it returns) is counted
+and timed. Each access on a real bot is a Python <-> Node round trip, so the numbers
+show how many crossings a tool invocation or an LLM turn costs.
+
+    profiler = BridgeProfiler()
+    bot = profiler.wrap(mineflayer.createBot(config))
+    with profiler.turn(), profiler.tool("look_around"):
+        ...
+    print(profiler.to_json())
+    profiler.serve_metrics(9100)   # Prometheus text on /metrics, JSON on /report.json
+"""
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Upper bounds in milliseconds, Prometheus style (cumulative, +Inf last)
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+# Values that come back by value rather than as another JS proxy
+_PLAIN_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+@dataclass
+class Histogram:
+    counts: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    total_ms: float = 0.0
+    count: int = 0
+
+    def observe(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 4) if self.count else 0.0,
+            "buckets": {
+                **{str(bound): n for bound, n in zip(LATENCY_BUCKETS_MS, self.counts)},
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+@dataclass
+class ToolStats:
+    invocations: int = 0
+    bridge_calls: int = 0
+    bridge_ms: float = 0.0
+
+
+@dataclass
+class TurnStats:
+    label: str
+    bridge_calls: int = 0
+    bridge_ms: float = 0.0
+    started_at: float = field(default_factory=time.time)
+
+
+_current_tool: ContextVar[Optional[str]] = ContextVar("bridge_profiler_tool", default=None)
+_current_turn: ContextVar[Optional[TurnStats]] = ContextVar("bridge_profiler_turn", default=None)
+
+
+class BridgeProfiler:
+    """
+    Collects per-attribute latency histograms, per-tool call counts and bridge
+    time per LLM turn. With record_calls=True it also keeps an ordered log of
+    every access, which is what tests assert against when wrapping a fake bot.
+    """
+
+    def __init__(self, record_calls: bool = False, max_turns: int = 200, max_log: int = 10000):
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, Histogram] = {}
+        self.tools: Dict[str, ToolStats] = {}
+        self.turns: Deque[TurnStats] = deque(maxlen=max_turns)
+        self.total_calls = 0
+        self.total_ms = 0.0
+        self.record_calls = record_calls
+        self.call_log: Deque[Tuple[str, str]] = deque(maxlen=max_log)
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def wrap(self, target: Any, path: str = "bot") -> "InstrumentedProxy":
+        return InstrumentedProxy(target, self, path)
+
+    # -----------------------------
+    # Scopes
+    # -----------------------------
+    @contextmanager
+    def tool(self, name: str):
+        """Attribute bridge calls made inside the block to tool `name`."""
+        with self._lock:
+            self.tools.setdefault(name, ToolStats()).invocations += 1
+        token = _current_tool.set(name)
+        try:
+            yield
+        finally:
+            _current_tool.reset(token)
+
+    @contextmanager
+    def turn(self, label: str = ""):
+        """Accumulate the bridge calls of one LLM turn (request + tool execution)."""
+        stats = TurnStats(label=label)
+        token = _current_turn.set(stats)
+        try:
+            yield stats
+        finally:
+            _current_turn.reset(token)
+            with self._lock:
+                self.turns.append(stats)
+
+    # -----------------------------
+    # Recording
+    # -----------------------------
+    def record(self, key: str, kind: str, seconds: float):
+        ms = seconds * 1000
+        tool = _current_tool.get()
+        turn = _current_turn.get()
+        with self._lock:
+            self.total_calls += 1
+            self.total_ms += ms
+            self.histograms.setdefault(key, Histogram()).observe(ms)
+            if tool is not None:
+                stats = self.tools.setdefault(tool, ToolStats())
+                stats.bridge_calls += 1
+                stats.bridge_ms += ms
+            if turn is not None:
+                turn.bridge_calls += 1
+                turn.bridge_ms += ms
+            if self.record_calls:
+                self.call_log.append((kind, key))
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.tools.clear()
+            self.turns.clear()
+            self.call_log.clear()
+            self.total_calls = 0
+            self.total_ms = 0.0
+
+    # -----------------------------
+    # Export
+    # -----------------------------
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            turns = list(self.turns)
+            return {
+                "total_calls": self.total_calls,
+                "total_ms": round(self.total_ms, 3),
+                "attributes": {key: hist.as_dict() for key, hist in sorted(self.histograms.items())},
+                "tools": {
+                    name: {
+                        "invocations": stats.invocations,
+                        "bridge_calls": stats.bridge_calls,
+                        "bridge_ms": round(stats.bridge_ms, 3),
+                        "calls_per_invocation": round(stats.bridge_calls / stats.invocations, 2)
+                        if stats.invocations else 0.0,
+                    }
+                    for name, stats in sorted(self.tools.items())
+                },
+                "turns": [
+                    {"label": t.label, "bridge_calls": t.bridge_calls, "bridge_ms": round(t.bridge_ms, 3)}
+                    for t in turns
+                ],
+            }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.report(), indent=indent)
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP bridge_calls_total Python <-> Node bridge crossings.",
+            "# TYPE bridge_calls_total counter",
+            f"bridge_calls_total {self.total_calls}",
+            "# HELP bridge_call_duration_ms Latency of one bridge crossing by attribute path.",
+            "# TYPE bridge_call_duration_ms histogram",
+        ]
+        with self._lock:
+            for key, hist in sorted(self.histograms.items()):
+                label = _escape(key)
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS_MS, hist.counts):
+                    cumulative += n
+                    lines.append(f'bridge_call_duration_ms_bucket{{attr="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'bridge_call_duration_ms_bucket{{attr="{label}",le="+Inf"}} {hist.count}')
+                lines.append(f'bridge_call_duration_ms_sum{{attr="{label}"}} {hist.total_ms:.6f}')
+                lines.append(f'bridge_call_duration_ms_count{{attr="{label}"}} {hist.count}')
+
+            lines += [
+                "# HELP bridge_tool_invocations_total Tool invocations seen by the profiler.",
+                "# TYPE bridge_tool_invocations_total counter",
+            ]
+            lines += [f'bridge_tool_invocations_total{{tool="{_escape(n)}"}} {s.invocations}' for n, s in sorted(self.tools.items())]
+            lines += [
+                "# HELP bridge_tool_calls_total Bridge crossings made while running a tool.",
+                "# TYPE bridge_tool_calls_total counter",
+            ]
+            lines += [f'bridge_tool_calls_total{{tool="{_escape(n)}"}} {s.bridge_calls}' for n, s in sorted(self.tools.items())]
+            lines += [
+                "# HELP bridge_tool_ms_total Bridge time spent while running a tool.",
+                "# TYPE bridge_tool_ms_total counter",
+            ]
+            lines += [f'bridge_tool_ms_total{{tool="{_escape(n)}"}} {s.bridge_ms:.6f}' for n, s in sorted(self.tools.items())]
+
+            if self.turns:
+                last = self.turns[-1]
+                lines += [
+                    "# HELP bridge_last_turn_ms Bridge time of the most recent LLM turn.",
+                    "# TYPE bridge_last_turn_ms gauge",
+                    f"bridge_last_turn_ms {last.bridge_ms:.6f}",
+                    "# HELP bridge_last_turn_calls Bridge crossings of the most recent LLM turn.",
+                    "# TYPE bridge_last_turn_calls gauge",
+                    f"bridge_last_turn_calls {last.bridge_calls}",
+                ]
+        return "\n".join(lines) + "\n"
+
+    def serve_metrics(self, port: int = 9100, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve /metrics (Prometheus text) and /report.json from a daemon thread."""
+        profiler = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics"):
+                    body, content_type = profiler.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path.startswith("/report.json"):
+                    body, content_type = profiler.to_json(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def stop_metrics(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def unwrap(obj: Any) -> Any:
+    """The underlying object of an InstrumentedProxy (anything else is returned as is)."""
+    while isinstance(obj, InstrumentedProxy):
+        obj = object.__getattribute__(obj, "_target")
+    return obj
+
+
+# -----------------------------
+# Proxy wrapper
+# -----------------------------
+class InstrumentedProxy:
+    __slots__ = ("_target", "_profiler", "_path")
+
+    def __init__(self, target: Any, profiler: BridgeProfiler, path: str):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_profiler", profiler)
+        object.__setattr__(self, "_path", path)
+
+    def _wrap_result(self, value: Any, path: str) -> Any:
+        if isinstance(value, _PLAIN_TYPES) or isinstance(value, InstrumentedProxy):
+            return value
+        return InstrumentedProxy(value, object.__getattribute__(self, "_profiler"), path)
+
+    def _timed(self, kind: str, key: str, fn, *args, **kwargs):
+        profiler = object.__getattribute__(self, "_profiler")
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.record(key, kind, time.perf_counter() - start)
+
+    def __getattr__(self, name: str) -> Any:
+        target = object.__getattribute__(self, "_target")
+        path = f"{object.__getattribute__(self, '_path')}.{name}"
+        value = self._timed("get", path, getattr, target, name)
+        return self._wrap_result(value, path)
+
+    def __setattr__(self, name: str, value: Any):
+        target = object.__getattribute__(self, "_target")
+        path = f"{object.__getattribute__(self, '_path')}.{name}"
+        self._timed("set", path, setattr, target, name, unwrap(value))
+
+    def __call__(self, *args, **kwargs) -> Any:
+        target = object.__getattribute__(self, "_target")
+        path = f"{object.__getattribute__(self, '_path')}()"
+        args = tuple(unwrap(a) for a in args)
+        kwargs = {k: unwrap(v) for k, v in kwargs.items()}
+        value = self._timed("call", path, target, *args, **kwargs)
+        return self._wrap_result(value, path)
+
+    def __getitem__(self, key: Any) -> Any:
+        target = object.__getattribute__(self, "_target")
+        path = f"{object.__getattribute__(self, '_path')}[]"
+        value = self._timed("item", path, target.__getitem__, unwrap(key))
+        return self._wrap_result(value, path)
+
+    def __iter__(self):
+        target = object.__getattribute__(self, "_target")
+        path = f"{object.__getattribute__(self, '_path')}[]"
+        iterator = self._timed("iter", path, iter, target)
+        while True:
+            try:
+                value = self._timed("iter", path, next, iterator)
+            except StopIteration:
+                return
+            yield self._wrap_result(value, path)
+
+    def __len__(self) -> int:
+        target = object.__getattribute__(self, "_target")
+        return self._timed("len", f"{object.__getattribute__(self, '_path')}.length", len, target)
+
+    def __await__(self):
+        return unwrap(self).__await__()
+
+    def __bool__(self) -> bool:
+        return bool(object.__getattribute__(self, "_target"))
+
+    def __eq__(self, other: Any) -> bool:
+        return object.__getattribute__(self, "_target") == unwrap(other)
+
+    def __hash__(self) -> int:
+        return hash(object.__getattribute__(self, "_target"))
+
+    def __repr__(self) -> str:
+        return f"<instrumented {object.__getattribute__(self, '_path')}: {object.__getattribute__(self, '_target')!r}>"
@@ -0,0 +1,63 @@
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from bridge_profiler import unwrap
+from world_snapshot import load_world_query
+
+
+class GameContextCache:
+    """
+    Game context (position, health, food, time of day, weather) kept current from
+    mineflayer events by world_query.watchContext. Node pushes a new JSON snapshot
+    only when a value changed, so serving the context costs no bridge calls.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._json: Optional[str] = None
+        self.updated_at: Optional[float] = None
+        self.updates = 0
+        self._watcher = None
+
+    def attach(self, bot, interval_ms: int = 250):
+        self._watcher = load_world_query().watchContext(unwrap(bot), self.update, interval_ms)
+
+    def detach(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def update(self, payload):
+        """Store a new snapshot (JSON string from Node, or a dict)."""
+        snapshot = json.loads(payload) if isinstance(payload, str) else dict(payload)
+        with self._lock:
+            self._snapshot = snapshot
+            self._json = None
+            self.updated_at = time.monotonic()
+            self.updates += 1
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return json.loads(json.dumps(self._snapshot)) if self._snapshot is not None else None
+
+    def to_json(self) -> Optional[str]:
+        with self._lock:
+            if self._snapshot is None:
+                return None
+            if self._json is None:
+                self._json = json.dumps(self._snapshot)
+            return self._json
+
+
+def context_delta(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Top-level fields of `current` that differ from `previous` (all of them if there is none)."""
+    if previous is None:
+        return dict(current)
+    return {key: value for key, value in current.items() if previous.get(key) != value}
@@ -0,0 +1,211 @@
+import asyncio
+import itertools
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+# -----------------------------
+# Delegation primitives
+# -----------------------------
+@dataclass
+class DelegatedTask:
+    id: str
+    description: str
+    status: str  # pending, running, done, failed, cancelled
+    result: Optional[Dict[str, Any]] = None
+    assigned_agent: Optional[str] = None  # e.g., "builder", "miner"
+    parent: Optional[str] = None  # username whose conversation delegated it
+    created_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    def as_dict(self) -> Dict[str, Any]:
+        info: Dict[str, Any] = {
+            "task_id": self.id,
+            "agent": self.assigned_agent,
+            "description": self.description,
+            "status": self.status,
+        }
+        if self.started_at is not None:
+            info["elapsed"] = round((self.finished_at or time.monotonic()) - self.started_at, 1)
+        if self.result is not None:
+            info["result"] = self.result
+        if self.error:
+            info["error"] = self.error
+        return info
+
+
+DelegateHandler = Callable[[DelegatedTask], Awaitable[Dict[str, Any]]]
+CompletionCallback = Callable[[DelegatedTask], None]
+
+
+class DelegationScheduler:
+    """
+    Runs delegated tasks as asyncio tasks, outside the conversation that created them.
+
+    submit() returns at once with a pending task; the task starts when a slot is
+    free (max_running overall, per_agent_limit per agent), runs its agent's handler
+    and ends done, failed or cancelled. on_complete is called on the loop thread
+    for every finished task, which is how results get back to the parent.
+    """
+
+    def __init__(self, handlers: Dict[str, DelegateHandler], max_running: int = 2,
+                 per_agent_limit: int = 1, on_complete: Optional[CompletionCallback] = None,
+                 keep_finished: int = 100):
+        self.handlers = handlers
+        self.max_running = max_running
+        self.per_agent_limit = per_agent_limit
+        self.on_complete = on_complete
+        self.keep_finished = keep_finished
+        self.tasks: Dict[str, DelegatedTask] = {}
+        self._runners: Dict[str, asyncio.Task] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._agent_slots: Dict[str, asyncio.Semaphore] = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, agent: str, description: str, parent: Optional[str] = None) -> DelegatedTask:
+        if agent not in self.handlers:
+            raise ValueError(f"Unknown agent '{agent}', expected one of {sorted(self.handlers)}")
+        task = DelegatedTask(
+            id=f"task-{next(self._ids)}",
+            description=description,
+            status="pending",
+            assigned_agent=agent,
+            parent=parent
+        )
+        self.tasks[task.id] = task
+        self._runners[task.id] = asyncio.create_task(self._run(task))
+        self._prune()
+        return task
+
+    def cancel(self, task_id: str) -> bool:
+        runner = self._runners.get(task_id)
+        if runner is None or runner.done():
+            return False
+        runner.cancel()
+        return True
+
+    def cancel_all(self):
+        for task_id in list(self._runners):
+            self.cancel(task_id)
+
+    def get(self, task_id: str) -> Optional[DelegatedTask]:
+        return self.tasks.get(task_id)
+
+    def for_parent(self, parent: str) -> List[DelegatedTask]:
+        return [task for task in self.tasks.values() if task.parent == parent]
+
+    def active(self) -> List[DelegatedTask]:
+        return [task for task in self.tasks.values() if not task.done]
+
+    async def _run(self, task: DelegatedTask):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_running)
+        agent_slots = self._agent_slots.setdefault(task.assigned_agent, asyncio.Semaphore(self.per_agent_limit))
+        try:
+            async with self._slots, agent_slots:
+                task.status = "running"
+                task.started_at = time.monotonic()
+                print(f"Delegated {task.id} to {task.assigned_agent}: {task.description}")
+                task.result = await self.handlers[task.assigned_agent](task)
+                task.status = "done"
+        except asyncio.CancelledError:
+            task.status = "cancelled"
+            task.error = "Cancelled"
+        except Exception as e:
+            traceback.print_exc()
+            task.status = "failed"
+            task.error = str(e)
+        finally:
+            task.finished_at = time.monotonic()
+            self._runners.pop(task.id, None)
+        print(f"Delegated {task.id} {task.status}")
+        if self.on_complete is not None:
+            try:
+                self.on_complete(task)
+            except Exception:
+                traceback.print_exc()
+
+    def _prune(self):
+        finished = [task_id for task_id, task in self.tasks.items() if task.done]
+        for task_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self.tasks[task_id]
+
+
+# -----------------------------
+# Specialised sub-agents
+# -----------------------------
+@dataclass
+class SubAgent:
+    """
+    An LLM loop with its own instructions and tool subset. It shares the parent
+    processor's client, tools and body lock, but never whispers players itself:
+    its final text becomes the task result.
+    """
+    name: str
+    instructions: str
+    tools: Sequence[str]
+    max_iterations: int = 8
+
+    def handler(self, processor) -> DelegateHandler:
+        async def run(task: DelegatedTask) -> Dict[str, Any]:
+            return await self.run(processor, task)
+        return run
+
+    async def run(self, processor, task: DelegatedTask) -> Dict[str, Any]:
+        tools = processor.prompt_builder.tool_subset(self.tools)
+        conversation: List[Dict[str, Any]] = [
+            {"role": "system", "content": self.instructions},
+            {"role": "user", "content": f"Task: {task.description}"},
+            processor.prompt_builder.context_message(processor.get_game_context()),
+        ]
+        actions: List[Any] = []
+        for _ in range(self.max_iterations):
+            response = await processor.client.create_response(
+                purpose="tool",
+                model=processor.model,
+                input=conversation,
+                tools=tools,
+                tool_choice="auto"
+            )
+            processor.prefix_cache_stats.record(getattr(response, "usage", None))
+            units = getattr(response, "output", None) or []
+            calls = [unit for unit in units if getattr(unit, "type", None) == "function_call"]
+            if not calls:
+                summary = (getattr(response, "output_text", "") or "").replace("\n", " ").strip()
+                return {"summary": summary or "Finished", "actions": actions}
+            results = await processor._execute_function_calls(calls)
+            for call, result in zip(calls, results):
+                actions.append({"tool": call.name, "status": result.get("status", "error")})
+                conversation.append({"role": "assistant", "content": str([result])})
+        return {"summary": f"Stopped after {self.max_iterations} steps", "actions": actions}
+
+
+DEFAULT_AGENTS = (
+    SubAgent(
+        name="miner",
+        instructions=(
+            "You are a Minecraft mining agent working for another bot. Complete the task using "
+            "your tools, checking your surroundings and inventory as needed. Use absolute "
+            "coordinates for movement. When finished, or if the task is impossible, reply with "
+            "a one-sentence summary of what you did and no function call."
+        ),
+        tools=("mine_block", "move_to", "move_forward", "turn", "look_around", "get_inventory"),
+    ),
+    SubAgent(
+        name="builder",
+        instructions=(
+            "You are a Minecraft building agent working for another bot. Complete the task using "
+            "your tools, crafting or gathering what you need from your inventory. Use absolute "
+            "coordinates for movement. When finished, or if the task is impossible, reply with "
+            "a one-sentence summary of what you did and no function call."
+        ),
+        tools=("place_block", "craft_item", "move_to", "move_forward", "turn", "look_around", "get_inventory"),
+    ),
+)
@@ -0,0 +1,180 @@
+import heapq
+import json
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from bridge_profiler import unwrap
+from world_snapshot import load_world_query
+
+Point = Tuple[float, float, float]
+
+
+@dataclass
+class EntityRecord:
+    id: int
+    name: str
+    type: str
+    x: float
+    y: float
+    z: float
+
+    def distance_to(self, point: Point) -> float:
+        return math.sqrt((self.x - point[0]) ** 2 + (self.y - point[1]) ** 2 + (self.z - point[2]) ** 2)
+
+    def as_dict(self, point: Optional[Point] = None) -> Dict[str, Any]:
+        info: Dict[str, Any] = {
+            'id': self.id,
+            'name': self.name,
+            'type': self.type,
+            'position': {'x': self.x, 'y': self.y, 'z': self.z}
+        }
+        if point is not None:
+            info['distance'] = round(self.distance_to(point), 2)
+        return info
+
+
+class EntityIndex:
+    """
+    Uniform-grid spatial index of the entities around the bot.
+
+    Kept in sync by world_query.watchEntities, which collects entitySpawn /
+    entityMoved / entityUpdate / entityGone in Node and delivers them as one JSON
+    batch per flush interval, so queries never touch the bridge. Supports radius
+    and k-nearest queries filtered by entity type.
+    """
+
+    def __init__(self, cell_size: float = 8.0):
+        self.cell_size = cell_size
+        self._lock = threading.Lock()
+        self._records: Dict[int, EntityRecord] = {}
+        self._cells: Dict[Tuple[int, int, int], Set[int]] = {}
+        self._watcher = None
+
+    # -----------------------------
+    # Event wiring
+    # -----------------------------
+    def attach(self, bot, flush_interval_ms: int = 100):
+        self._watcher = load_world_query().watchEntities(unwrap(bot), self.apply_batch, flush_interval_ms)
+
+    def detach(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def apply_batch(self, payload):
+        """Apply one batch of entity changes (JSON string or list of dicts)."""
+        changes = json.loads(payload) if isinstance(payload, str) else payload
+        with self._lock:
+            for change in changes:
+                if change.get("gone"):
+                    self._remove(change["id"])
+                else:
+                    self._upsert(EntityRecord(
+                        id=change["id"],
+                        name=change.get("name") or "unknown",
+                        type=change.get("type") or "unknown",
+                        x=change["x"], y=change["y"], z=change["z"]
+                    ))
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def within(self, point: Point, radius: float, types: Optional[Iterable[str]] = None) -> List[EntityRecord]:
+        """Entities within `radius` of `point`, nearest first."""
+        wanted = set(types) if types is not None else None
+        reach = math.ceil(radius / self.cell_size)
+        cx, cy, cz = self._cell(point[0], point[1], point[2])
+        found = []
+        with self._lock:
+            for dx in range(-reach, reach + 1):
+                for dy in range(-reach, reach + 1):
+                    for dz in range(-reach, reach + 1):
+                        for entity_id in self._cells.get((cx + dx, cy + dy, cz + dz), ()):
+                            record = self._records[entity_id]
+                            if wanted is not None and record.type not in wanted:
+                                continue
+                            distance = record.distance_to(point)
+                            if distance <= radius:
+                                found.append((distance, entity_id, record))
+        found.sort(key=lambda item: (item[0], item[1]))
+        return [record for _, _, record in found]
+
+    def nearest(self, point: Point, k: int = 1, types: Optional[Iterable[str]] = None,
+                max_distance: Optional[float] = None) -> List[EntityRecord]:
+        """k nearest entities, searching outward one shell of grid cells at a time."""
+        wanted = set(types) if types is not None else None
+        cx, cy, cz = self._cell(point[0], point[1], point[2])
+        heap: List[Tuple[float, int, EntityRecord]] = []
+        with self._lock:
+            if not self._records:
+                return []
+            max_ring = self._max_ring(cx, cy, cz)
+            if max_distance is not None:
+                max_ring = min(max_ring, math.ceil(max_distance / self.cell_size))
+            for ring in range(max_ring + 1):
+                for cell in self._shell(cx, cy, cz, ring):
+                    for entity_id in self._cells.get(cell, ()):
+                        record = self._records[entity_id]
+                        if wanted is not None and record.type not in wanted:
+                            continue
+                        distance = record.distance_to(point)
+                        if max_distance is None or distance <= max_distance:
+                            heapq.heappush(heap, (distance, entity_id, record))
+                # Every unvisited cell is at least ring * cell_size away
+                if len(heap) >= k and heapq.nsmallest(k, heap)[-1][0] <= ring * self.cell_size:
+                    break
+        return [record for _, _, record in heapq.nsmallest(k, heap)]
+
+    def get(self, entity_id: int) -> Optional[EntityRecord]:
+        return self._records.get(entity_id)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    # -----------------------------
+    # Internals (callers hold the lock)
+    # -----------------------------
+    def _cell(self, x: float, y: float, z: float) -> Tuple[int, int, int]:
+        size = self.cell_size
+        return (math.floor(x / size), math.floor(y / size), math.floor(z / size))
+
+    def _upsert(self, record: EntityRecord):
+        old = self._records.get(record.id)
+        new_cell = self._cell(record.x, record.y, record.z)
+        if old is not None:
+            old_cell = self._cell(old.x, old.y, old.z)
+            if old_cell != new_cell:
+                self._discard(old_cell, record.id)
+        self._records[record.id] = record
+        self._cells.setdefault(new_cell, set()).add(record.id)
+
+    def _remove(self, entity_id: int):
+        old = self._records.pop(entity_id, None)
+        if old is not None:
+            self._discard(self._cell(old.x, old.y, old.z), entity_id)
+
+    def _discard(self, cell, entity_id: int):
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(entity_id)
+            if not members:
+                del self._cells[cell]
+
+    def _max_ring(self, cx: int, cy: int, cz: int) -> int:
+        return max(
+            max(abs(x - cx), abs(y - cy), abs(z - cz))
+            for x, y, z in self._cells
+        )
+
+    @staticmethod
+    def _shell(cx: int, cy: int, cz: int, ring: int):
+        if ring == 0:
+            yield (cx, cy, cz)
+            return
+        for dx in range(-ring, ring + 1):
+            for dy in range(-ring, ring + 1):
+                edge = abs(dx) == ring or abs(dy) == ring
+                for dz in (range(-ring, ring + 1) if edge else (-ring, ring)):
+                    yield (cx + dx, cy + dy, cz + dz)
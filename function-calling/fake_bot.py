@@ -0,0 +1,229 @@
+"""
+In-process stand-in for a mineflayer bot, for running WhisperMessageProcessor
+without a Minecraft server or Node.
+
+Implements what the processor and ActionTracker touch: whisper/chat, entity
+position, health/food/time/weather, event listeners, the inventory window and
+pathfinder.setGoal. Movement takes distance / speed seconds and its events fire
+from a timer thread, the same way real pathfinder events arrive on the JS bridge
+thread. Listeners are called with the emitter first, as the bridge calls them.
+"""
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class FakeVec3:
+    def __init__(self, x: float, y: float, z: float):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def offset(self, dx: float, dy: float, dz: float) -> "FakeVec3":
+        return FakeVec3(self.x + dx, self.y + dy, self.z + dz)
+
+    def distanceTo(self, other: "FakeVec3") -> float:
+        return math.sqrt((self.x - other.x) ** 2 + (self.y - other.y) ** 2 + (self.z - other.z) ** 2)
+
+    def __repr__(self):
+        return f"FakeVec3({self.x:.1f}, {self.y:.1f}, {self.z:.1f})"
+
+
+class GoalNear:
+    """Same constructor as mineflayer-pathfinder's goals.GoalNear."""
+
+    def __init__(self, x: float, y: float, z: float, range_: float = 1):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.range = range_
+
+
+class FakeEntity:
+    """The bot's own entity; position is interpolated while the pathfinder is moving."""
+
+    def __init__(self, position: FakeVec3):
+        self._position = position
+        self.pathfinder: Optional["FakePathfinder"] = None
+        self.yaw = 0.0
+        self.pitch = 0.0
+
+    @property
+    def position(self) -> FakeVec3:
+        if self.pathfinder is not None:
+            moving = self.pathfinder.position_at(time.monotonic())
+            if moving is not None:
+                return moving
+        return self._position
+
+    @position.setter
+    def position(self, value: FakeVec3):
+        self._position = value
+
+
+class FakeTime:
+    def __init__(self, time_of_day: int = 6000):
+        self.timeOfDay = time_of_day
+
+
+class FakePathfinder:
+    """Moves in a straight line at `speed` blocks per second; interpolates position meanwhile."""
+
+    def __init__(self, bot: "FakeBot", speed: float):
+        self.bot = bot
+        self.speed = speed
+        self.goal: Optional[GoalNear] = None
+        self._timer: Optional[threading.Timer] = None
+        self._leg: Optional[Tuple[FakeVec3, FakeVec3, float, float]] = None  # start, end, t0, duration
+        self._lock = threading.Lock()
+
+    def setGoal(self, goal: Optional[GoalNear]):
+        with self._lock:
+            self._settle()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            stopped = self.goal is not None and goal is None
+            self.goal = goal
+            if goal is not None:
+                start = self.bot.entity.position
+                end = FakeVec3(goal.x, goal.y, goal.z)
+                duration = start.distanceTo(end) / self.speed if self.speed > 0 else 0.0
+                self._leg = (start, end, time.monotonic(), duration)
+                self._timer = threading.Timer(duration, self._arrive, args=(goal,))
+                self._timer.daemon = True
+                self._timer.start()
+        if stopped:
+            self.bot.emit("path_stop")
+
+    def isMoving(self) -> bool:
+        return self.goal is not None
+
+    def position_at(self, now: float) -> Optional[FakeVec3]:
+        leg = self._leg
+        if leg is None:
+            return None
+        start, end, t0, duration = leg
+        f = 1.0 if duration <= 0 else min(1.0, (now - t0) / duration)
+        return FakeVec3(start.x + (end.x - start.x) * f,
+                        start.y + (end.y - start.y) * f,
+                        start.z + (end.z - start.z) * f)
+
+    def _settle(self):
+        # Freeze the interpolated position (caller holds the lock)
+        position = self.position_at(time.monotonic())
+        self._leg = None
+        if position is not None:
+            self.bot.entity.position = position
+
+    def _arrive(self, goal: GoalNear):
+        with self._lock:
+            if self.goal is not goal:
+                return
+            self._leg = None
+            self.bot.entity.position = FakeVec3(goal.x, goal.y, goal.z)
+            self.goal = None
+            self._timer = None
+        self.bot.emit("goal_reached", goal)
+
+
+class FakeEmitter:
+    """EventEmitter subset; listeners fire on the emitting thread."""
+
+    def __init__(self):
+        self._listeners: Dict[str, List[Callable]] = {}
+        self._listeners_lock = threading.Lock()
+
+    def on(self, event: str, handler: Callable):
+        with self._listeners_lock:
+            self._listeners.setdefault(event, []).append(handler)
+
+    def once(self, event: str, handler: Callable):
+        def wrapper(*args):
+            self.removeListener(event, wrapper)
+            handler(*args)
+        wrapper.__wrapped__ = handler
+        self.on(event, wrapper)
+
+    def removeListener(self, event: str, handler: Callable):
+        with self._listeners_lock:
+            handlers = self._listeners.get(event, [])
+            for i, registered in enumerate(handlers):
+                if registered is handler or getattr(registered, "__wrapped__", None) is handler:
+                    del handlers[i]
+                    break
+
+    def emit(self, event: str, *args):
+        # Like the JS bridge, listeners get the emitter (`this`) before the event's arguments
+        with self._listeners_lock:
+            handlers = list(self._listeners.get(event, ()))
+        for handler in handlers:
+            handler(self, *args)
+
+    def listener_count(self, event: str) -> int:
+        with self._listeners_lock:
+            return len(self._listeners.get(event, ()))
+
+
+class FakeItem:
+    def __init__(self, name: str, count: int = 1, slot: int = 36, display_name: Optional[str] = None):
+        self.name = name
+        self.displayName = display_name or name.replace("_", " ").title()
+        self.count = count
+        self.slot = slot
+
+
+class FakeInventory(FakeEmitter):
+    """The player window: items() covers slots 9-44 and set_slot() emits updateSlot."""
+
+    def __init__(self):
+        super().__init__()
+        self.inventoryStart = 9
+        self.inventoryEnd = 45
+        self.slots: Dict[int, FakeItem] = {}
+
+    def items(self) -> List[FakeItem]:
+        return [self.slots[slot] for slot in sorted(self.slots) if self.inventoryStart <= slot < self.inventoryEnd]
+
+    def set_slot(self, slot: int, item: Optional[FakeItem]):
+        old_item = self.slots.pop(slot, None)
+        if item is not None:
+            item.slot = slot
+            self.slots[slot] = item
+        self.emit("updateSlot", slot, old_item, item)
+
+
+class FakeBot(FakeEmitter):
+    """
+    - speed: pathfinder speed in blocks per second
+    - on_whisper: called as on_whisper(username, message) for every whisper the bot sends
+    """
+
+    def __init__(self, username: str = "FakeBot", position: Tuple[float, float, float] = (0, 64, 0),
+                 speed: float = 20.0, on_whisper: Optional[Callable[[str, str], None]] = None):
+        super().__init__()
+        self.username = username
+        self.entity = FakeEntity(FakeVec3(*position))
+        self.health = 20
+        self.food = 20
+        self.time = FakeTime()
+        self.isRaining = False
+        self.thunderState = 0
+        self.on_whisper = on_whisper
+        self.whispers: List[Tuple[float, str, str]] = []
+        self.chats: List[Tuple[float, str]] = []
+        self.inventory = FakeInventory()
+        self.pathfinder = FakePathfinder(self, speed)
+        self.entity.pathfinder = self.pathfinder
+
+    # -----------------------------
+    # Chat
+    # -----------------------------
+    def whisper(self, username: str, message: str):
+        self.whispers.append((time.monotonic(), username, message))
+        if self.on_whisper is not None:
+            self.on_whisper(username, message)
+
+    def chat(self, message: str):
+        self.chats.append((time.monotonic(), message))
@@ -1,6 +1,13 @@
 from javascript import require, On, Once, AsyncTask, once, off
 import asyncio
 import math
+from typing import Any, Dict, Literal
+
+from tool_registry import ToolRegistry, tool
+from world_snapshot import MAX_SNAPSHOT_RADIUS, fetch_snapshot
+from actions import ActionTracker
+from inventory_index import InventoryIndex
+from entity_index import EntityIndex
 
 # Import JavaScript modules
 mineflayer = require('mineflayer')
@@ -9,24 +16,51 @@ Movements = require('mineflayer-pathfinder').Movements
 goals = require('mineflayer-pathfinder').goals
 
 class MinecraftBot:
-    def __init__(self, username, host='localhost', port=25565):
-        self.bot = mineflayer.createBot({
-            'host': host,
-            'port': port,
-            'username': username
-        })
+    """
+    Agent actions on a mineflayer bot. Every @tool method is exposed to the model
+    through MinecraftBot.tool_registry; pass `bot` to wrap a bot created elsewhere
+    (with pathfinder already loaded) instead of connecting a new one.
+    """
+
+    def __init__(self, username=None, host='localhost', port=25565, profiler=None, bot=None,
+                 move_timeout=30.0):
+        if bot is None:
+            bot = mineflayer.createBot({
+                'host': host,
+                'port': port,
+                'username': username
+            })
+            # Load plugins
+            bot.loadPlugin(pathfinder)
+        self.bot = bot
         
-        # Load plugins
-        self.bot.loadPlugin(pathfinder)
+        # Inventory mirror and entity spatial index, kept current from events once spawned
+        self.inventory = InventoryIndex()
+        self.entities = EntityIndex()
         
         # Set up event handlers
         @On(self.bot, 'spawn')
         def handle_spawn(this):
-            print(f"Bot {username} spawned successfully!")
+            print(f"Bot {self.bot.username} spawned successfully!")
             movements = Movements(self.bot)
             self.bot.pathfinder.setMovements(movements)
+            if self.inventory.bot is None:
+                self.inventory.attach(self.bot)
+                self.entities.attach(self.bot)
+        
+        # Optional BridgeProfiler: count and time every bridge crossing made through self.bot.
+        # Wrapped after the event handlers are registered on the raw proxy.
+        self.profiler = profiler
+        if profiler is not None:
+            self.bot = profiler.wrap(self.bot, "bot")
+        
+        # Pathfinder moves end on arrival, noPath/timeout or after move_timeout seconds;
+        # exclusive tools hold the body lock meanwhile, so every wait must be bounded
+        self.actions = ActionTracker(self.bot, default_timeout=move_timeout)
     
-    async def move_forward(self, distance):
+    @tool(params={"distance": "Number of blocks to move forward"}, exclusive=True,
+          keywords=("walk", "step", "ahead", "forward"), route_always=True)
+    async def move_forward(self, distance: float):
         """Move the agent forward by a specified number of blocks"""
         current_pos = self.bot.entity.position
         yaw = self.bot.entity.yaw
@@ -37,12 +71,17 @@ class MinecraftBot:
         target_y = current_pos.y
         
         # Use pathfinder to move to target
-        goal = self.bot.goals.GoalNear(target_x, target_y, target_z, 1)
-        self.bot.pathfinder.setGoal(goal)
-        await self._wait_for_goal_reached()
+        goal = goals.GoalNear(target_x, target_y, target_z, 1)
+        result = await self.actions.move_to(target_x, target_y, target_z, goal)
+        if result["status"] != "success":
+            raise Exception(f"Could not move forward {distance} blocks: {result.get('error', result['outcome'])}")
         return f"Moved forward {distance} blocks"
 
-    async def turn(self, direction, degrees):
+    @tool(params={
+        "direction": "Direction to turn",
+        "degrees": "Degrees to turn (typically 90 for right angles)"
+    }, exclusive=True, keywords=("rotate", "face", "spin"))
+    async def turn(self, direction: Literal['left', 'right'], degrees: float):
         """Turn the agent left or right by specified degrees"""
         current_yaw = self.bot.entity.yaw
         radians = math.radians(degrees)
@@ -55,7 +94,13 @@ class MinecraftBot:
         await self.bot.look(new_yaw, self.bot.entity.pitch, False)
         return f"Turned {direction} {degrees} degrees"
 
-    async def place_block(self, block_type, x_offset=0, y_offset=0, z_offset=0):
+    @tool(params={
+        "block_type": "Type of block to place (e.g., 'stone', 'dirt', 'wood')",
+        "x_offset": "X offset from current position",
+        "y_offset": "Y offset from current position",
+        "z_offset": "Z offset from current position"
+    }, exclusive=True, keywords=("put", "build", "placing", "wall", "pillar"), route_always=True)
+    async def place_block(self, block_type: str, x_offset: float = 0, y_offset: float = 0, z_offset: float = 0):
         """Place a block at the agent's current position or relative position"""
         # Find the block in inventory
         block_item = self._find_inventory_item(block_type)
@@ -73,7 +118,12 @@ class MinecraftBot:
         await self.bot.placeBlock(reference_block, self.bot.Vec3(x_offset, y_offset, z_offset))
         return f"Placed {block_type} block at offset ({x_offset}, {y_offset}, {z_offset})"
 
-    async def mine_block(self, x_offset, y_offset, z_offset):
+    @tool(params={
+        "x_offset": "X offset from current position",
+        "y_offset": "Y offset from current position",
+        "z_offset": "Z offset from current position"
+    }, exclusive=True, keywords=("dig", "break", "destroy", "chop", "ore"), route_always=True)
+    async def mine_block(self, x_offset: float, y_offset: float, z_offset: float):
         """Mine/break a block at the specified relative position"""
         current_pos = self.bot.entity.position
         target_pos = current_pos.offset(x_offset, y_offset, z_offset)
@@ -85,6 +135,7 @@ class MinecraftBot:
         await self.bot.dig(block)
         return f"Mined {block.name} at offset ({x_offset}, {y_offset}, {z_offset})"
 
+    @tool(exclusive=True, keywords=("hop",))
     async def jump(self):
         """Make the agent jump"""
         self.bot.setControlState('jump', True)
@@ -92,19 +143,17 @@ class MinecraftBot:
         self.bot.setControlState('jump', False)
         return "Jumped"
 
+    @tool(keywords=("have", "carrying", "holding", "items", "how many", "bag"))
     async def get_inventory(self):
         """Get the current inventory items and quantities"""
-        inventory = []
-        for item in self.bot.inventory.items():
-            inventory.append({
-                'name': item.name,
-                'displayName': item.displayName,
-                'count': item.count,
-                'slot': item.slot
-            })
-        return inventory
+        # Already an in-memory read of InventoryIndex; not worth a ToolResultCache entry
+        return self.inventory.items()
 
-    async def craft_item(self, item, quantity=1):
+    @tool(params={
+        "item": "Item to craft (e.g., 'wooden_pickaxe', 'torch', 'chest')",
+        "quantity": "Number of items to craft"
+    }, exclusive=True, keywords=("make", "recipe", "pickaxe", "sword", "planks", "table"))
+    async def craft_item(self, item: str, quantity: int = 1):
         """Craft an item using available materials"""
         mcData = self.bot.mcData
         item_data = mcData.itemsByName.get(item)
@@ -121,58 +170,56 @@ class MinecraftBot:
         await self.bot.craft(recipe, quantity)
         return f"Crafted {quantity} {item}(s)"
 
-    async def look_around(self, radius=5):
+    @tool(params={
+        "radius": "Radius to scan around the agent, up to 16",
+        "max_blocks": "Maximum number of blocks to list, nearest first"
+    }, keywords=("see", "nearby", "near", "find", "what", "where", "surroundings", "scan", "mobs"),
+       cacheable=True, invalidated_by=("block_position", "blocks"), live="nearby_entities")
+    async def look_around(self, radius: int = 5, max_blocks: int = 50):
         """Get information about blocks and entities in the surrounding area"""
-        blocks = []
-        entities = []
-        current_pos = self.bot.entity.position
-        
-        # Scan for blocks in radius
-        for x in range(-radius, radius + 1):
-            for y in range(-radius, radius + 1):
-                for z in range(-radius, radius + 1):
-                    block = self.bot.blockAt(current_pos.offset(x, y, z))
-                    if block and block.name != 'air':
-                        blocks.append({
-                            'name': block.name,
-                            'position': {'x': x, 'y': y, 'z': z}
-                        })
+        # The model may ask for more; a larger cube would be millions of blocks over the bridge
+        radius = max(1, min(MAX_SNAPSHOT_RADIUS, int(radius)))
         
-        # Find nearby entities
-        for entity in self.bot.entities.values():
-            if entity != self.bot.entity:
-                distance = current_pos.distanceTo(entity.position)
-                if distance <= radius:
-                    entities.append({
-                        'name': entity.name or entity.displayName or 'unknown',
-                        'type': entity.type,
-                        'distance': round(distance, 2),
-                        'position': {
-                            'x': entity.position.x,
-                            'y': entity.position.y,
-                            'z': entity.position.z
-                        }
-                    })
+        # Scan for blocks in radius: one bridge round trip for the whole cube,
+        # then filter non-air blocks nearest-first in numpy
+        snapshot = fetch_snapshot(self.bot, radius)
+        blocks = [
+            {'name': block['name'], 'position': block['position']}
+            for block in snapshot.blocks(limit=max_blocks)
+        ]
         
-        return {
-            'blocks': blocks[:50],  # Limit to prevent overwhelming output
-            'entities': entities
+        result = {
+            'blocks': blocks,  # Nearest first, limited to prevent overwhelming output
+            'block_counts': snapshot.counts(),
+            **self.nearby_entities(radius)
         }
+        unloaded = snapshot.unloaded()
+        if unloaded:
+            # Part of the cube is in chunks not loaded yet; its contents are unknown
+            result['unloaded'] = unloaded
+        return result
 
+    def nearby_entities(self, radius: int = 5, **_) -> Dict[str, Any]:
+        """look_around's entities, from the spatial index (no per-entity bridge calls)"""
+        # Entities move all the time, so a cached look_around gets these fresh on every hit
+        radius = max(1, min(MAX_SNAPSHOT_RADIUS, int(radius)))
+        current_pos = self.bot.entity.position
+        center = (current_pos.x, current_pos.y, current_pos.z)
+        return {'entities': [record.as_dict(center) for record in self.entities.within(center, radius)]}
+
+    @tool(exclusive=True, keywords=("fight", "kill", "hit", "zombie", "skeleton", "creeper", "spider"))
     async def attack(self):
         """Attack a mob or player in front of the agent"""
         current_pos = self.bot.entity.position
-        target = None
         
         # Find nearest hostile mob within attack range
-        for entity in self.bot.entities.values():
-            if entity == self.bot.entity:
-                continue
-            
-            distance = current_pos.distanceTo(entity.position)
-            if distance < 4 and entity.type == 'mob':
-                target = entity
-                break
+        nearest = self.entities.nearest(
+            (current_pos.x, current_pos.y, current_pos.z),
+            k=1,
+            types=('mob', 'hostile'),
+            max_distance=4
+        )
+        target = self.bot.entities[nearest[0].id] if nearest else None
         
         if not target:
             raise Exception('No mob found to attack within range')
@@ -180,7 +227,9 @@ class MinecraftBot:
         await self.bot.attack(target)
         return f"Attacked {target.name or target.displayName or 'entity'}"
 
-    async def eat_food(self, food_item):
+    @tool(params={"food_item": "Type of food to eat (e.g., 'bread', 'apple', 'cooked_beef')"}, exclusive=True,
+          keywords=("hungry", "hunger", "starving", "heal"))
+    async def eat_food(self, food_item: str):
         """Consume food from inventory to restore hunger"""
         # Find food item in inventory
         food = self._find_inventory_item(food_item)
@@ -195,217 +244,15 @@ class MinecraftBot:
     # Helper methods
     def _find_inventory_item(self, item_name):
         """Helper method to find an item in the bot's inventory"""
-        for item in self.bot.inventory.items():
-            if (item_name.lower() in item.name.lower() or 
-                item_name.lower() in item.displayName.lower()):
-                return item
-        return None
+        entry = self.inventory.find(item_name)
+        return entry.item if entry else None
+
+
+# Tool schemas for every @tool method, generated once at import
+MinecraftBot.tool_registry = ToolRegistry.from_class(MinecraftBot)
+tools = MinecraftBot.tool_registry.schemas()
 
-    async def _wait_for_goal_reached(self):
-        """Helper method to wait for pathfinding goal to be reached"""
-        future = asyncio.get_event_loop().create_future()
-        
-        def on_goal_reached():
-            if not future.done():
-                future.set_result(True)
-        
-        def on_path_timeout():
-            if not future.done():
-                future.set_exception(Exception("Pathfinding timeout"))
-        
-        # Register event listeners
-        self.bot.once('goal_reached', on_goal_reached)
-        self.bot.once('path_timeout', on_path_timeout)
-        
-        try:
-            await future
-        finally:
-            # Clean up event listeners
-            self.bot.removeListener('goal_reached', on_goal_reached)
-            self.bot.removeListener('path_timeout', on_path_timeout)
 
-# Create and run bot
-bot = MinecraftBot("PythonBot")
-tools = [
-    {
-        "type": "function",
-        "name": "move_forward",
-        "description": "Move the agent forward by a specified number of blocks",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "distance": {
-                    "type": "number",
-                    "description": "Number of blocks to move forward"
-                }
-            },
-            "required": ["distance"],
-            "additionalProperties": False
-        },
-        "strict": True
-    },
-    {
-        "type": "function",
-        "name": "turn",
-        "description": "Turn the agent left or right by specified degrees",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "direction": {
-                    "type": "string",
-                    "enum": ["left", "right"],
-                    "description": "Direction to turn"
-                },
-                "degrees": {
-                    "type": "number",
-                    "description": "Degrees to turn (typically 90 for right angles)"
-                }
-            },
-            "required": ["direction", "degrees"],
-            "additionalProperties": False
-        },
-        "strict": True
-    },
-    {
-        "type": "function",
-        "name": "place_block",
-        "description": "Place a block at the agent's current position or relative position",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "block_type": {
-                    "type": "string",
-                    "description": "Type of block to place (e.g., 'stone', 'dirt', 'wood')"
-                },
-                "x_offset": {
-                    "type": "number",
-                    "description": "X offset from current position (default 0)"
-                },
-                "y_offset": {
-                    "type": "number", 
-                    "description": "Y offset from current position (default 0)"
-                },
-                "z_offset": {
-                    "type": "number",
-                    "description": "Z offset from current position (default 0)"
-                }
-            },
-            "required": ["block_type"],
-            "additionalProperties": False
-        },
-        "strict": True
-    },
-    {
-        "type": "function",
-        "name": "mine_block",
-        "description": "Mine/break a block at the specified relative position",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "x_offset": {
-                    "type": "number",
-                    "description": "X offset from current position"
-                },
-                "y_offset": {
-                    "type": "number",
-                    "description": "Y offset from current position"
-                },
-                "z_offset": {
-                    "type": "number",
-                    "description": "Z offset from current position"
-                }
-            },
-            "required": ["x_offset", "y_offset", "z_offset"],
-            "additionalProperties": False
-        },
-        "strict": True
-    },
-    {
-        "type": "function",
-        "name": "jump",
-        "description": "Make the agent jump",
-        "parameters": {
-            "type": "object",
-            "properties": {},
-            "additionalProperties": False
-        },
-        "strict": True
-    },
-    {
-        "type": "function",
-        "name": "get_inventory",
-        "description": "Get the current inventory items and quantities",
-        "parameters": {
-            "type": "object",
-            "properties": {},
-            "additionalProperties": False
-        },
-        "strict": True
-    },
-    {
-        "type": "function",
-        "name": "craft_item",
-        "description": "Craft an item using available materials",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "item": {
-                    "type": "string",
-                    "description": "Item to craft (e.g., 'wooden_pickaxe', 'torch', 'chest')"
-                },
-                "quantity": {
-                    "type": "number",
-                    "description": "Number of items to craft (default 1)"
-                }
-            },
-            "required": ["item"],
-            "additionalProperties": False
-        },
-        "strict": True
-    },
-    {
-        "type": "function",
-        "name": "look_around",
-        "description": "Get information about blocks and entities in the surrounding area",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "radius": {
-                    "type": "number",
-                    "description": "Radius to scan around the agent (default 5)"
-                }
-            },
-            "required": [],
-            "additionalProperties": False
-        },
-        "strict": True
-    },
-    {
-        "type": "function",
-        "name": "attack",
-        "description": "Attack a mob or player in front of the agent",
-        "parameters": {
-            "type": "object",
-            "properties": {},
-            "additionalProperties": False
-        },
-        "strict": True
-    },
-    {
-        "type": "function",
-        "name": "eat_food",
-        "description": "Consume food from inventory to restore hunger",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "food_item": {
-                    "type": "string",
-                    "description": "Type of food to eat (e.g., 'bread', 'apple', 'cooked_beef')"
-                }
-            },
-            "required": ["food_item"],
-            "additionalProperties": False
-        },
-        "strict": True
-    }
-]
\ No newline at end of file
+if __name__ == "__main__":
+    # Create and run bot
+    bot = MinecraftBot("PythonBot")
@@ -0,0 +1,207 @@
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+def normalize_tokens(name: str) -> List[str]:
+    """'Oak Log' / 'oak_log' / 'OAK-LOG' -> ['oak', 'log']"""
+    return [token for token in re.split(r"[^a-z0-9]+", name.lower()) if token]
+
+
+def normalize_name(name: str) -> str:
+    return "_".join(normalize_tokens(name))
+
+
+@dataclass
+class InventoryEntry:
+    slot: int
+    name: str
+    display_name: str
+    count: int
+    item: Any = None  # the live mineflayer item, for equip()/consume()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'displayName': self.display_name,
+            'count': self.count,
+            'slot': self.slot
+        }
+
+
+class InventoryIndex:
+    """
+    In-Python mirror of the bot's inventory, kept current from the inventory
+    window's `updateSlot` events and rebuilt on spawn/respawn.
+
+    Lookups are dictionary hits on exact name, lower-cased display name, normalized
+    name and name tokens, so finding an item makes no bridge calls. Events arrive on
+    the JS bridge thread, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slots: Dict[int, InventoryEntry] = {}
+        self._by_name: Dict[str, Set[int]] = {}
+        self._by_display: Dict[str, Set[int]] = {}
+        self._by_token: Dict[str, Set[int]] = {}
+        # Slot range covered by inventory.items() (main inventory + hotbar)
+        self.inventory_start = 9
+        self.inventory_end = 45
+        self.bot = None
+        self._listeners: List[Tuple[Any, str, Any]] = []  # (emitter, event, handler) to remove on detach
+
+    # -----------------------------
+    # Event wiring
+    # -----------------------------
+    def attach(self, bot):
+        self.bot = bot
+        inventory = bot.inventory
+        self.inventory_start = getattr(inventory, "inventoryStart", None) or self.inventory_start
+        self.inventory_end = getattr(inventory, "inventoryEnd", None) or self.inventory_end
+        # Kept so detach() passes the same objects; a fresh bound method wouldn't match
+        self._listeners = [(inventory, 'updateSlot', self._on_update_slot), (bot, 'respawn', self._on_respawn)]
+        for emitter, event, handler in self._listeners:
+            emitter.on(event, handler)
+        self.rebuild()
+
+    def detach(self):
+        for emitter, event, handler in self._listeners:
+            try:
+                emitter.removeListener(event, handler)
+            except Exception as e:
+                print(f"Failed to remove inventory {event} listener: {e}")
+        self._listeners = []
+        self.bot = None
+
+    def _on_update_slot(self, this, slot, old_item=None, new_item=None, *args):
+        # The bridge passes the emitting window first
+        self.set_slot(int(slot), new_item)
+
+    def _on_respawn(self, *args):
+        self.rebuild()
+
+    def rebuild(self):
+        """Reload the whole mirror from the live inventory (one walk over the bridge)."""
+        entries = [self._entry_from_item(item.slot, item) for item in self.bot.inventory.items()]
+        with self._lock:
+            self._clear()
+            for entry in entries:
+                self._add(entry)
+
+    def set_slot(self, slot: int, item: Any):
+        if not self.inventory_start <= slot < self.inventory_end:
+            return  # armor / crafting grid, not part of items()
+        entry = self._entry_from_item(slot, item) if item else None
+        with self._lock:
+            self._remove(slot)
+            if entry is not None:
+                self._add(entry)
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def find(self, query: str) -> Optional[InventoryEntry]:
+        """
+        Best match for `query`: exact name, then display name, then normalized name,
+        then all query tokens, then (without touching the bridge) a substring match.
+        Ties go to the lowest slot, like iterating inventory.items().
+        """
+        lowered = query.lower()
+        normalized = normalize_name(query)
+        with self._lock:
+            for slots in (
+                self._by_name.get(lowered),
+                self._by_display.get(lowered),
+                self._by_name.get(normalized),
+                self._token_match(normalize_tokens(query)),
+            ):
+                if slots:
+                    return self._slots[min(slots)]
+            for slot in sorted(self._slots):
+                entry = self._slots[slot]
+                if lowered in entry.name.lower() or lowered in entry.display_name.lower():
+                    return entry
+        return None
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            return sum(self._slots[slot].count for slot in self._by_name.get(name, ()))
+
+    def items(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._slots[slot].as_dict() for slot in sorted(self._slots)]
+
+    def verify(self, bot=None) -> List[str]:
+        """Differences between the mirror and the live inventory; empty when consistent."""
+        bot = bot or self.bot
+        live = {
+            item.slot: (item.name, item.displayName, item.count)
+            for item in bot.inventory.items()
+        }
+        with self._lock:
+            mirrored = {
+                slot: (entry.name, entry.display_name, entry.count)
+                for slot, entry in self._slots.items()
+            }
+        problems = []
+        for slot in sorted(set(live) | set(mirrored)):
+            if live.get(slot) != mirrored.get(slot):
+                problems.append(f"slot {slot}: live={live.get(slot)} mirror={mirrored.get(slot)}")
+        return problems
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    # -----------------------------
+    # Internals (callers hold the lock)
+    # -----------------------------
+    @staticmethod
+    def _entry_from_item(slot: int, item: Any) -> InventoryEntry:
+        return InventoryEntry(
+            slot=slot,
+            name=item.name,
+            display_name=item.displayName or item.name,
+            count=item.count,
+            item=item
+        )
+
+    def _token_match(self, tokens: List[str]) -> Optional[Set[int]]:
+        if not tokens:
+            return None
+        matches = set(self._by_token.get(tokens[0], ()))
+        for token in tokens[1:]:
+            matches &= self._by_token.get(token, set())
+        return matches
+
+    def _keys(self, entry: InventoryEntry):
+        return (
+            (self._by_name, {entry.name.lower()}),
+            (self._by_display, {entry.display_name.lower()}),
+            (self._by_token, set(normalize_tokens(entry.name)) | set(normalize_tokens(entry.display_name))),
+        )
+
+    def _add(self, entry: InventoryEntry):
+        self._slots[entry.slot] = entry
+        for index, keys in self._keys(entry):
+            for key in keys:
+                index.setdefault(key, set()).add(entry.slot)
+
+    def _remove(self, slot: int):
+        entry = self._slots.pop(slot, None)
+        if entry is None:
+            return
+        for index, keys in self._keys(entry):
+            for key in keys:
+                slots = index.get(key)
+                if slots is not None:
+                    slots.discard(slot)
+                    if not slots:
+                        del index[key]
+
+    def _clear(self):
+        self._slots.clear()
+        self._by_name.clear()
+        self._by_display.clear()
+        self._by_token.clear()
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import random
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+from openai import (
+    AsyncOpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+
+# Errors worth retrying: transport failures, timeouts, 429 and 5xx
+RETRYABLE_ERRORS = (APIConnectionError, APITimeoutError, RateLimitError, InternalServerError)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# -----------------------------
+# Configuration
+# -----------------------------
+@dataclass
+class LLMClientConfig:
+    # None uses the OpenAI API; point it at a vLLM server with e.g. "http://localhost:8000/v1"
+    base_url: Optional[str] = None
+    api_key: Optional[str] = None
+    # Shared HTTP connection pool
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+    keepalive_expiry: float = 30.0
+    http2: Optional[bool] = None  # None = enable when the `h2` package is installed
+    # Timeouts (seconds)
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+    # Retries with exponential backoff and jitter
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+
+
+class LLMClient:
+    """
+    Async OpenAI-compatible client backed by one bounded, keep-alive HTTP pool.
+    Share a single instance between processors so every LLM call reuses it.
+    """
+
+    def __init__(self, config: Optional[LLMClientConfig] = None):
+        self.config = config or LLMClientConfig()
+        http2 = self.config.http2 if self.config.http2 is not None else _http2_available()
+        self.http_client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+                keepalive_expiry=self.config.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(self.config.read_timeout, connect=self.config.connect_timeout),
+        )
+        # vLLM accepts any key unless started with --api-key, but the SDK insists on one
+        api_key = self.config.api_key or os.environ.get("OPENAI_API_KEY") or "EMPTY"
+        self.openai = AsyncOpenAI(
+            api_key=api_key,
+            base_url=self.config.base_url,
+            http_client=self.http_client,
+            max_retries=0,  # retries are handled below so backoff is configurable
+        )
+
+    @property
+    def responses(self):
+        return self.openai.responses
+
+    async def create_response(self, purpose: Optional[str] = None, **kwargs) -> Any:
+        """
+        responses.create with retry/backoff on transient errors. `purpose` is for
+        ModelRouter, which takes the same calls; a single client ignores it.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self.openai.responses.create(**kwargs)
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.config.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                print(f"LLM call failed ({type(e).__name__}: {e}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def stream_response(self, purpose: Optional[str] = None, **kwargs) -> Any:
+        """
+        responses.create(stream=True). Only opening the stream is retried; once events
+        start flowing, the caller may already have acted on them.
+        """
+        return await self.create_response(stream=True, **kwargs)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        delay = min(self.config.backoff_max, self.config.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def aclose(self):
+        await self.openai.close()
+        await self.http_client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
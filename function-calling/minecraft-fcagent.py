@@ -2,15 +2,17 @@
 import asyncio
 import json
 from openai.types.responses import ResponseOutputMessage
-from openai import OpenAI
 from javascript import require, On, Once, AsyncTask, once, off
 import os
 import traceback
 from threading import Thread
 from collections import deque
 
-from tools import mineflayer_tools
+from functions import MinecraftBot
 from WhisperProcessor import WhisperMessageProcessor
+from llm_client import LLMClient, LLMClientConfig
+from context_cache import GameContextCache
+from tool_cache import ToolResultCache
 
 # Setup mineflayer modules
 mineflayer = require('mineflayer')
@@ -22,35 +24,75 @@ GoalNear = goals.GoalNear
 # -----------------------------
 
 class GPTMinecraftBot:
-    def __init__(self, openai_api_key, minecraft_config, model):
+    def __init__(self, openai_api_key, minecraft_config, model, max_concurrent_conversations=8,
+                 llm_client=None, stream=False, route_tools=False):
         self.minecraft_config = minecraft_config
         self.bot = None
-        self.conversation_history = []
 
         """Initialize the Minecraft bot connection"""
         self.bot = mineflayer.createBot(self.minecraft_config)
         self.bot.loadPlugin(pathfinder.pathfinder)
 
-        @On(self.bot, 'spawn')
-        def handle_spawn(bot):
-            print(f"Bot {self.minecraft_config['username']} spawned successfully!")
-            movements = Movements(self.bot)
-            self.bot.pathfinder.setMovements(movements)
+        # Agent actions (mine, place, craft, look_around...) exposed as tools; also sets
+        # up pathfinder movements and the inventory/entity indexes on spawn
+        self.minecraft = MinecraftBot(bot=self.bot)
+
+        # Game context kept current from bot events instead of read per request
+        self.context_cache = GameContextCache()
+        self.context_cache.attach(self.bot)
+
+        # Read-only tool results, dropped when the world changes under them
+        self.tool_cache = ToolResultCache()
+        self.tool_cache.attach(self.bot)
 
         @On(self.bot, 'whisper')
         def handle_whisper(bot, username, message, translate, verified):
             """Handle whisper messages from players"""
             self.processor.add_whisper(username, message)
 
+        # Set once the connection is gone (kicked, server stopped, network error)
+        self.ended = asyncio.Event()
+        self.end_reason = None
+        loop = asyncio.get_running_loop()
+
+        @On(self.bot, 'end')
+        def handle_end(bot, reason=None):
+            self.end_reason = reason
+            loop.call_soon_threadsafe(self.ended.set)
+
         self.processor = WhisperMessageProcessor(
-            OpenAI(api_key=openai_api_key),
+            llm_client or LLMClient(LLMClientConfig(
+                api_key=openai_api_key,
+                base_url=os.environ.get('OPENAI_BASE_URL')  # e.g. a local vLLM server
+            )),
             self.bot,
             GoalNear,
-            model
+            model,
+            max_concurrent_conversations=max_concurrent_conversations,
+            stream=stream,
+            context_cache=self.context_cache,
+            toolset=self.minecraft,
+            route_tools=route_tools,
+            tool_cache=self.tool_cache
         )
+        # Per-player conversation memory lives in the processor's session store
+        self.conversation_history = self.processor.sessions
 
         self.processor.start_processing()
 
+    def stop(self):
+        """Stop processing whispers and leave the server."""
+        self.processor.stop_processing()
+        self.context_cache.detach()
+        self.tool_cache.detach()
+        self.minecraft.entities.detach()
+        self.minecraft.inventory.detach()
+        if not self.ended.is_set():
+            try:
+                self.bot.quit()
+            except Exception:
+                traceback.print_exc()
+
 # Usage example
 async def main():
     config = {
@@ -66,9 +108,10 @@ async def main():
         model="gpt-4o-mini"
     )
 
-    # Keep the bot running
-    while True:
-        await asyncio.sleep(1)
+    # Run until disconnected; see bot_host.py for many bots with reconnects
+    await bot.ended.wait()
+    print(f"{config['username']} disconnected: {bot.end_reason}")
+    bot.stop()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,234 @@
+"""
+Sends each LLM call to a backend picked by purpose, health and latency.
+
+The processor tags every call with a purpose, and each route lists backend
+tiers in fallback order:
+
+- "tool": the first turn of a whisper, which picks the tools (fast, then large)
+- "final": turns after tool results, which write the answer (large, then fast)
+- "summary": session summaries (fast, then large)
+
+Within a tier, backends are tried by priority (e.g. 0 for the local vLLM server,
+1 for a hosted API), then by expected latency: the EWMA of past calls scaled by
+the calls in flight, so load spreads over replicas. A timeout, connection error,
+429 or 5xx moves the call to the next backend. Overload (429/503) and repeated
+failures also take a backend out of rotation for a cooldown, which doubles on
+every failure after it comes back.
+
+ModelRouter has the same create_response/stream_response interface as
+LLMClient, so it can be passed to WhisperMessageProcessor instead of one:
+
+    router = ModelRouter([
+        Backend("vllm-small", "http://localhost:8000/v1", "Qwen/Qwen2.5-7B-Instruct", tier="fast"),
+        Backend("vllm-large", "http://localhost:8001/v1", "Qwen/Qwen2.5-32B-Instruct", tier="large"),
+        Backend("openai-mini", None, "gpt-4o-mini", tier="fast", priority=1),
+        Backend("openai-large", None, "gpt-4.1", tier="large", priority=1),
+    ])
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from openai import InternalServerError, RateLimitError
+
+from llm_client import RETRYABLE_ERRORS, LLMClient, LLMClientConfig
+
+DEFAULT_ROUTES: Dict[str, Tuple[str, ...]] = {
+    "tool": ("fast", "large"),
+    "final": ("large", "fast"),
+    "summary": ("fast", "large"),
+    "default": ("fast", "large"),  # untagged calls
+}
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+@dataclass
+class Backend:
+    name: str
+    base_url: Optional[str]  # None uses the OpenAI API
+    model: str
+    tier: str = "fast"
+    priority: int = 0  # lower is tried first within a tier
+    timeout: float = 30.0
+    api_key: Optional[str] = None
+    # Health, updated by the router
+    calls: int = field(default=0, init=False)
+    failures: int = field(default=0, init=False)
+    consecutive_failures: int = field(default=0, init=False)
+    in_flight: int = field(default=0, init=False)
+    latency_ewma: Optional[float] = field(default=None, init=False)
+    down_until: float = field(default=0.0, init=False)
+    last_error: Optional[str] = field(default=None, init=False)
+    client: Optional[LLMClient] = field(default=None, init=False, repr=False)
+
+    def available(self, now: float) -> bool:
+        return now >= self.down_until
+
+    def expected_latency(self) -> float:
+        # Unmeasured backends look free, so every replica gets tried early on
+        return (self.latency_ewma or 0.0) * (1 + self.in_flight)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "model": self.model,
+            "tier": self.tier,
+            "priority": self.priority,
+            "healthy": self.available(time.monotonic()),
+            "calls": self.calls,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+            "latency_ms": round(self.latency_ewma * 1000) if self.latency_ewma is not None else None,
+            "last_error": self.last_error,
+        }
+
+
+def _is_overload(error: Exception) -> bool:
+    return isinstance(error, RateLimitError) or (
+        isinstance(error, InternalServerError) and getattr(error, "status_code", None) == 503
+    )
+
+
+class ModelRouter:
+    """
+    - backends: every model endpoint, local and remote
+    - routes: purpose -> tiers in fallback order (see DEFAULT_ROUTES)
+    - failure_threshold: consecutive failures before a backend is taken out of rotation
+    - cooldown / max_cooldown: seconds out of rotation, doubling on repeated failures
+    - latency_alpha: EWMA weight of the newest latency sample
+    """
+
+    def __init__(self, backends: Sequence[Backend], routes: Optional[Dict[str, Sequence[str]]] = None,
+                 failure_threshold: int = 3, cooldown: float = 10.0, max_cooldown: float = 120.0,
+                 latency_alpha: float = 0.3, client_options: Optional[Dict[str, Any]] = None):
+        if not backends:
+            raise ValueError("ModelRouter needs at least one backend")
+        names = [backend.name for backend in backends]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate backend names: {names}")
+        self.backends = list(backends)
+        self.routes = {**DEFAULT_ROUTES, **{purpose: tuple(tiers) for purpose, tiers in (routes or {}).items()}}
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.latency_alpha = latency_alpha
+        self.failovers = 0
+        self.calls_by_purpose: Dict[str, int] = {}
+
+        # Backends on the same endpoint share a connection pool; failover replaces retries
+        clients: Dict[Tuple[Optional[str], Optional[str], float], LLMClient] = {}
+        for backend in self.backends:
+            key = (backend.base_url, backend.api_key, backend.timeout)
+            if key not in clients:
+                clients[key] = LLMClient(LLMClientConfig(
+                    base_url=backend.base_url,
+                    api_key=backend.api_key,
+                    read_timeout=backend.timeout,
+                    max_retries=0,
+                    **(client_options or {})
+                ))
+            backend.client = clients[key]
+        self._clients = list(clients.values())
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ModelRouter":
+        """
+        {"backends": [{"name": "local", "base_url": "http://localhost:8000/v1",
+                       "model": "Qwen/Qwen2.5-7B-Instruct", "tier": "fast"}, ...],
+         "routes": {"final": ["large", "fast"]}, "cooldown": 10, "llm": {"max_connections": 32}}
+        """
+        options = {key: value for key, value in config.items() if key not in ("backends", "llm")}
+        return cls([Backend(**backend) for backend in config["backends"]],
+                   client_options=config.get("llm"), **options)
+
+    # -----------------------------
+    # Selection
+    # -----------------------------
+    def candidates(self, purpose: Optional[str]) -> List[Backend]:
+        """Backends to try for this purpose, in order."""
+        tiers = self.routes.get(purpose or "default") or self.routes["default"]
+        now = time.monotonic()
+        ordered: List[Backend] = []
+        for tier in tiers:
+            healthy = [b for b in self.backends if b.tier == tier and b.available(now) and b not in ordered]
+            ordered.extend(sorted(healthy, key=lambda b: (b.priority, b.expected_latency())))
+        if ordered:
+            return ordered
+        # Everything on the route is cooling down: try the one due back first rather than fail
+        resting = [b for b in self.backends if b.tier in tiers]
+        return sorted(resting, key=lambda b: b.down_until)[:1]
+
+    # -----------------------------
+    # Calls
+    # -----------------------------
+    async def create_response(self, purpose: Optional[str] = None, **kwargs) -> Any:
+        """responses.create on the best backend for `purpose`; `model` is the backend's."""
+        return await self._call(purpose, kwargs)
+
+    async def stream_response(self, purpose: Optional[str] = None, **kwargs) -> Any:
+        """
+        responses.create(stream=True). Failover only covers opening the stream; once
+        events start flowing, the caller may already have acted on them.
+        """
+        return await self._call(purpose, dict(kwargs, stream=True))
+
+    async def _call(self, purpose: Optional[str], kwargs: Dict[str, Any]) -> Any:
+        kwargs.pop("model", None)
+        self.calls_by_purpose[purpose or "default"] = self.calls_by_purpose.get(purpose or "default", 0) + 1
+        candidates = self.candidates(purpose)
+        if not candidates:
+            raise RuntimeError(f"No backend serves the tiers routed for {purpose or 'default'!r}")
+        for index, backend in enumerate(candidates):
+            started = time.monotonic()
+            backend.in_flight += 1
+            backend.calls += 1
+            try:
+                response = await backend.client.responses.create(model=backend.model, **kwargs)
+            except RETRYABLE_ERRORS as e:
+                self._record_failure(backend, e)
+                if index + 1 == len(candidates):
+                    raise
+                self.failovers += 1
+                print(f"LLM backend {backend.name} failed ({type(e).__name__}: {e}); "
+                      f"trying {candidates[index + 1].name}")
+                continue
+            finally:
+                backend.in_flight -= 1
+            self._record_success(backend, time.monotonic() - started)
+            return response
+
+    def _record_success(self, backend: Backend, latency: float):
+        backend.consecutive_failures = 0
+        backend.down_until = 0.0
+        if backend.latency_ewma is None:
+            backend.latency_ewma = latency
+        else:
+            backend.latency_ewma += self.latency_alpha * (latency - backend.latency_ewma)
+
+    def _record_failure(self, backend: Backend, error: Exception):
+        backend.failures += 1
+        backend.consecutive_failures += 1
+        backend.last_error = f"{type(error).__name__}: {error}"
+        excess = backend.consecutive_failures - self.failure_threshold
+        if _is_overload(error) or excess >= 0:
+            delay = min(self.max_cooldown, self.cooldown * 2 ** max(0, excess))
+            backend.down_until = time.monotonic() + delay
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "failovers": self.failovers,
+            "calls": dict(self.calls_by_purpose),
+            "backends": [backend.status() for backend in self.backends],
+        }
+
+    async def aclose(self):
+        for client in self._clients:
+            await client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
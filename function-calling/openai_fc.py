@@ -1,31 +1,23 @@
 from openai import OpenAI
 
-from functions import add_two_nums
+import asyncio
 import json
 
+from tool_registry import ToolRegistry, tool
+
 client = OpenAI()
 
-tools = [{
-    "type": "function",
-    "name": "add_two_nums",
-    "description": "add two numbers",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "x": {
-                "type": "number",
-                "description": "The first number to add"
-            },
-            "y": {
-                "type": "number",
-                "description": "The second number to add"
-            }
-        },
-        "required": ['x', 'y'],
-        "additionalProperties": False
-    },
-    "strict": True
-}]
+
+@tool(description="add two numbers", params={
+    "x": "The first number to add",
+    "y": "The second number to add"
+})
+def add_two_nums(x: float, y: float):
+    return x + y
+
+
+registry = ToolRegistry.from_functions(add_two_nums)
+tools = registry.schemas()
 
 input_messages = [{"role": "user", "content": "suggest a city that has longitide value of 5 plus 120. call add_two_nums with the two numbers"}]
 
@@ -42,10 +34,10 @@ print(response.output_text)
 
 call_info = response.output[0]
 args = json.loads(call_info.arguments)
-if call_info.name == "add_two_nums":
-    result = add_two_nums(**args)
+if call_info.name in registry:
+    result = asyncio.run(registry.dispatch(call_info.name, args))
 else:
-    print(f"Unknown function: {response.output['name']}")
+    print(f"Unknown function: {call_info.name}")
 
 input_messages.append(call_info)  # append model's function call message
 input_messages.append({           # append result message
@@ -0,0 +1,124 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# -----------------------------
+# Static system prompt
+# Keep this byte-identical between requests: vLLM's automatic prefix caching only
+# reuses KV blocks for an exact token prefix, so any per-player or per-turn value
+# in here invalidates the cache for everything after it.
+# -----------------------------
+SYSTEM_PROMPT = (
+    "You are a Minecraft bot assistant. You can perform actions in Minecraft "
+    "using function calls. When a user asks you to do something, use the appropriate "
+    "functions to accomplish their request. If they're just talking, respond normally. "
+    "Always give the absolute coordinate values for arguments. If you need relative ones, "
+    "first query the current absolute coordinates and then calculate the relative ones. "
+    "If more steps are needed after a function call, concisely state the next steps. "
+    "If the task is large or long-running, delegate it with delegate_task, whisper the user "
+    "that it is underway and end your turn; a delegated task update message will report "
+    "the outcome, which you then pass on to the user. "
+    "If you need a reply based on the function call result, explicitly say it by response message"
+    "Never use markdown formatting in your responses. "
+    "Always use whisper function to send message to the user."
+)
+
+
+def canonical_tools(tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Tool schemas sorted by name with recursively sorted keys, so they always serialize the same."""
+    ordered = sorted(tools, key=lambda tool: tool.get("name", ""))
+    return json.loads(json.dumps(ordered, sort_keys=True))
+
+
+class PromptBuilder:
+    """
+    Lays out model input as a stable prefix followed by a volatile tail:
+
+        system prompt | tools (request field) | session history | current turn | game context
+
+    Everything up to the current turn only ever grows by appending, so consecutive
+    requests for a player (and the system prompt + tools across all players) share
+    a byte-identical prefix. request_input() attaches the full game context at send
+    time without storing it; with context deltas the processor instead appends
+    context_message()s to the conversation, which keeps it append-only as well.
+    """
+
+    def __init__(self, tools: List[Dict[str, Any]], system_prompt: str = SYSTEM_PROMPT):
+        self.system_prompt = system_prompt
+        self.tools = canonical_tools(tools)
+        tools_json = json.dumps(self.tools, sort_keys=True, separators=(",", ":"))
+        # Identifies the shared prefix; changes only when the prompt or tool set does
+        self.prefix_fingerprint = hashlib.sha256(
+            (self.system_prompt + "\n" + tools_json).encode("utf-8")
+        ).hexdigest()[:16]
+
+    def tool_subset(self, names) -> List[Dict[str, Any]]:
+        """
+        Canonical tools restricted to `names`. Order stays canonical, so a given subset
+        always serializes the same; each distinct subset is its own cache prefix though,
+        which is the price of tool routing.
+        """
+        wanted = set(names)
+        return [tool for tool in self.tools if tool.get("name") in wanted]
+
+    def conversation(self, history: List[Dict[str, Any]], turn: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Stable part of the input: system prompt, session history, then this whisper's messages."""
+        return [{"role": "system", "content": self.system_prompt}, *history, *turn]
+
+    def request_input(self, conversation: List[Dict[str, Any]], game_context: Optional[str]) -> List[Dict[str, Any]]:
+        """Conversation plus the volatile tail for a single request."""
+        if not game_context:
+            return list(conversation)
+        return [*conversation, self.context_message(game_context)]
+
+    @staticmethod
+    def context_message(game_context: str, update: bool = False) -> Dict[str, Any]:
+        label = "Game context update" if update else "Game context"
+        return {"role": "system", "content": f"{label}: {game_context}"}
+
+
+# -----------------------------
+# Prefix cache metrics
+# -----------------------------
+@dataclass
+class PrefixCacheStats:
+    """
+    Prefix-cache hit rate as reported by the backend. vLLM fills in cached token
+    counts when started with --enable-prompt-tokens-details.
+    """
+    requests: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    last_hit_rate: float = 0.0
+
+    def record(self, usage: Any):
+        if usage is None:
+            return
+        # Responses API: input_tokens(_details); Chat Completions: prompt_tokens(_details)
+        input_tokens = _field(usage, "input_tokens") or _field(usage, "prompt_tokens") or 0
+        details = _field(usage, "input_tokens_details") or _field(usage, "prompt_tokens_details")
+        cached = (_field(details, "cached_tokens") or 0) if details is not None else 0
+        self.requests += 1
+        self.input_tokens += input_tokens
+        self.cached_tokens += cached
+        self.last_hit_rate = cached / input_tokens if input_tokens else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "input_tokens": self.input_tokens,
+            "cached_tokens": self.cached_tokens,
+            "hit_rate": round(self.hit_rate, 4),
+            "last_hit_rate": round(self.last_hit_rate, 4),
+        }
+
+
+def _field(obj: Any, name: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
@@ -0,0 +1,167 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")
+except Exception:  # tiktoken missing or its encoding files unavailable offline
+    _encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Token count with tiktoken when available, otherwise a ~4 chars/token estimate."""
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def count_message_tokens(message: Dict[str, Any]) -> int:
+    content = message.get("content", "")
+    if not isinstance(content, str):
+        content = str(content)
+    return count_tokens(content) + 4  # role and message framing overhead
+
+
+# Async callable(previous_summary, messages_to_fold) -> new summary text
+Summarizer = Callable[[str, List[Dict[str, Any]]], Awaitable[str]]
+
+
+# -----------------------------
+# Data models
+# -----------------------------
+@dataclass
+class PlayerSession:
+    username: str
+    # One entry per whisper: the user message plus everything the assistant added for it.
+    # Compaction works on whole turns so tool results never lose their request.
+    turns: List[List[Dict[str, Any]]] = field(default_factory=list)
+    turn_tokens: List[int] = field(default_factory=list)
+    summary: str = ""
+    summary_tokens: int = 0
+    last_active: float = field(default_factory=time.monotonic)
+    # Game context as of the last context message in `turns`; later messages send only changes
+    last_context: Optional[Dict[str, Any]] = None
+    # Tools called recently, most recent last; the tool router keeps offering them
+    recent_tools: List[str] = field(default_factory=list)
+
+    @property
+    def token_count(self) -> int:
+        return self.summary_tokens + sum(self.turn_tokens)
+
+    def note_tools(self, names: List[str], keep: int = 4):
+        for name in names:
+            if name in self.recent_tools:
+                self.recent_tools.remove(name)
+            self.recent_tools.append(name)
+        del self.recent_tools[:-keep]
+
+    def messages(self) -> List[Dict[str, Any]]:
+        """History as Responses API input messages, oldest first."""
+        history: List[Dict[str, Any]] = []
+        if self.summary:
+            history.append({
+                "role": "system",
+                "content": f"Summary of earlier conversation with {self.username}: {self.summary}"
+            })
+        for turn in self.turns:
+            history.extend(turn)
+        return history
+
+
+class SessionStore:
+    """
+    Per-username conversation memory kept across whispers.
+
+    - token_budget: once a session's history exceeds it, the oldest turns are folded
+      into a summary (when a summarizer is given) or dropped.
+    - keep_recent_turns: turns that are never compacted, however large.
+    - max_sessions / idle_ttl: LRU + TTL eviction so memory stays bounded.
+    """
+
+    def __init__(self, token_budget: int = 2000, keep_recent_turns: int = 2,
+                 max_sessions: int = 500, idle_ttl: float = 30 * 60,
+                 summarizer: Optional[Summarizer] = None, summary_token_limit: int = 300):
+        self.token_budget = token_budget
+        self.keep_recent_turns = keep_recent_turns
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.summarizer = summarizer
+        self.summary_token_limit = summary_token_limit
+        # Ordered by last use, least recently used first
+        self._sessions: "OrderedDict[str, PlayerSession]" = OrderedDict()
+
+    def get(self, username: str) -> PlayerSession:
+        self.evict_idle()
+        session = self._sessions.get(username)
+        if session is None:
+            session = PlayerSession(username=username)
+            self._sessions[username] = session
+        else:
+            self._sessions.move_to_end(username)
+        session.last_active = time.monotonic()
+        self._evict_overflow()
+        return session
+
+    async def record_turn(self, session: PlayerSession, messages: List[Dict[str, Any]]):
+        """Append one whisper's messages to the session and compact if over budget."""
+        if not messages:
+            return
+        session.turns.append(messages)
+        session.turn_tokens.append(sum(count_message_tokens(m) for m in messages))
+        session.last_active = time.monotonic()
+        # The session may have been evicted while its conversation was running
+        self._sessions[session.username] = session
+        self._sessions.move_to_end(session.username)
+        if session.token_count > self.token_budget:
+            await self._compact(session)
+
+    def evict_idle(self) -> int:
+        if not self.idle_ttl:
+            return 0
+        cutoff = time.monotonic() - self.idle_ttl
+        evicted = 0
+        while self._sessions:
+            username, session = next(iter(self._sessions.items()))
+            if session.last_active >= cutoff:
+                break
+            del self._sessions[username]
+            evicted += 1
+        return evicted
+
+    def _evict_overflow(self):
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    async def _compact(self, session: PlayerSession):
+        folded: List[Dict[str, Any]] = []
+        while session.token_count > self.token_budget and len(session.turns) > self.keep_recent_turns:
+            folded.extend(session.turns.pop(0))
+            session.turn_tokens.pop(0)
+        if folded:
+            # The full context the next deltas were based on may be gone now
+            session.last_context = None
+        if not folded or self.summarizer is None:
+            return
+
+        try:
+            summary = await self.summarizer(session.summary, folded)
+        except Exception as e:
+            # Losing the summary only costs context; keep the truncation
+            print(f"Session summary for {session.username} failed: {e}")
+            return
+        summary = summary.replace("\n", " ").strip()
+        if count_tokens(summary) > self.summary_token_limit:
+            summary = summary[: self.summary_token_limit * 4]
+        session.summary = summary
+        session.summary_tokens = count_tokens(summary) + 4 if summary else 0
+
+    def remove(self, username: str):
+        self._sessions.pop(username, None)
+
+    def __contains__(self, username: str) -> bool:
+        return username in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
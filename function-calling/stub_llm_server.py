@@ -0,0 +1,262 @@
+"""
+OpenAI-compatible stub for POST /v1/responses, for offline benchmarks.
+
+Replies are scripted from the request itself, so runs are deterministic:
+
+- The player and text come from the last "Message from <player>: <text>" user message.
+- For the first `tool_rounds` requests of a whisper (counted as assistant messages
+  after that user message) it calls move_to, using the first three numbers in the
+  text as coordinates when present.
+- After that it calls whisper(player, "Done: <text>"), which ends the processor's loop.
+  With text_replies it answers with a plain "Done: <text>" message instead.
+
+Latency is latency_ms plus seeded uniform jitter. Streaming requests get SSE
+output_text.delta (unless stream_text_deltas is off), output_item.done and
+completed events. The first fail_first requests, and with error_rate that share
+of the rest, fail with error_status (503 by default) after the delay, like an
+overloaded server. Standard library only.
+
+    python stub_llm_server.py --port 8100 --latency-ms 300 --jitter-ms 100
+"""
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+USER_MESSAGE = re.compile(r"Message from (?P<player>[^:]+): (?P<text>.*)", re.S)
+NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+class StubScript:
+    def __init__(self, tool_rounds: int = 1, latency_ms: float = 200.0, jitter_ms: float = 0.0,
+                 seed: int = 0, stream_chunk_delay_ms: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, fail_first: int = 0, text_replies: bool = False,
+                 stream_text_deltas: bool = True):
+        self.tool_rounds = tool_rounds
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.stream_chunk_delay_ms = stream_chunk_delay_ms
+        self.text_replies = text_replies
+        self.stream_text_deltas = stream_text_deltas  # False: only the finished items, like some servers
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.fail_first = fail_first
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.stats_lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.errors = 0
+
+    def delay(self) -> float:
+        with self._rng_lock:
+            jitter = self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000.0
+
+    def should_fail(self) -> bool:
+        with self._rng_lock:
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                return True
+            return bool(self.error_rate) and self._rng.random() < self.error_rate
+
+    def next_id(self, prefix: str) -> str:
+        return f"{prefix}_{next(self._ids):06d}"
+
+    def output_for(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        player, text, rounds = _last_whisper(request.get("input") or [])
+        if player is None:
+            return [self._message("Hello.")]
+        if rounds < self.tool_rounds:
+            numbers = [float(n) for n in NUMBER.findall(text)]
+            x, y, z = numbers[:3] if len(numbers) >= 3 else (rounds + 1.0, 64.0, 0.0)
+            return [self._function_call("move_to", {"x": x, "y": y, "z": z, "timeout": None})]
+        if self.text_replies:
+            return [self._message(f"Done: {text}")]
+        return [self._function_call("whisper", {"username": player, "message": f"Done: {text}"})]
+
+    def response(self, request: Dict[str, Any], output: List[Dict[str, Any]]) -> Dict[str, Any]:
+        input_tokens = len(json.dumps(request.get("input", ""))) // 4 + len(json.dumps(request.get("tools", []))) // 4
+        output_tokens = len(json.dumps(output)) // 4
+        return {
+            "id": self.next_id("resp"),
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "completed",
+            "model": request.get("model", "stub"),
+            "output": output,
+            "parallel_tool_calls": True,
+            "tool_choice": request.get("tool_choice", "auto"),
+            "tools": request.get("tools", []),
+            "usage": {
+                "input_tokens": input_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens": output_tokens,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": input_tokens + output_tokens,
+            },
+        }
+
+    def _function_call(self, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "type": "function_call",
+            "id": self.next_id("fc"),
+            "call_id": self.next_id("call"),
+            "name": name,
+            "arguments": json.dumps(arguments),
+            "status": "completed",
+        }
+
+    def _message(self, text: str) -> Dict[str, Any]:
+        return {
+            "type": "message",
+            "id": self.next_id("msg"),
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }
+
+
+def _last_whisper(messages: List[Any]) -> Tuple[Optional[str], str, int]:
+    """(player, text, assistant messages since) for the last whisper in the input."""
+    for index in range(len(messages) - 1, -1, -1):
+        message = messages[index]
+        if not isinstance(message, dict) or message.get("role") != "user":
+            continue
+        match = USER_MESSAGE.match(str(message.get("content", "")))
+        if match:
+            rounds = sum(1 for m in messages[index + 1:] if isinstance(m, dict) and m.get("role") == "assistant")
+            return match.group("player"), match.group("text"), rounds
+    return None, "", 0
+
+
+def make_handler(script: StubScript):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like a real server
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/responses"):
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+
+            with script.stats_lock:
+                script.requests += 1
+                script.in_flight += 1
+                script.max_in_flight = max(script.max_in_flight, script.in_flight)
+            try:
+                time.sleep(script.delay())
+                if script.should_fail():
+                    with script.stats_lock:
+                        script.errors += 1
+                    self._send_json(script.error_status, {"error": {"message": "Stub overloaded"}})
+                    return
+                output = script.output_for(request)
+                if request.get("stream"):
+                    self._send_stream(script.response(request, output))
+                else:
+                    self._send_json(200, script.response(request, output))
+            except (BrokenPipeError, ConnectionResetError):
+                # Client gave up (cancelled conversation or timeout)
+                self.close_connection = True
+            finally:
+                with script.stats_lock:
+                    script.in_flight -= 1
+
+        def _send_json(self, status: int, body: Dict[str, Any]):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_stream(self, response: Dict[str, Any]):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            sequence = itertools.count()
+            in_progress = dict(response, status="in_progress", output=[])
+            self._event({"type": "response.created", "response": in_progress, "sequence_number": next(sequence)})
+            for index, item in enumerate(response["output"]):
+                if script.stream_chunk_delay_ms:
+                    time.sleep(script.stream_chunk_delay_ms / 1000.0)
+                if item["type"] == "message" and script.stream_text_deltas:
+                    for word in re.findall(r"\S+\s*", item["content"][0]["text"]):
+                        self._event({"type": "response.output_text.delta", "item_id": item["id"],
+                                     "output_index": index, "content_index": 0, "delta": word,
+                                     "sequence_number": next(sequence)})
+                self._event({"type": "response.output_item.done", "output_index": index, "item": item,
+                             "sequence_number": next(sequence)})
+            self._event({"type": "response.completed", "response": response, "sequence_number": next(sequence)})
+            self.wfile.flush()
+
+        def _event(self, event: Dict[str, Any]):
+            self.wfile.write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+
+    return Handler
+
+
+class StubLLMServer:
+    """Runs the stub on a background thread; base_url is ready once start() returns."""
+
+    def __init__(self, script: Optional[StubScript] = None, host: str = "127.0.0.1", port: int = 0):
+        self.script = script or StubScript()
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(self.script))
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--tool-rounds", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    script = StubScript(args.tool_rounds, args.latency_ms, args.jitter_ms, args.seed,
+                        error_rate=args.error_rate, error_status=args.error_status)
+    server = StubLLMServer(script, args.host, args.port)
+    print(f"Stub Responses API on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+GPTMinecraftBot stand-in on fake_bot, for running bot_host without Minecraft or
+Node (pass its path as "agent_module"). A bot config with "disconnect_after"
+ends the connection that many seconds after login, like a kick.
+"""
+import asyncio
+
+from fake_bot import FakeBot, GoalNear
+from WhisperProcessor import WhisperMessageProcessor
+
+logins = []  # username per login, in this process
+
+
+class GPTMinecraftBot:
+    def __init__(self, openai_api_key, minecraft_config, model, llm_client=None, **kwargs):
+        self.bot = FakeBot(username=minecraft_config["username"])
+        self.ended = asyncio.Event()
+        self.end_reason = None
+        self.processor = WhisperMessageProcessor(llm_client, self.bot, GoalNear, model)
+        self.processor.start_processing()
+        self.stopped = False
+        logins.append(self.bot.username)
+        disconnect_after = minecraft_config.get("disconnect_after")
+        if disconnect_after is not None:
+            asyncio.get_running_loop().call_later(disconnect_after, self.disconnect, "kicked")
+
+    def disconnect(self, reason):
+        self.end_reason = reason
+        self.ended.set()
+
+    def stop(self):
+        self.stopped = True
+        self.processor.stop_processing()
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from actions import ActionTracker
+from fake_bot import FakeBot, GoalNear
+
+
+def move(bot, x, y, z, timeout=5.0, during=None):
+    async def run():
+        tracker = ActionTracker(bot, progress_interval=0.05)
+        if during is not None:
+            threading.Timer(0.05, during).start()
+        return await tracker.move_to(x, y, z, GoalNear(x, y, z, 1), timeout=timeout)
+    return asyncio.run(run())
+
+
+def test_arrives():
+    bot = FakeBot(speed=100)
+    result = move(bot, 5, 64, 0)
+    assert result["status"] == "success"
+    assert result["outcome"] == "arrived"
+    assert result["position"] == {"x": 5, "y": 64, "z": 0}
+
+
+def test_no_path_ends_the_move_early():
+    bot = FakeBot(speed=1)
+    result = move(bot, 50, 64, 0, during=lambda: bot.emit("path_update", SimpleNamespace(status="noPath")))
+    assert result["outcome"] == "no_path"
+    assert result["elapsed"] < 1
+
+
+def test_path_timeout_is_reported():
+    bot = FakeBot(speed=1)
+    result = move(bot, 50, 64, 0, during=lambda: bot.emit("path_update", SimpleNamespace(status="timeout")))
+    assert result["outcome"] == "path_timeout"
+
+
+def test_times_out_and_stops_the_pathfinder():
+    bot = FakeBot(speed=1)
+    result = move(bot, 50, 64, 0, timeout=0.2)
+    assert result["outcome"] == "timeout"
+    assert bot.pathfinder.goal is None
+    assert bot.listener_count("goal_reached") == 0
@@ -0,0 +1,69 @@
+import asyncio
+import contextlib
+import io
+import os
+import time
+
+import bot_host
+from bot_host import BotHost, BotSlot, run_slot, shard, worker_count
+
+FAKE_AGENT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_agent.py")
+
+
+def test_workers_are_capped_by_cores_and_packing():
+    assert worker_count(20, max_workers=4, bots_per_worker=8) == 3
+    assert worker_count(100, max_workers=4, bots_per_worker=8) == 4
+    assert worker_count(1, max_workers=4) == 1
+    assert shard(list(range(5)), 2) == [[0, 2, 4], [1, 3]]
+
+
+def test_disconnected_bot_logs_back_in():
+    agent_module = bot_host.load_agent_module(FAKE_AGENT)
+    slot = BotSlot({"username": "Bot1", "disconnect_after": 0.05})
+
+    async def run():
+        stop = asyncio.Event()
+        runner = asyncio.create_task(run_slot(slot, agent_module, None, stop, start_delay=0,
+                                              reconnect_delay=0.01, reconnect_max_delay=1.0))
+        while slot.connects < 3:
+            await asyncio.sleep(0.01)
+        stop.set()
+        await runner
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(asyncio.wait_for(run(), timeout=10))
+    assert agent_module.logins[:3] == ["Bot1"] * 3
+    assert slot.agent.stopped
+    assert slot.last_error is None
+
+
+def wait_until(host, condition, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, f"timed out: {host.status()}"
+        host.check()
+        time.sleep(0.05)
+
+
+def test_supervisor_restarts_a_crashed_worker():
+    config = {
+        "bots": [{"username": "Bot1"}, {"username": "Bot2"}],
+        "workers": 1,
+        "agent_module": FAKE_AGENT,
+        "heartbeat_interval": 0.1,
+        "llm": {"base_url": "http://127.0.0.1:9/v1", "api_key": "stub"},
+    }
+    host = BotHost(config, heartbeat_timeout=5.0, startup_timeout=60.0, restart_delay=0.1)
+    worker = host.workers[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        host.start()
+        try:
+            wait_until(host, lambda: worker.bot_status.get("Bot2", {}).get("connected"))
+            first_pid = worker.process.pid
+            worker.process.kill()
+            wait_until(host, lambda: worker.process.pid != first_pid and worker.ready
+                       and worker.bot_status.get("Bot2", {}).get("connected"))
+        finally:
+            host.stop()
+    assert worker.restarts == 1
+    assert set(worker.bot_status) == {"Bot1", "Bot2"}
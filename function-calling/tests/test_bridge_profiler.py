@@ -0,0 +1,44 @@
+import urllib.request
+
+from bridge_profiler import BridgeProfiler, unwrap
+from fake_bot import FakeBot, FakeItem
+
+
+def test_counts_every_access_through_the_wrapped_bot():
+    bot = FakeBot()
+    bot.inventory.set_slot(36, FakeItem("oak_log"))
+    profiler = BridgeProfiler(record_calls=True)
+    wrapped = profiler.wrap(bot)
+
+    with profiler.turn("alice#1") as turn, profiler.tool("get_position"):
+        position = wrapped.entity.position
+        assert (position.x, position.y, position.z) == (0, 64, 0)
+        names = [item.name for item in wrapped.inventory.items()]
+        wrapped.whisper("alice", "hi")
+
+    assert names == ["oak_log"]
+    assert bot.whispers[-1][1:] == ("alice", "hi")
+    assert list(profiler.call_log)[:4] == [
+        ("get", "bot.entity"), ("get", "bot.entity.position"),
+        ("get", "bot.entity.position.x"), ("get", "bot.entity.position.y"),
+    ]
+    report = profiler.report()
+    assert report["tools"]["get_position"]["invocations"] == 1
+    assert report["tools"]["get_position"]["bridge_calls"] == report["total_calls"] == turn.bridge_calls
+    assert report["turns"] == [{"label": "alice#1", "bridge_calls": turn.bridge_calls,
+                                "bridge_ms": round(turn.bridge_ms, 3)}]
+
+
+def test_unwrap_and_metrics_endpoint():
+    bot = FakeBot()
+    profiler = BridgeProfiler()
+    wrapped = profiler.wrap(bot)
+    assert unwrap(wrapped) is bot
+    wrapped.health
+    server = profiler.serve_metrics(0)
+    try:
+        port = server.server_address[1]
+        body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5).read().decode()
+    finally:
+        profiler.stop_metrics()
+    assert 'bridge_call_duration_ms_count{attr="bot.health"} 1' in body
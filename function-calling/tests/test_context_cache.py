@@ -0,0 +1,55 @@
+import json
+
+from context_cache import GameContextCache, context_delta
+from fake_bot import FakeBot, GoalNear
+from WhisperProcessor import WhisperMessage, WhisperMessageProcessor
+
+CONTEXT = {"position": {"x": 0, "y": 64, "z": 0}, "health": 20, "food": 20, "time": 1000, "weather": "clear"}
+
+
+def test_not_ready_until_the_first_update():
+    cache = GameContextCache()
+    assert not cache.ready
+    assert cache.snapshot() is None and cache.to_json() is None
+
+
+def test_update_replaces_the_serialized_context():
+    cache = GameContextCache()
+    cache.update(json.dumps(CONTEXT))
+    first = cache.to_json()
+    assert cache.to_json() is first  # served from the cache until something changes
+    assert json.loads(first) == CONTEXT
+
+    cache.update(dict(CONTEXT, health=15))
+    assert cache.updates == 2
+    assert json.loads(cache.to_json())["health"] == 15
+
+
+def test_snapshot_is_a_copy():
+    cache = GameContextCache()
+    cache.update(CONTEXT)
+    cache.snapshot()["position"]["x"] = 99
+    assert cache.snapshot()["position"]["x"] == 0
+
+
+def test_delta_has_only_changed_fields():
+    current = dict(CONTEXT, position={"x": 3, "y": 64, "z": 0}, weather="rain")
+    assert context_delta(None, CONTEXT) == CONTEXT
+    assert context_delta(CONTEXT, current) == {"position": {"x": 3, "y": 64, "z": 0}, "weather": "rain"}
+    assert context_delta(CONTEXT, dict(CONTEXT)) == {}
+
+
+def test_requests_carry_only_the_context_that_changed():
+    cache = GameContextCache()
+    cache.update(CONTEXT)
+    processor = WhisperMessageProcessor(None, FakeBot(), GoalNear, model="stub", context_cache=cache)
+    whisper = WhisperMessage("alice", "hi", 0.0)
+    conversation = [{"role": "user", "content": "Message from alice: hi"}]
+
+    processor._request_input(conversation, whisper)
+    processor._request_input(conversation, whisper)  # nothing changed: nothing added
+    cache.update(dict(CONTEXT, food=17))
+    processor._request_input(conversation, whisper)
+
+    contexts = [message["content"] for message in conversation if message["role"] == "system"]
+    assert contexts == [f"Game context: {json.dumps(CONTEXT)}", 'Game context update: {"food": 17}']
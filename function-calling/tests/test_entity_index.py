@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from entity_index import EntityIndex, EntityRecord
+
+
+def spawn(index, entity_id, x, y, z, type_="mob", name="zombie"):
+    index.apply_batch([{"id": entity_id, "name": name, "type": type_, "x": x, "y": y, "z": z}])
+
+
+def brute_force(records, point, radius=None, types=None):
+    found = [
+        (record.distance_to(point), record.id) for record in records
+        if (types is None or record.type in types) and (radius is None or record.distance_to(point) <= radius)
+    ]
+    return [entity_id for _, entity_id in sorted(found)]
+
+
+@pytest.fixture
+def crowd():
+    rng = random.Random(7)
+    index = EntityIndex(cell_size=8.0)
+    records = []
+    for entity_id in range(300):
+        record = EntityRecord(entity_id, "thing", rng.choice(["mob", "player", "object"]),
+                              rng.uniform(-60, 60), rng.uniform(40, 90), rng.uniform(-60, 60))
+        records.append(record)
+        spawn(index, record.id, record.x, record.y, record.z, record.type, record.name)
+    return index, records
+
+
+@pytest.mark.parametrize("point", [(0, 64, 0), (-7.5, 64, 31.9), (59, 41, -59), (200, 64, 200)])
+@pytest.mark.parametrize("types", [None, ("mob",), ("player", "object")])
+def test_within_matches_brute_force(crowd, point, types):
+    index, records = crowd
+    for radius in (0.5, 8, 13.7, 40):
+        found = [record.id for record in index.within(point, radius, types=types)]
+        assert found == brute_force(records, point, radius, types)
+
+
+@pytest.mark.parametrize("point", [(0, 64, 0), (-7.5, 64, 31.9), (59, 41, -59), (200, 64, 200)])
+@pytest.mark.parametrize("types", [None, ("mob",), ("player", "object")])
+def test_nearest_matches_brute_force(crowd, point, types):
+    index, records = crowd
+    for k in (1, 5, 20):
+        found = [record.id for record in index.nearest(point, k=k, types=types)]
+        assert found == brute_force(records, point, types=types)[:k]
+
+
+def test_neighbour_across_a_cell_boundary_wins_over_a_farther_one_in_the_same_cell():
+    index = EntityIndex(cell_size=8.0)
+    spawn(index, 1, 8.1, 64, 0.5)  # next cell, 0.2 away
+    spawn(index, 2, 0.5, 64, 0.5)  # same cell, 7.4 away
+    assert [record.id for record in index.nearest((7.9, 64, 0.5), k=1)] == [1]
+    assert [record.id for record in index.within((7.9, 64, 0.5), 1)] == [1]
+
+
+def test_negative_coordinates_round_down_to_their_cell():
+    index = EntityIndex(cell_size=8.0)
+    spawn(index, 1, -0.1, 64, -0.1)
+    spawn(index, 2, -8.0, 64, 0)
+    assert [record.id for record in index.within((0, 64, 0), 0.5)] == [1]
+    assert [record.id for record in index.nearest((-7.9, 64, 0), k=1)] == [2]
+
+
+def test_max_distance_limits_nearest():
+    index = EntityIndex(cell_size=8.0)
+    spawn(index, 1, 30, 64, 0)
+    assert index.nearest((0, 64, 0), k=1, max_distance=29) == []
+    assert [record.id for record in index.nearest((0, 64, 0), k=1, max_distance=30)] == [1]
+
+
+def test_moves_and_removals_update_the_grid():
+    index = EntityIndex(cell_size=8.0)
+    spawn(index, 1, 1, 64, 1)
+    spawn(index, 1, 100, 64, 100)  # moved into a far cell
+    assert index.within((0, 64, 0), 10) == []
+    assert index.get(1).x == 100
+    index.apply_batch('[{"id": 1, "gone": true}]')
+    assert len(index) == 0
+    assert index.nearest((100, 64, 100)) == []
+
+
+def test_detach_stops_the_watcher():
+    class Watcher:
+        stopped = 0
+
+        def stop(self):
+            self.stopped += 1
+
+    index = EntityIndex()
+    index._watcher = watcher = Watcher()
+    index.detach()
+    index.detach()
+    assert watcher.stopped == 1
@@ -0,0 +1,63 @@
+import asyncio
+import time
+import types
+
+import numpy as np
+import pytest
+
+from fake_bot import FakeBot, GoalNear
+from tool_cache import ToolResultCache
+from world_snapshot import VoxelSnapshot
+from WhisperProcessor import WhisperMessageProcessor
+
+# Importing functions starts the Node bridge and loads mineflayer
+functions = pytest.importorskip("functions", exc_type=ImportError)
+
+
+@pytest.fixture(autouse=True)
+def fake_goals(monkeypatch):
+    monkeypatch.setattr(functions, "goals", types.SimpleNamespace(GoalNear=GoalNear))
+
+
+def test_move_forward_arrives():
+    minecraft = functions.MinecraftBot(bot=FakeBot(speed=100), move_timeout=2)
+    assert asyncio.run(minecraft.move_forward(3)) == "Moved forward 3 blocks"
+    assert round(minecraft.bot.entity.position.x) == 3
+
+
+def test_move_forward_gives_up_at_the_timeout():
+    minecraft = functions.MinecraftBot(bot=FakeBot(speed=0.5), move_timeout=0.3)
+    started = time.monotonic()
+    with pytest.raises(Exception, match="Did not arrive"):
+        asyncio.run(minecraft.move_forward(10))
+    assert time.monotonic() - started < 2
+    assert minecraft.bot.pathfinder.goal is None
+
+
+def test_look_around_cache_survives_entity_moves(monkeypatch):
+    scans = []
+
+    def fake_snapshot(bot, radius):
+        scans.append(radius)
+        size = 2 * radius + 1
+        return VoxelSnapshot({"x": 0, "y": 64, "z": 0}, radius, ["air", "stone"],
+                             np.ones((size, size, size), dtype=np.uint8))
+
+    monkeypatch.setattr(functions, "fetch_snapshot", fake_snapshot)
+    minecraft = functions.MinecraftBot(bot=FakeBot())
+    cache = ToolResultCache()
+    processor = WhisperMessageProcessor(None, minecraft.bot, GoalNear, model="stub", toolset=minecraft,
+                                        tool_cache=cache)
+    call = types.SimpleNamespace(name="look_around", arguments='{"radius": 1, "max_blocks": 1}')
+
+    assert asyncio.run(processor._execute_function_call(call))["entities"] == []
+    minecraft.entities.apply_batch([{"id": 7, "name": "zombie", "type": "mob", "x": 1, "y": 64, "z": 0}])
+    cache.on_changes(["entities", "position"])
+    result = asyncio.run(processor._execute_function_call(call))
+    assert [entity["name"] for entity in result["entities"]] == ["zombie"]
+    assert result["block_counts"] == {"stone": 27}
+    assert scans == [1]
+
+    cache.on_changes(["block_position"])
+    asyncio.run(processor._execute_function_call(call))
+    assert scans == [1, 1]
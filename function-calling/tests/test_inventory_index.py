@@ -0,0 +1,41 @@
+from fake_bot import FakeBot, FakeItem
+from inventory_index import InventoryIndex
+
+
+def test_follows_slot_updates_after_the_initial_scan():
+    bot = FakeBot()
+    bot.inventory.set_slot(36, FakeItem("oak_log", count=4))
+    index = InventoryIndex()
+    index.attach(bot)
+    assert index.count("oak_log") == 4
+
+    bot.inventory.set_slot(37, FakeItem("cobblestone", count=12))
+    bot.inventory.set_slot(36, FakeItem("oak_log", count=2))
+    bot.inventory.set_slot(38, FakeItem("bread"))
+    bot.inventory.set_slot(38, None)
+
+    assert index.count("oak_log") == 2
+    assert index.find("cobblestone").slot == 37
+    assert index.find("bread") is None
+    assert index.verify() == []
+
+
+def test_ignores_slots_outside_the_main_inventory():
+    bot = FakeBot()
+    index = InventoryIndex()
+    index.attach(bot)
+    bot.inventory.set_slot(5, FakeItem("iron_helmet"))  # armor slot
+    assert len(index) == 0
+
+
+def test_detach_removes_its_listeners():
+    bot = FakeBot()
+    index = InventoryIndex()
+    index.attach(bot)
+    assert bot.inventory.listener_count('updateSlot') == 1 and bot.listener_count('respawn') == 1
+
+    index.detach()
+    assert bot.inventory.listener_count('updateSlot') == 0 and bot.listener_count('respawn') == 0
+    bot.inventory.set_slot(36, FakeItem("oak_log"))
+    assert index.count("oak_log") == 0
+    index.detach()  # a second detach is a no-op
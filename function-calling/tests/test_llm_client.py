@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import pytest
+
+from llm_client import LLMClient, LLMClientConfig
+from stub_llm_server import StubLLMServer, StubScript
+
+
+@pytest.fixture
+def stub():
+    server = StubLLMServer(StubScript(latency_ms=0)).start()
+    yield server
+    server.stop()
+
+
+def whisper_request(text: str):
+    return {"model": "stub", "input": [{"role": "user", "content": f"Message from alice: {text}"}]}
+
+
+def test_retries_503_then_succeeds(stub):
+    stub.script.fail_first = 2
+
+    async def run():
+        config = LLMClientConfig(base_url=stub.base_url, api_key="stub", max_retries=3,
+                                 backoff_base=0.01, backoff_max=0.02)
+        async with LLMClient(config) as client:
+            return await client.create_response(**whisper_request("go to 1 64 2"))
+
+    response = asyncio.run(run())
+    assert stub.script.errors == 2
+    assert stub.script.requests == 3
+    call = response.output[0]
+    assert call.type == "function_call"
+    assert call.name == "move_to"
+    assert json.loads(call.arguments) == {"x": 1.0, "y": 64.0, "z": 2.0, "timeout": None}
+    assert response.usage.total_tokens == response.usage.input_tokens + response.usage.output_tokens
+
+
+def test_gives_up_after_max_retries(stub):
+    stub.script.fail_first = 5
+
+    async def run():
+        config = LLMClientConfig(base_url=stub.base_url, api_key="stub", max_retries=1, backoff_base=0.01)
+        async with LLMClient(config) as client:
+            await client.create_response(**whisper_request("hi"))
+
+    with pytest.raises(Exception) as raised:
+        asyncio.run(run())
+    assert getattr(raised.value, "status_code", None) == 503
+    assert stub.script.requests == 2
+
+
+def test_stream_yields_output_items(stub):
+    async def run():
+        config = LLMClientConfig(base_url=stub.base_url, api_key="stub")
+        async with LLMClient(config) as client:
+            stream = await client.stream_response(**whisper_request("go to 3 64 5"))
+            return [event async for event in stream]
+
+    events = asyncio.run(run())
+    assert [event.type for event in events] == ["response.created", "response.output_item.done",
+                                                "response.completed"]
+    assert events[1].item.name == "move_to"
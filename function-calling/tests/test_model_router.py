@@ -0,0 +1,106 @@
+import asyncio
+import contextlib
+import io
+
+import pytest
+
+from model_router import Backend, ModelRouter
+from stub_llm_server import StubLLMServer, StubScript
+
+REQUEST = {"input": [{"role": "user", "content": "hi"}]}
+
+
+@pytest.fixture
+def stubs():
+    servers = []
+
+    def start(**script_options):
+        server = StubLLMServer(StubScript(**script_options)).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def call(router, purpose=None, times=1, concurrent=0):
+    """`times` calls one after another, then `concurrent` more at once; closes the router."""
+    async def run():
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                responses = [await router.create_response(purpose=purpose, model="ignored", **REQUEST)
+                             for _ in range(times)]
+                responses += await asyncio.gather(*(router.create_response(purpose=purpose, **REQUEST)
+                                                    for _ in range(concurrent)))
+                return responses
+        finally:
+            await router.aclose()
+    return asyncio.run(run())
+
+
+def test_purpose_picks_the_tier(stubs):
+    small, large = stubs(latency_ms=0), stubs(latency_ms=0)
+    router = ModelRouter([Backend("small", small.base_url, "small-model", api_key="x"),
+                          Backend("large", large.base_url, "large-model", tier="large", api_key="x")])
+
+    async def run():
+        try:
+            tool = await router.create_response(purpose="tool", **REQUEST)
+            final = await router.create_response(purpose="final", **REQUEST)
+            return tool.model, final.model
+        finally:
+            await router.aclose()
+
+    assert asyncio.run(run()) == ("small-model", "large-model")
+    assert router.status()["calls"] == {"tool": 1, "final": 1}
+
+
+def test_prefers_the_faster_replica(stubs):
+    slow, fast = stubs(latency_ms=120), stubs(latency_ms=10)
+    router = ModelRouter([Backend("slow", slow.base_url, "m", api_key="x"),
+                          Backend("fast", fast.base_url, "m", api_key="x")])
+    call(router, times=10, concurrent=10)
+    assert fast.script.requests > 2 * slow.script.requests
+
+
+def test_fails_over_on_overload_and_cools_the_backend_down(stubs):
+    broken, remote = stubs(latency_ms=0, error_rate=1.0), stubs(latency_ms=0)
+    router = ModelRouter([Backend("local", broken.base_url, "local-model", api_key="x"),
+                          Backend("remote", remote.base_url, "remote-model", priority=1, api_key="x")],
+                         cooldown=60)
+    responses = call(router, times=3)
+    assert [response.model for response in responses] == ["remote-model"] * 3
+    assert broken.script.requests == 1  # skipped while cooling down
+    assert router.failovers == 1
+    assert router.status()["backends"][0]["healthy"] is False
+
+
+def test_fails_over_on_timeout(stubs):
+    hung, other = stubs(latency_ms=2000), stubs(latency_ms=0)
+    router = ModelRouter([Backend("hung", hung.base_url, "a", timeout=0.3, api_key="x"),
+                          Backend("other", other.base_url, "b", priority=1, api_key="x")])
+    assert call(router)[0].model == "b"
+    assert "Timeout" in router.status()["backends"][0]["last_error"]
+
+
+def test_raises_when_every_backend_fails(stubs):
+    broken = stubs(latency_ms=0, error_rate=1.0)
+    router = ModelRouter([Backend("only", broken.base_url, "m", api_key="x")])
+    with pytest.raises(Exception) as raised:
+        call(router)
+    assert getattr(raised.value, "status_code", None) == 503
+
+
+def test_stream_goes_through_the_router(stubs):
+    server = stubs(latency_ms=0)
+    router = ModelRouter([Backend("only", server.base_url, "m", api_key="x")])
+
+    async def run():
+        try:
+            stream = await router.stream_response(purpose="final", **REQUEST)
+            return [event.type async for event in stream]
+        finally:
+            await router.aclose()
+
+    assert asyncio.run(run())[-1] == "response.completed"
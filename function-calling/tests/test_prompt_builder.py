@@ -0,0 +1,65 @@
+import pytest
+from openai.types.completion_usage import CompletionUsage, PromptTokensDetails
+from openai.types.responses import ResponseUsage
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+
+from prompt_builder import PrefixCacheStats, PromptBuilder
+
+
+def responses_usage(input_tokens: int, cached: int) -> ResponseUsage:
+    # Built without validation, as the SDK does for server JSON; required fields vary by version
+    return ResponseUsage.model_construct(
+        input_tokens=input_tokens,
+        input_tokens_details=InputTokensDetails.model_construct(cached_tokens=cached),
+        output_tokens=10,
+        output_tokens_details=OutputTokensDetails.model_construct(reasoning_tokens=0),
+        total_tokens=input_tokens + 10,
+    )
+
+
+def test_hit_rate_from_responses_usage():
+    stats = PrefixCacheStats()
+    stats.record(responses_usage(1000, 0))
+    stats.record(responses_usage(1000, 900))
+    assert stats.requests == 2
+    assert stats.last_hit_rate == pytest.approx(0.9)
+    assert stats.hit_rate == pytest.approx(0.45)
+    assert stats.as_dict() == {"requests": 2, "input_tokens": 2000, "cached_tokens": 900,
+                               "hit_rate": 0.45, "last_hit_rate": 0.9}
+
+
+def test_hit_rate_from_chat_completions_usage():
+    stats = PrefixCacheStats()
+    stats.record(CompletionUsage.model_construct(
+        prompt_tokens=400, completion_tokens=5, total_tokens=405,
+        prompt_tokens_details=PromptTokensDetails.model_construct(cached_tokens=100)))
+    stats.record({"prompt_tokens": 600, "prompt_tokens_details": {"cached_tokens": 500}})
+    assert stats.hit_rate == pytest.approx(0.6)
+    assert stats.last_hit_rate == pytest.approx(500 / 600)
+
+
+@pytest.mark.parametrize("usage", [
+    {"input_tokens": 300},
+    {"input_tokens": 300, "input_tokens_details": None},
+    {"input_tokens": 300, "input_tokens_details": {"cached_tokens": None}},
+])
+def test_missing_cached_tokens_count_as_misses(usage):
+    stats = PrefixCacheStats()
+    stats.record(usage)
+    assert (stats.requests, stats.input_tokens, stats.cached_tokens) == (1, 300, 0)
+    assert stats.hit_rate == 0.0
+
+
+def test_missing_usage_is_not_counted():
+    stats = PrefixCacheStats()
+    stats.record(None)
+    stats.record({})
+    assert stats.requests == 1
+    assert stats.hit_rate == 0.0 and stats.last_hit_rate == 0.0
+
+
+def test_tool_order_does_not_change_the_prefix():
+    tools = [{"type": "function", "name": "b", "parameters": {"type": "object", "properties": {}}},
+             {"name": "a", "type": "function", "parameters": {"properties": {}, "type": "object"}}]
+    assert PromptBuilder(tools).prefix_fingerprint == PromptBuilder(tools[::-1]).prefix_fingerprint
+    assert [tool["name"] for tool in PromptBuilder(tools).tools] == ["a", "b"]
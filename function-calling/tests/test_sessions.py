@@ -0,0 +1,113 @@
+import asyncio
+
+from sessions import SessionStore, count_message_tokens
+
+
+def turn(index: int, words: int = 50):
+    return [
+        {"role": "user", "content": f"Message from alice: request {index} " + "word " * words},
+        {"role": "assistant", "content": f"reply {index}"},
+    ]
+
+
+def turn_tokens(index: int) -> int:
+    return sum(count_message_tokens(message) for message in turn(index))
+
+
+def test_turns_over_the_budget_are_dropped_oldest_first():
+    store = SessionStore(token_budget=turn_tokens(0) * 3, keep_recent_turns=1)
+    session = store.get("alice")
+    session.last_context = {"health": 20}
+
+    async def run():
+        for index in range(3):
+            await store.record_turn(session, turn(index))
+        assert [t[0]["content"] for t in session.turns] == [turn(i)[0]["content"] for i in range(3)]
+        assert session.last_context == {"health": 20}
+        await store.record_turn(session, turn(3))
+
+    asyncio.run(run())
+    assert len(session.turns) == 3
+    assert session.turns[0] == turn(1)
+    assert session.token_count <= store.token_budget
+    # The deltas were based on context that may have been dropped
+    assert session.last_context is None
+    assert session.summary == ""
+
+
+def test_recent_turns_are_kept_even_over_the_budget():
+    store = SessionStore(token_budget=10, keep_recent_turns=2)
+    session = store.get("alice")
+
+    async def run():
+        for index in range(4):
+            await store.record_turn(session, turn(index))
+
+    asyncio.run(run())
+    assert session.turns == [turn(2), turn(3)]
+
+
+def test_folded_turns_go_to_the_summarizer():
+    folded = []
+
+    async def summarizer(previous: str, messages):
+        folded.append((previous, [m["content"] for m in messages]))
+        return f"summary after {len(folded)}\n"
+
+    store = SessionStore(token_budget=turn_tokens(0) * 2, keep_recent_turns=1, summarizer=summarizer)
+    session = store.get("alice")
+
+    async def run():
+        for index in range(4):
+            await store.record_turn(session, turn(index))
+
+    asyncio.run(run())
+    assert folded[0] == ("", [m["content"] for m in turn(0)])
+    assert folded[-1][0] == f"summary after {len(folded) - 1}"
+    assert session.summary == f"summary after {len(folded)}"
+    assert session.messages()[0]["role"] == "system"
+    assert session.token_count <= store.token_budget
+
+
+def test_failed_summary_keeps_the_truncation():
+    async def summarizer(previous: str, messages):
+        raise RuntimeError("model down")
+
+    store = SessionStore(token_budget=turn_tokens(0), keep_recent_turns=1, summarizer=summarizer)
+    session = store.get("alice")
+
+    async def run():
+        await store.record_turn(session, turn(0))
+        await store.record_turn(session, turn(1))
+
+    asyncio.run(run())
+    assert session.turns == [turn(1)]
+    assert session.summary == ""
+
+
+def test_least_recently_used_session_is_evicted_at_max_sessions():
+    store = SessionStore(max_sessions=2)
+    store.get("alice")
+    store.get("bob")
+    store.get("alice")  # bob is now the least recently used
+    store.get("carol")
+    assert len(store) == 2
+    assert "alice" in store and "carol" in store
+    assert "bob" not in store
+
+
+def test_idle_sessions_are_evicted():
+    store = SessionStore(idle_ttl=60)
+    store.get("alice").last_active -= 61
+    store.get("bob")
+    assert "alice" not in store
+    assert "bob" in store
+
+
+def test_recording_revives_an_evicted_session():
+    store = SessionStore(max_sessions=1)
+    session = store.get("alice")
+    store.get("bob")
+    assert "alice" not in store
+    asyncio.run(store.record_turn(session, turn(0)))
+    assert store.get("alice") is session
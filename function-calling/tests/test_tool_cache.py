@@ -0,0 +1,170 @@
+import asyncio
+import contextlib
+import io
+import json
+from types import SimpleNamespace
+
+from entity_index import EntityIndex
+from fake_bot import FakeBot, GoalNear
+from tool_cache import ToolResultCache
+from tool_registry import tool
+from WhisperProcessor import WhisperMessageProcessor
+
+
+class Surroundings:
+    """look_around's caching setup, without the Node bridge behind the block scan."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.entities = EntityIndex()
+        self.scans = 0
+
+    @tool(cacheable=True, invalidated_by=("block_position", "blocks"), live="nearby_entities")
+    async def look_around(self, radius: int = 5):
+        """Blocks and entities nearby"""
+        self.scans += 1
+        return {"block_counts": {"stone": self.scans}, **self.nearby_entities(radius)}
+
+    def nearby_entities(self, radius: int = 5, **_):
+        pos = self.bot.entity.position
+        center = (pos.x, pos.y, pos.z)
+        return {"entities": [record.name for record in self.entities.within(center, radius)]}
+
+
+def call(processor, tool_name, /, **arguments):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(processor._execute_function_call(
+            SimpleNamespace(name=tool_name, arguments=json.dumps(arguments))))
+
+
+def surroundings_processor():
+    bot = FakeBot()
+    toolset = Surroundings(bot)
+    cache = ToolResultCache()
+    processor = WhisperMessageProcessor(None, bot, GoalNear, model="stub", toolset=toolset, tool_cache=cache)
+    return processor, toolset, cache
+
+
+def test_entity_changes_keep_the_cached_scan_but_entities_stay_live():
+    processor, toolset, cache = surroundings_processor()
+    toolset.entities.apply_batch([{"id": 1, "name": "zombie", "type": "mob", "x": 2, "y": 64, "z": 0}])
+    assert call(processor, "look_around") == {"block_counts": {"stone": 1}, "entities": ["zombie"]}
+
+    # A mob walks up and another leaves; the bot shuffles within its block
+    toolset.entities.apply_batch([{"id": 2, "name": "cow", "type": "animal", "x": 1, "y": 64, "z": 1},
+                                  {"id": 1, "gone": True}])
+    cache.on_changes('["entities", "position"]')
+
+    assert call(processor, "look_around") == {"block_counts": {"stone": 1}, "entities": ["cow"]}
+    assert toolset.scans == 1
+    assert cache.stats.hits == 1
+
+
+def test_entering_another_block_or_a_block_update_rescans():
+    processor, toolset, cache = surroundings_processor()
+    call(processor, "look_around")
+    cache.on_changes(["block_position"])
+    call(processor, "look_around")
+    cache.on_changes(["blocks"])
+    call(processor, "look_around", radius=5.0)
+    assert toolset.scans == 3
+
+
+class Tools:
+    def __init__(self):
+        self.reads = 0
+        self.fail = False
+
+    @tool(cacheable=True, invalidated_by=("inventory",), cache_ttl=30)
+    async def count_items(self, name: str, max_slots: int = 36):
+        """Count an item"""
+        self.reads += 1
+        if self.fail:
+            return {"status": "error", "error": "inventory unavailable"}
+        return {"status": "success", "count": self.reads}
+
+    @tool(exclusive=True)
+    async def drop_item(self, name: str):
+        """Drop an item"""
+        return {"status": "success"}
+
+
+def tools_processor(**cache_options):
+    tools = Tools()
+    cache = ToolResultCache(**cache_options)
+    processor = WhisperMessageProcessor(None, FakeBot(), GoalNear, model="stub", toolset=tools, tool_cache=cache)
+    return processor, tools, cache
+
+
+def test_repeated_calls_hit_with_normalized_arguments():
+    processor, tools, cache = tools_processor()
+    first = call(processor, "count_items", name="stone")
+    assert call(processor, "count_items", name=" stone ", max_slots=36.0) == first
+    assert call(processor, "count_items", name="stone", max_slots=None) == first
+    assert tools.reads == 1
+    assert cache.stats.as_dict()["by_tool"] == {"count_items": {"hits": 2, "misses": 1}}
+
+    call(processor, "count_items", name="dirt")
+    assert tools.reads == 2
+
+
+def test_only_the_listed_groups_invalidate():
+    processor, tools, cache = tools_processor()
+    call(processor, "count_items", name="stone")
+    cache.on_changes(["position", "entities", "blocks"])
+    call(processor, "count_items", name="stone")
+    assert tools.reads == 1
+    cache.on_changes('["inventory"]')
+    call(processor, "count_items", name="stone")
+    assert tools.reads == 2
+    assert cache.stats.invalidated == 1
+
+
+def test_entries_expire_after_the_tool_ttl():
+    processor, tools, cache = tools_processor()
+    call(processor, "count_items", name="stone")
+    for entry in cache._entries.values():
+        entry.expires_at -= 31
+    call(processor, "count_items", name="stone")
+    assert tools.reads == 2 and cache.stats.expired == 1
+
+
+def test_exclusive_tool_invalidates_everything():
+    processor, tools, cache = tools_processor()
+    call(processor, "count_items", name="stone")
+    call(processor, "count_items", name="dirt")
+    call(processor, "drop_item", name="stone")
+    assert len(cache) == 0
+    call(processor, "count_items", name="stone")
+    assert tools.reads == 3
+
+
+def test_errors_are_not_cached():
+    processor, tools, cache = tools_processor()
+    tools.fail = True
+    call(processor, "count_items", name="stone")
+    tools.fail = False
+    call(processor, "count_items", name="stone")
+    assert tools.reads == 2
+
+
+def test_result_computed_across_an_invalidation_is_not_stored():
+    processor, tools, cache = tools_processor()
+    spec = processor.tools.get("count_items")
+    generation = cache.generation
+    cache.on_changes(["inventory"])  # arrives while the tool runs
+    cache.put(spec, {"name": "stone"}, {"count": 1}, generation)
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_goes_first():
+    processor, tools, cache = tools_processor(max_entries=2)
+    for name in ("a", "b"):
+        call(processor, "count_items", name=name)
+    call(processor, "count_items", name="a")  # b is now the oldest
+    call(processor, "count_items", name="c")
+    reads = tools.reads
+    call(processor, "count_items", name="a")
+    assert tools.reads == reads
+    call(processor, "count_items", name="b")
+    assert tools.reads == reads + 1
@@ -0,0 +1,133 @@
+import asyncio
+from typing import List, Literal, Optional
+
+import pytest
+
+from tool_registry import ToolArgumentError, ToolRegistry, UnknownToolError, _check_value, tool, tool_spec
+
+
+@tool(params={"distance": "Blocks to move", "sprint": "Run instead of walk"}, exclusive=True, keywords=("go",))
+async def move(distance: float, sprint: bool = False, mode: Optional[Literal["walk", "swim"]] = None):
+    """Move forward.
+
+    Longer text that is not part of the description.
+    """
+    return {"distance": distance, "sprint": sprint, "mode": mode}
+
+
+@tool(name="give", description="Give items")
+def give_items(names: List[str], count: int = 1):
+    return {"names": names, "count": count}
+
+
+def test_schema_is_strict_with_nullable_optionals():
+    spec = tool_spec(move)
+    assert spec.name == "move"
+    assert spec.description == "Move forward."
+    assert spec.exclusive and spec.metadata == {"keywords": ("go",)}
+    assert spec.optional == {"sprint", "mode"}
+    parameters = spec.parameters
+    assert parameters["required"] == ["distance", "sprint", "mode"]
+    assert parameters["additionalProperties"] is False
+    assert parameters["properties"]["distance"] == {"type": "number", "description": "Blocks to move"}
+    assert parameters["properties"]["sprint"] == {
+        "type": ["boolean", "null"], "description": "Run instead of walk (default False)"}
+    assert spec.schema["strict"] is True
+
+
+def test_literal_becomes_an_enum():
+    assert tool_spec(move).parameters["properties"]["mode"] == {
+        "type": ["string", "null"], "enum": ["walk", "swim", None]}
+
+
+def test_list_and_default_descriptions():
+    properties = tool_spec(give_items).parameters["properties"]
+    assert properties["names"] == {"type": "array", "items": {"type": "string"}}
+    assert properties["count"] == {"type": ["integer", "null"], "description": "Default 1"}
+
+
+def test_documenting_a_parameter_that_does_not_exist_is_an_error():
+    with pytest.raises(TypeError, match="not in signature"):
+        @tool(params={"distnace": "typo"})
+        def walk(distance: float):
+            pass
+
+
+def test_unsupported_annotation_is_an_error():
+    with pytest.raises(TypeError):
+        @tool()
+        def pick(choice: Optional[dict]):
+            pass
+
+
+def test_validate_omits_null_optionals_and_converts_whole_floats():
+    spec = tool_spec(give_items)
+    assert spec.validate({"names": ["stone"], "count": None}) == {"names": ["stone"]}
+    assert spec.validate({"names": ["stone"], "count": 3.0}) == {"names": ["stone"], "count": 3}
+
+
+@pytest.mark.parametrize("arguments, message", [
+    ("[]", "must be an object"),
+    ({}, "missing required argument 'distance'"),
+    ({"distance": 1, "speed": 2}, "unexpected argument"),
+    ({"distance": "far"}, "expected number"),
+    ({"distance": True}, "expected number"),
+    ({"distance": 1, "mode": "fly"}, "must be one of"),
+])
+def test_validate_rejects_bad_arguments(arguments, message):
+    with pytest.raises(ToolArgumentError, match=message):
+        tool_spec(move).validate(arguments)
+
+
+@pytest.mark.parametrize("value, schema, expected", [
+    (2, {"type": "integer"}, 2),
+    (2.0, {"type": "integer"}, 2),
+    (2, {"type": "number"}, 2),
+    ("a", {"type": ["string", "null"]}, "a"),
+    ([1, 2.0], {"type": "array", "items": {"type": "integer"}}, [1, 2]),
+])
+def test_check_value_accepts(value, schema, expected):
+    assert _check_value("x", value, schema) == expected
+
+
+@pytest.mark.parametrize("value, schema", [
+    (2.5, {"type": "integer"}),
+    (False, {"type": "integer"}),
+    (1, {"type": "boolean"}),
+    (["a", 1], {"type": "array", "items": {"type": "string"}}),
+    ("c", {"type": "string", "enum": ["a", "b"]}),
+])
+def test_check_value_rejects(value, schema):
+    with pytest.raises(ToolArgumentError):
+        _check_value("x", value, schema)
+
+
+def test_dispatch_validates_then_calls_sync_and_async_tools():
+    registry = ToolRegistry.from_functions(move, give_items)
+    assert registry.names() == ["move", "give"]
+    assert asyncio.run(registry.dispatch("move", {"distance": 2, "sprint": None, "mode": "swim"})) == {
+        "distance": 2, "sprint": False, "mode": "swim"}
+    assert asyncio.run(registry.dispatch("give", {"names": ["dirt"], "count": None})) == {
+        "names": ["dirt"], "count": 1}
+    with pytest.raises(UnknownToolError):
+        asyncio.run(registry.dispatch("fly", {}))
+
+
+def test_bound_methods_and_later_registrations_win():
+    class Base:
+        @tool()
+        def hello(self):
+            """Base greeting"""
+            return "base"
+
+    class Child(Base):
+        @tool()
+        def hello(self):
+            """Child greeting"""
+            return "child"
+
+    registry = ToolRegistry.combine(ToolRegistry.from_class(Base).bind(Base()),
+                                    ToolRegistry.from_class(Child).bind(Child()))
+    assert len(registry) == 1
+    assert registry.get("hello").description == "Child greeting"
+    assert asyncio.run(registry.dispatch("hello", None)) == "child"
@@ -0,0 +1,44 @@
+from tool_registry import ToolRegistry, tool
+from tool_router import ToolRouter
+
+
+@tool(keywords=("see", "nearby", "scan", "trees"))
+def look_around(radius: int = 5):
+    """Get information about blocks and entities in the surrounding area"""
+
+
+@tool(exclusive=True, keywords=("dig", "break", "ore"), route_always=True)
+def mine_block(x_offset: float, y_offset: float, z_offset: float):
+    """Mine/break a block at the specified relative position"""
+
+
+@tool(exclusive=True, keywords=("fight", "kill", "zombie"))
+def attack():
+    """Attack a mob or player in front of the agent"""
+
+
+@tool(keywords=("hungry", "food"))
+def eat_food(food_item: str):
+    """Consume food from inventory to restore hunger"""
+
+
+@tool()
+def whisper(username: str, message: str):
+    """Send a private message to a player"""
+
+
+REGISTRY = ToolRegistry.from_functions(look_around, mine_block, attack, eat_food, whisper)
+
+
+def test_route_always_tools_survive_a_scoring_miss():
+    router = ToolRouter(REGISTRY, max_tools=1)
+    decision = router.select("look around for trees and chop one")
+    assert not decision.fallback
+    assert {"look_around", "mine_block", "whisper"} <= set(decision.names)
+    assert "attack" not in decision.names
+
+
+def test_no_confident_match_sends_everything():
+    decision = ToolRouter(REGISTRY).select("xyzzy")
+    assert decision.fallback
+    assert decision.names == REGISTRY.names()
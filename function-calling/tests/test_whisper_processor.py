@@ -0,0 +1,146 @@
+import asyncio
+import contextlib
+import io
+
+import pytest
+
+from delegation import DelegatedTask
+from fake_bot import FakeBot, GoalNear
+from llm_client import LLMClient, LLMClientConfig
+from stub_llm_server import StubLLMServer, StubScript
+from whisper_scheduler import WhisperScheduler
+from WhisperProcessor import WhisperMessageProcessor, _current_player
+
+
+@pytest.fixture
+def stub():
+    server = StubLLMServer(StubScript(tool_rounds=0, latency_ms=300)).start()
+    yield server
+    server.stop()
+
+
+async def wait_for(condition, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+def run_turns(stub, interrupt, replies: int):
+    """Start a whisper turn, call interrupt(processor) while it waits on the LLM, then wait for the replies."""
+    bot = FakeBot()
+
+    async def run():
+        client = LLMClient(LLMClientConfig(base_url=stub.base_url, api_key="stub", max_retries=0))
+        processor = WhisperMessageProcessor(client, bot, GoalNear, model="stub", cancel_superseded=True)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                processor.start_processing()
+                processor.add_whisper("alice", "hello")
+                await wait_for(lambda: stub.script.in_flight == 1)
+                interrupt(processor)
+                await wait_for(lambda: len(bot.whispers) >= replies)
+                processor.stop_processing()
+        finally:
+            await client.aclose()
+        return processor
+
+    return asyncio.run(run()), bot
+
+
+def test_task_update_waits_behind_the_running_turn(stub):
+    task = DelegatedTask(id="task-1", description="mine 3 stone", status="done",
+                         result={"summary": "Mined 3 stone"}, assigned_agent="miner", parent="alice")
+    processor, bot = run_turns(stub, lambda p: p._on_delegated_done(task), replies=2)
+    assert processor.superseded == 0
+    assert [message for _, _, message in bot.whispers] == ["Done: hello", "Done: hello"]
+
+
+def test_player_whisper_supersedes_the_running_turn(stub):
+    processor, bot = run_turns(stub, lambda p: p.add_whisper("alice", "stop"), replies=1)
+    assert processor.superseded == 1
+    assert [message for _, _, message in bot.whispers] == ["Done: stop"]
+
+
+@pytest.mark.parametrize("deltas", [True, False])
+def test_streamed_reply_is_whispered_once_with_or_without_deltas(deltas):
+    server = StubLLMServer(StubScript(tool_rounds=0, latency_ms=0, text_replies=True,
+                                             stream_text_deltas=deltas)).start()
+    bot = FakeBot()
+
+    async def run():
+        client = LLMClient(LLMClientConfig(base_url=server.base_url, api_key="stub", max_retries=0))
+        processor = WhisperMessageProcessor(client, bot, GoalNear, model="stub", stream=True)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                processor.start_processing()
+                processor.add_whisper("alice", "hello there. how are you?")
+                await wait_for(lambda: bot.whispers)
+                await asyncio.sleep(0.2)
+                processor.stop_processing()
+        finally:
+            await client.aclose()
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.stop()
+    assert [message for _, _, message in bot.whispers] == ["Done: hello there.", "how are you?"]
+
+
+def test_long_move_whispers_progress_and_can_be_cancelled():
+    bot = FakeBot(speed=10)
+
+    async def run():
+        processor = WhisperMessageProcessor(None, bot, GoalNear, model="stub")
+        processor.actions.progress_interval = 0.05
+        _current_player.set("alice")
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert (await processor.cancel_movement())["status"] == "error"
+            move = asyncio.create_task(processor.move_to(10, 64, 0))
+            await wait_for(lambda: processor.actions.current is not None and processor.actions.current.progress >= 0.6)
+            cancelled = await processor.cancel_movement()
+            result = await move
+        return cancelled, result
+
+    cancelled, result = asyncio.run(run())
+    assert cancelled["status"] == "success"
+    assert result["outcome"] == "cancelled"
+    assert not bot.pathfinder.isMoving()
+    progress = [message for _, user, message in bot.whispers if user == "alice"]
+    assert len(progress) == 2  # the 25% and 50% milestones, each once
+    assert all(message.startswith("On my way to (10, 64, 0)") for message in progress)
+
+
+def test_quick_whispers_become_one_turn(stub):
+    bot = FakeBot()
+
+    async def run():
+        client = LLMClient(LLMClientConfig(base_url=stub.base_url, api_key="stub", max_retries=0))
+        processor = WhisperMessageProcessor(client, bot, GoalNear, model="stub",
+                                            scheduler=WhisperScheduler(coalesce_window=0.2))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                processor.start_processing()
+                for text in ("come here", "actually go to the tree", "hurry"):
+                    processor.add_whisper("alice", text)
+                await wait_for(lambda: bot.whispers)
+                await asyncio.sleep(0.5)
+                processor.stop_processing()
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+    assert stub.script.requests == 1
+    assert [message for _, _, message in bot.whispers] == ["Done: come here\nactually go to the tree\nhurry"]
+
+
+def test_superseding_whispers_are_answered_together(stub):
+    def interrupt(processor):
+        processor.add_whisper("alice", "hurry")
+        processor.add_whisper("alice", "go to the tree")
+
+    processor, bot = run_turns(stub, interrupt, replies=1)
+    assert processor.superseded >= 1
+    assert processor.scheduler.coalesced == 1
+    assert [message for _, _, message in bot.whispers] == ["Done: hurry\ngo to the tree"]
@@ -0,0 +1,162 @@
+import time
+
+import pytest
+
+from whisper_scheduler import PRIORITY_CHAT, PRIORITY_TASK, WhisperScheduler
+from WhisperProcessor import WhisperMessage
+
+
+def whisper(username, message, kind="whisper"):
+    return WhisperMessage(username, message, time.monotonic(), kind=kind)
+
+
+def serve(scheduler, now=None):
+    """Pick the next whisper as get() would and finish its turn at once; (username, text) or None."""
+    entry, username, _ = scheduler._select(time.monotonic() if now is None else now)
+    if entry is None:
+        return None
+    scheduler.done(username)
+    return username, entry.message.message
+
+
+def serve_all(scheduler):
+    served = []
+    while scheduler.depth:
+        served.append(serve(scheduler))
+    return served
+
+
+def test_players_with_unequal_backlogs_take_turns():
+    scheduler = WhisperScheduler(coalesce=False)
+    for i in range(4):
+        scheduler.put(whisper("alice", f"a{i}"))
+    for i in range(2):
+        scheduler.put(whisper("bob", f"b{i}"))
+    assert [text for _, text in serve_all(scheduler)] == ["a0", "b0", "a1", "b1", "a2", "a3"]
+
+
+def test_player_in_flight_is_not_served_again_until_done():
+    scheduler = WhisperScheduler(coalesce=False)
+    scheduler.put(whisper("alice", "a0"))
+    scheduler.put(whisper("alice", "a1"))
+    scheduler.put(whisper("bob", "b0"))
+    entry, username, _ = scheduler._select(time.monotonic())
+    scheduler._players[username].in_flight = True
+    assert (username, entry.message.message) == ("alice", "a0")
+    assert serve(scheduler) == ("bob", "b0")
+    assert serve(scheduler) is None
+    scheduler.done("alice")
+    assert serve(scheduler) == ("alice", "a1")
+
+
+@pytest.mark.parametrize("overflow, accepted, queued", [
+    ("drop_oldest", True, ["b", "c"]),
+    ("drop_newest", False, ["a", "b"]),
+    ("merge", True, ["a", "b\nc"]),
+])
+def test_overflow_policy_at_per_player_capacity(overflow, accepted, queued):
+    scheduler = WhisperScheduler(per_player_capacity=2, overflow=overflow, coalesce=False)
+    assert scheduler.put(whisper("alice", "a"))
+    assert scheduler.put(whisper("alice", "b"))
+    assert scheduler.put(whisper("alice", "c")) is accepted
+    assert [text for _, text in serve_all(scheduler)] == queued
+    assert scheduler.dropped == (0 if overflow == "merge" else 1)
+    assert scheduler.merged == (1 if overflow == "merge" else 0)
+
+
+def test_merge_overflow_never_folds_a_task_update_into_a_whisper():
+    scheduler = WhisperScheduler(per_player_capacity=1, overflow="merge", coalesce=False)
+    scheduler.put(whisper("alice", "a"))
+    assert not scheduler.put(whisper("alice", "task done", kind="task_update"))
+    assert scheduler.dropped == 1
+
+
+def test_full_queue_takes_from_the_longest_player_queue():
+    scheduler = WhisperScheduler(capacity=3, coalesce=False)
+    for i in range(3):
+        scheduler.put(whisper("alice", f"a{i}"))
+    assert scheduler.put(whisper("bob", "b0"))
+    assert scheduler.depth_by_player() == {"alice": 2, "bob": 1}
+    assert sorted(text for _, text in serve_all(scheduler)) == ["a1", "a2", "b0"]
+
+
+def test_rate_limit_defers_rather_than_drops():
+    scheduler = WhisperScheduler(rate=1.0, burst=1.0, coalesce=False)
+    scheduler.put(whisper("alice", "a0"))
+    scheduler.put(whisper("alice", "a1"))
+    now = time.monotonic()
+    entry, _, _ = scheduler._select(now)
+    assert entry.message.message == "a0"
+
+    # The bucket is empty: a1 waits about a second
+    entry, _, retry_in = scheduler._select(now)
+    assert entry is None
+    assert retry_in == pytest.approx(1.0)
+    assert scheduler.deferred == 1 and scheduler.dropped == 0
+
+    entry, _, _ = scheduler._select(now + 1.0)
+    assert entry.message.message == "a1"
+
+
+def test_rate_limit_allows_a_burst():
+    scheduler = WhisperScheduler(rate=0.1, burst=3.0, coalesce=False)
+    for i in range(4):
+        scheduler.put(whisper("alice", f"a{i}"))
+    now = time.monotonic()
+    assert [scheduler._select(now)[0] is not None for _ in range(4)] == [True, True, True, False]
+
+
+def test_aging_promotes_a_waiting_task():
+    scheduler = WhisperScheduler(aging=10.0, coalesce=False)
+    task = whisper("alice", "build a castle out of cobblestone with four towers and a moat")
+    scheduler.put(task)
+    scheduler.put(whisper("bob", "hi"))
+    assert [entry.priority for entry in (scheduler._players["alice"].entries[0],
+                                         scheduler._players["bob"].entries[0])] == [PRIORITY_TASK, PRIORITY_CHAT]
+    now = time.monotonic()
+    # Fresh, the chat goes first
+    assert scheduler._select(now)[1] == "bob"
+
+    scheduler.put(whisper("bob", "hello?"))
+    # After two aging periods the task outranks new chat
+    scheduler._players["alice"].entries[0].enqueued_at = now - 25.0
+    assert scheduler._select(now)[1] == "alice"
+
+
+def test_quick_whispers_coalesce_into_one_turn():
+    scheduler = WhisperScheduler()
+    for text in ("come here", "actually go to the tree", "hurry"):
+        scheduler.put(whisper("alice", text))
+    assert scheduler.depth == 1
+    assert scheduler.coalesced == 2
+    assert serve_all(scheduler) == [("alice", "come here\nactually go to the tree\nhurry")]
+
+
+def test_coalescing_stops_at_max_coalesced_chars():
+    scheduler = WhisperScheduler(max_coalesced_chars=10)
+    for text in ("12345", "678", "abc"):
+        scheduler.put(whisper("alice", text))
+    assert [text for _, text in serve_all(scheduler)] == ["12345\n678", "abc"]
+
+
+def test_coalesce_window_waits_for_the_player_to_go_quiet():
+    scheduler = WhisperScheduler(coalesce_window=1.0, max_coalesce_delay=2.0)
+    scheduler.put(whisper("alice", "come here"))
+    head = scheduler._players["alice"].entries[0]
+    entry, _, retry_in = scheduler._select(head.last_arrival + 0.25)
+    assert entry is None and retry_in == pytest.approx(0.75)
+    assert serve(scheduler, now=head.last_arrival + 1.0) == ("alice", "come here")
+
+
+def test_coalesce_window_is_capped_by_max_coalesce_delay():
+    scheduler = WhisperScheduler(coalesce_window=1.0, max_coalesce_delay=2.0)
+    scheduler.put(whisper("alice", "come here"))
+    head = scheduler._players["alice"].entries[0]
+    started = head.enqueued_at
+    # The player keeps talking: the last whisper landed 1.8 s after the first
+    scheduler.put(whisper("alice", "hurry"))
+    head.last_arrival = started + 1.8
+    entry, _, retry_in = scheduler._select(started + 0.5)
+    assert entry is None and retry_in == pytest.approx(1.5)
+    # Served at the cap, although the player spoke only 0.2 s ago
+    assert serve(scheduler, now=started + 2.0) == ("alice", "come here\nhurry")
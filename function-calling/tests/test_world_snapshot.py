@@ -0,0 +1,41 @@
+import json
+
+import numpy as np
+import pytest
+
+from world_snapshot import MAX_SNAPSHOT_RADIUS, VoxelSnapshot, fetch_snapshot
+
+
+@pytest.mark.parametrize("radius", [0, -3, MAX_SNAPSHOT_RADIUS + 1, 100])
+def test_fetch_snapshot_rejects_radius_out_of_range(radius):
+    # Checked before the bridge is touched
+    with pytest.raises(ValueError):
+        fetch_snapshot(object(), radius)
+
+
+def partly_unloaded_snapshot():
+    # Radius 1: the x = +1 face is in an unloaded chunk, a stone and a log are loaded
+    palette = ["air", "unloaded", "stone", "oak_log"]
+    states = np.zeros((3, 3, 3), dtype=np.uint8)
+    states[2, :, :] = 1
+    states[1, 0, 1] = 2  # just below the origin
+    states[0, 0, 0] = 3  # a corner, farther away
+    payload = {"origin": {"x": 10, "y": 64, "z": -5}, "radius": 1, "palette": palette,
+               "states": states.ravel().tolist()}
+    return VoxelSnapshot.from_json(json.dumps(payload))
+
+
+def test_unloaded_cells_are_not_reported_as_blocks():
+    snapshot = partly_unloaded_snapshot()
+    assert snapshot.counts() == {"stone": 1, "oak_log": 1}
+    assert snapshot.unloaded() == 9
+    assert [block["name"] for block in snapshot.blocks()] == ["stone", "oak_log"]
+    assert snapshot.blocks()[0]["position"] == {"x": 0, "y": -1, "z": 0}
+
+
+def test_fully_loaded_snapshot_has_no_unloaded_cells():
+    payload = {"origin": {"x": 0, "y": 0, "z": 0}, "radius": 1, "palette": ["air", "dirt"],
+               "states": [1] * 27}
+    snapshot = VoxelSnapshot.from_json(json.dumps(payload))
+    assert snapshot.unloaded() == 0
+    assert snapshot.counts() == {"dirt": 27}
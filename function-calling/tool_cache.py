@@ -0,0 +1,168 @@
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from bridge_profiler import unwrap
+from tool_registry import ToolSpec
+from world_snapshot import load_world_query
+
+# Change groups reported by world_query.watchChanges; block_position is the bot
+# entering another block, position any move at all
+CHANGE_GROUPS = ("position", "block_position", "blocks", "entities", "inventory", "status")
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    expires_at: float
+    groups: FrozenSet[str]
+
+
+@dataclass
+class ToolCacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    invalidated: int = 0
+    by_tool: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def record(self, name: str, hit: bool):
+        counts = self.by_tool.setdefault(name, {"hits": 0, "misses": 0})
+        if hit:
+            self.hits += 1
+            counts["hits"] += 1
+        else:
+            self.misses += 1
+            counts["misses"] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "expired": self.expired,
+            "invalidated": self.invalidated,
+            "by_tool": {name: dict(counts) for name, counts in self.by_tool.items()},
+        }
+
+
+class ToolResultCache:
+    """
+    Results of read-only tools, keyed by tool name and normalized arguments.
+
+    A tool opts in through its @tool metadata:
+
+        @tool(cacheable=True, invalidated_by=("inventory",), cache_ttl=30)
+
+    live="method" names a method of the tool's instance, called with the tool's
+    arguments on every hit; the dict it returns replaces those fields of the cached
+    result, for parts that change too often to cache (look_around's entities).
+
+    An entry is dropped when any of its invalidated_by groups changes (reported in
+    batches by world_query.watchChanges once attached), when its TTL runs out, or
+    by invalidate_all(); the processor calls that after every exclusive tool,
+    since the bot's own actions change the world before their events arrive.
+    """
+
+    def __init__(self, ttl: float = 10.0, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = ToolCacheStats()
+        self._entries: "OrderedDict[Tuple[str, str], _CacheEntry]" = OrderedDict()
+        # Invalidations arrive on the JS bridge thread
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._defaults: Dict[str, Dict[str, Any]] = {}
+        # Bumped by every invalidation; a result computed across one isn't stored
+        self.generation = 0
+
+    # -----------------------------
+    # Event wiring
+    # -----------------------------
+    def attach(self, bot, interval_ms: int = 100):
+        self._watcher = load_world_query().watchChanges(unwrap(bot), self.on_changes, interval_ms)
+
+    def detach(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def on_changes(self, payload):
+        """Drop entries depending on any changed group (JSON array or list of group names)."""
+        groups = set(json.loads(payload) if isinstance(payload, str) else payload)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.groups & groups]
+            for key in stale:
+                del self._entries[key]
+            self.stats.invalidated += len(stale)
+            self.generation += 1
+
+    def invalidate_all(self):
+        with self._lock:
+            self.stats.invalidated += len(self._entries)
+            self._entries.clear()
+            self.generation += 1
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    @staticmethod
+    def cacheable(spec: Optional[ToolSpec]) -> bool:
+        return spec is not None and bool(spec.metadata.get("cacheable")) and not spec.exclusive
+
+    def key(self, spec: ToolSpec, kwargs: Dict[str, Any]) -> Tuple[str, str]:
+        """Validated kwargs with defaults filled in, so look_around() and look_around(radius=5.0) match."""
+        defaults = self._defaults.get(spec.name)
+        if defaults is None:
+            defaults = self._defaults[spec.name] = {
+                name: param.default
+                for name, param in inspect.signature(spec.func).parameters.items()
+                if param.default is not inspect.Parameter.empty
+            }
+        arguments = {**defaults, **kwargs}
+        return spec.name, json.dumps({name: _normalize(value) for name, value in arguments.items()},
+                                     sort_keys=True, default=str)
+
+    def get(self, spec: ToolSpec, kwargs: Dict[str, Any]) -> Tuple[bool, Any]:
+        key = self.key(spec, kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.stats.expired += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            self.stats.record(spec.name, entry is not None)
+            return (True, entry.value) if entry is not None else (False, None)
+
+    def put(self, spec: ToolSpec, kwargs: Dict[str, Any], value: Any, generation: Optional[int] = None):
+        """Store a result; pass the generation read before the call so a stale one is skipped."""
+        ttl = spec.metadata.get("cache_ttl", self.ttl)
+        groups = frozenset(spec.metadata.get("invalidated_by", CHANGE_GROUPS))
+        key = self.key(spec, kwargs)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = _CacheEntry(value, time.monotonic() + ttl, groups)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
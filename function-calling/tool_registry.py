@@ -0,0 +1,261 @@
+"""
+Declarative tool registry.
+
+Each tool is declared once, on the function or method that implements it:
+
+    class MinecraftBot:
+        @tool(params={"distance": "Number of blocks to move forward"}, exclusive=True)
+        async def move_forward(self, distance: float):
+            \"\"\"Move the agent forward by a specified number of blocks\"\"\"
+
+The strict JSON schema is generated from the signature and type hints when the
+decorator runs (i.e. at import) and cached on the function. A ToolRegistry maps
+names to specs for O(1) dispatch, validating arguments against the schema first.
+"""
+import inspect
+import typing
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+_JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean"}
+
+
+class ToolArgumentError(ValueError):
+    """Arguments from the model don't match the tool's schema."""
+
+
+class UnknownToolError(KeyError):
+    """No tool with that name is registered."""
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    name: str
+    description: str
+    func: Callable
+    parameters: Dict[str, Any]
+    optional: FrozenSet[str] = frozenset()
+    exclusive: bool = False  # moves the bot / changes the world; serialized per bot
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        """Responses API tool definition (strict mode)."""
+        return {
+            "type": "function",
+            "name": self.name,
+            "description": self.description,
+            "parameters": self.parameters,
+            "strict": True,
+        }
+
+    def validate(self, arguments: Any) -> Dict[str, Any]:
+        """Checked keyword arguments for func; optional arguments left as null are omitted."""
+        if arguments is None:
+            arguments = {}
+        if not isinstance(arguments, dict):
+            raise ToolArgumentError(f"{self.name}: arguments must be an object")
+        properties = self.parameters["properties"]
+        unknown = set(arguments) - set(properties)
+        if unknown:
+            raise ToolArgumentError(f"{self.name}: unexpected argument(s) {', '.join(sorted(unknown))}")
+
+        kwargs = {}
+        for name, schema in properties.items():
+            value = arguments.get(name)
+            if value is None:
+                if name in self.optional:
+                    continue
+                raise ToolArgumentError(f"{self.name}: missing required argument '{name}'")
+            kwargs[name] = _check_value(f"{self.name}.{name}", value, schema)
+        return kwargs
+
+
+# -----------------------------
+# Decorator and schema generation
+# -----------------------------
+def tool(name: Optional[str] = None, description: Optional[str] = None,
+         params: Optional[Dict[str, str]] = None, exclusive: bool = False, **metadata):
+    """
+    Mark a function or method as a tool.
+
+    - description: defaults to the first line of the docstring
+    - params: per-argument descriptions
+    - exclusive: the tool moves the bot or changes the world
+    - metadata: free-form flags read by other components
+    """
+    def decorate(func):
+        func.__tool_spec__ = _build_spec(func, name, description, params or {}, exclusive, metadata)
+        return func
+    return decorate
+
+
+def tool_spec(func: Callable) -> ToolSpec:
+    return func.__tool_spec__
+
+
+def _build_spec(func, name, description, param_docs, exclusive, metadata) -> ToolSpec:
+    signature = inspect.signature(func)
+    hints = typing.get_type_hints(func)
+    properties: Dict[str, Any] = {}
+    optional = set()
+
+    for param in signature.parameters.values():
+        if param.name in ("self", "cls") or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        schema = _json_schema(hints.get(param.name, str))
+        doc = param_docs.get(param.name)
+        if param.default is not inspect.Parameter.empty:
+            # Strict mode requires every property; optional ones accept null instead
+            optional.add(param.name)
+            schema = _nullable(schema)
+            if param.default is not None:
+                doc = f"{doc} (default {param.default})" if doc else f"Default {param.default}"
+        if doc:
+            schema["description"] = doc
+        properties[param.name] = schema
+
+    unknown_docs = set(param_docs) - set(properties)
+    if unknown_docs:
+        raise TypeError(f"{func.__qualname__}: params documented but not in signature: {sorted(unknown_docs)}")
+
+    doc_line = (inspect.getdoc(func) or "").strip().split("\n")[0]
+    return ToolSpec(
+        name=name or func.__name__,
+        description=description or doc_line or func.__name__,
+        func=func,
+        parameters={
+            "type": "object",
+            "properties": properties,
+            "required": list(properties),
+            "additionalProperties": False,
+        },
+        optional=frozenset(optional),
+        exclusive=exclusive,
+        metadata=dict(metadata),
+    )
+
+
+def _json_schema(annotation) -> Dict[str, Any]:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Union:
+        non_null = [a for a in args if a is not type(None)]
+        if len(non_null) == 1:
+            return _json_schema(non_null[0])
+        raise TypeError(f"Unsupported union annotation: {annotation}")
+    if origin is typing.Literal:
+        return {"type": _JSON_TYPES[type(args[0])], "enum": list(args)}
+    if origin in (list, List):
+        return {"type": "array", "items": _json_schema(args[0]) if args else {"type": "string"}}
+    if annotation in _JSON_TYPES:
+        return {"type": _JSON_TYPES[annotation]}
+    raise TypeError(f"Unsupported tool parameter annotation: {annotation}")
+
+
+def _nullable(schema: Dict[str, Any]) -> Dict[str, Any]:
+    schema = dict(schema)
+    schema["type"] = [schema["type"], "null"]
+    if "enum" in schema:
+        schema["enum"] = [*schema["enum"], None]
+    return schema
+
+
+def _check_value(label: str, value: Any, schema: Dict[str, Any]) -> Any:
+    types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+    if "enum" in schema and value not in schema["enum"]:
+        raise ToolArgumentError(f"{label}: must be one of {schema['enum']}")
+    if "number" in types and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if "integer" in types and not isinstance(value, bool):
+        if isinstance(value, int):
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+    if "string" in types and isinstance(value, str):
+        return value
+    if "boolean" in types and isinstance(value, bool):
+        return value
+    if "array" in types and isinstance(value, list):
+        return [_check_value(f"{label}[]", item, schema["items"]) for item in value]
+    raise ToolArgumentError(f"{label}: expected {' or '.join(t for t in types if t != 'null')}")
+
+
+# -----------------------------
+# Registry
+# -----------------------------
+class ToolRegistry:
+    """Name -> (spec, bound instance). Later registrations override earlier ones."""
+
+    def __init__(self, specs: Iterable[ToolSpec] = (), instance: Any = None):
+        self._entries: Dict[str, Tuple[ToolSpec, Any]] = {}
+        self._schemas: Optional[List[Dict[str, Any]]] = None
+        for spec in specs:
+            self.register(spec, instance)
+
+    @classmethod
+    def from_class(cls, klass) -> "ToolRegistry":
+        """All @tool methods of a class, in definition order (base classes first)."""
+        specs: Dict[str, ToolSpec] = {}
+        for base in reversed(klass.__mro__):
+            for member in vars(base).values():
+                spec = getattr(member, "__tool_spec__", None)
+                if spec is not None:
+                    specs[spec.name] = spec
+        return cls(specs.values())
+
+    @classmethod
+    def from_functions(cls, *funcs: Callable) -> "ToolRegistry":
+        return cls(tool_spec(func) for func in funcs)
+
+    @classmethod
+    def combine(cls, *registries: "ToolRegistry") -> "ToolRegistry":
+        combined = cls()
+        for registry in registries:
+            for spec, instance in registry._entries.values():
+                combined.register(spec, instance)
+        return combined
+
+    def bind(self, instance: Any) -> "ToolRegistry":
+        return ToolRegistry((spec for spec, _ in self._entries.values()), instance)
+
+    def register(self, spec: ToolSpec, instance: Any = None):
+        self._entries[spec.name] = (spec, instance)
+        self._schemas = None
+
+    def get(self, name: str) -> Optional[ToolSpec]:
+        entry = self._entries.get(name)
+        return entry[0] if entry else None
+
+    def instance(self, name: str) -> Any:
+        """The object a tool's method is bound to (None for plain functions)."""
+        entry = self._entries.get(name)
+        return entry[1] if entry else None
+
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def schemas(self, names: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        if self._schemas is None:
+            self._schemas = [spec.schema for spec, _ in self._entries.values()]
+        if names is None:
+            return self._schemas
+        wanted = set(names)
+        return [schema for schema in self._schemas if schema["name"] in wanted]
+
+    async def dispatch(self, name: str, arguments: Any) -> Any:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise UnknownToolError(name)
+        spec, instance = entry
+        kwargs = spec.validate(arguments)
+        result = spec.func(instance, **kwargs) if instance is not None else spec.func(**kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
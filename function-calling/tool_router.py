@@ -0,0 +1,143 @@
+import json
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence
+
+from inventory_index import normalize_tokens
+from sessions import count_tokens
+from tool_registry import ToolRegistry
+
+_STOPWORDS = frozenset({
+    "a", "an", "the", "to", "of", "in", "on", "at", "by", "for", "and", "or", "is", "it",
+    "me", "my", "you", "your", "i", "we", "us", "can", "could", "would", "please", "some",
+    "this", "that", "there", "then", "with", "from", "up", "be", "do", "get", "if", "so",
+})
+
+# Field weights when building a tool's document
+_NAME_WEIGHT = 3
+_KEYWORD_WEIGHT = 3
+
+
+def _stem(token: str) -> str:
+    """Crude suffix stripping so 'mining'/'mine', 'blocks'/'block', 'digging'/'dig' meet."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(token) > len(suffix) + 2 and token.endswith(suffix):
+            token = token[:-len(suffix)]
+            break
+    if len(token) > 3 and token[-1] == token[-2]:
+        token = token[:-1]
+    if len(token) > 3 and token.endswith("e"):
+        token = token[:-1]
+    return token
+
+
+def text_terms(text: str) -> List[str]:
+    return [_stem(token) for token in normalize_tokens(text) if token not in _STOPWORDS and not token.isdigit()]
+
+
+@dataclass
+class RouteDecision:
+    names: List[str]                 # tools to send, in registry order
+    scores: Dict[str, float] = field(default_factory=dict)
+    fallback: bool = False           # True when the full tool set is sent
+
+
+@dataclass
+class RouterStats:
+    requests: int = 0
+    fallbacks: int = 0
+    tools_sent: int = 0
+    tools_available: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "fallbacks": self.fallbacks,
+            "fallback_rate": round(self.fallbacks / self.requests, 4) if self.requests else 0.0,
+            "avg_tools_sent": round(self.tools_sent / self.requests, 2) if self.requests else 0.0,
+            "tools_available": self.tools_available,
+        }
+
+
+class ToolRouter:
+    """
+    Picks the tools worth sending for one request instead of the whole registry.
+
+    Each tool is a TF-IDF vector over its name, description, parameter text and
+    the `keywords` metadata given to @tool; the whisper is scored against all of
+    them by cosine similarity, locally and in microseconds. The subset is the
+    `always` tools, the best matches above `min_score`, and the tools the player
+    used recently. If nothing matches confidently the full set is sent.
+
+    Tools marked @tool(route_always=True) are always sent too: the core physical
+    actions (moving, mining, placing) that no other tool can stand in for, so a
+    scoring miss can't leave the model unable to act.
+    """
+
+    def __init__(self, registry: ToolRegistry, always: Sequence[str] = ("whisper",),
+                 max_tools: int = 4, min_score: float = 0.15):
+        self.names = registry.names()
+        self.always = [name for name in always if name in registry]
+        self.always += [name for name in self.names
+                        if registry.get(name).metadata.get("route_always") and name not in self.always]
+        self.max_tools = max_tools
+        self.min_score = min_score
+        self.stats = RouterStats(tools_available=len(self.names))
+
+        documents = {name: self._document(registry, name) for name in self.names}
+        doc_freq = Counter(term for terms in documents.values() for term in set(terms))
+        total = len(documents)
+        self._idf = {term: math.log((1 + total) / (1 + df)) + 1.0 for term, df in doc_freq.items()}
+        self._vectors = {name: self._vector(terms) for name, terms in documents.items()}
+
+    @staticmethod
+    def _document(registry: ToolRegistry, name: str) -> List[str]:
+        spec = registry.get(name)
+        terms = text_terms(name) * _NAME_WEIGHT
+        terms += text_terms(spec.description)
+        for param, schema in spec.parameters["properties"].items():
+            terms += text_terms(param) + text_terms(schema.get("description", ""))
+        for keyword in spec.metadata.get("keywords", ()):
+            terms += text_terms(keyword) * _KEYWORD_WEIGHT
+        return terms
+
+    def _vector(self, terms: Iterable[str]) -> Dict[str, float]:
+        counts = Counter(term for term in terms if term in self._idf)
+        vector = {term: count * self._idf[term] for term, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+    def scores(self, text: str) -> Dict[str, float]:
+        query = self._vector(text_terms(text))
+        return {
+            name: sum(weight * vector.get(term, 0.0) for term, weight in query.items())
+            for name, vector in self._vectors.items()
+        }
+
+    def select(self, text: str, recent_tools: Iterable[str] = ()) -> RouteDecision:
+        scores = self.scores(text)
+        ranked = sorted((name for name in self.names if scores[name] >= self.min_score),
+                        key=lambda name: -scores[name])
+        self.stats.requests += 1
+
+        if not ranked:
+            return self._fallback(scores)
+        chosen = set(self.always) | set(ranked[:self.max_tools])
+        chosen |= {name for name in recent_tools if name in self._vectors}
+        if len(chosen) >= len(self.names):
+            return self._fallback(scores)
+
+        names = [name for name in self.names if name in chosen]
+        self.stats.tools_sent += len(names)
+        return RouteDecision(names=names, scores=scores)
+
+    def _fallback(self, scores: Dict[str, float]) -> RouteDecision:
+        self.stats.fallbacks += 1
+        self.stats.tools_sent += len(self.names)
+        return RouteDecision(names=list(self.names), scores=scores, fallback=True)
+
+
+def schema_tokens(schemas: List[Dict]) -> int:
+    """Approximate prompt tokens taken by a list of tool schemas."""
+    return count_tokens(json.dumps(schemas, separators=(",", ":"))) if schemas else 0
@@ -1,47 +1,9 @@
 # -----------------------------
 # Mineflayer tool schema (tool definitions for function calling)
-# These should mirror the mineflayer/mineflayer plugin methods that your Python bridge can execute.
-# If calling Node/JS mineflayer behind the scenes, ensure your bridge layer exposes these methods.
+# Generated from the @tool methods of WhisperMessageProcessor (whisper, chat, move_to);
+# the MinecraftBot actions live in functions.MinecraftBot.tool_registry. Declare new
+# tools with tool_registry.tool on the method that implements them, not here.
 # -----------------------------
-mineflayer_tools = [
-    {
-        "type": "function",
-        "name": "whisper",
-        "description": "Send a private whisper to a player",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "username": {"type": "string"},
-                "message": {"type": "string"}
-            },
-            "required": ["username", "message"]
-        }
-    },
-    {
-        "type": "function",
-        "name": "chat",
-        "description": "Send a message to the global chat",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "message": {"type": "string"}
-            },
-            "required": ["message"]
-        }
-    },
-    # move bot to position x, y, z
-    {
-        "type": "function",
-        "name": "move_to",
-        "description": "Move the bot to a specific position in the world",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "x": {"type": "number"},
-                "y": {"type": "number"},
-                "z": {"type": "number"}
-            },
-            "required": ["x", "y", "z"]
-        }
-    },
-]
\ No newline at end of file
+from WhisperProcessor import WhisperMessageProcessor
+
+mineflayer_tools = WhisperMessageProcessor.tool_registry.schemas()
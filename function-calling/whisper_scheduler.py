@@ -0,0 +1,305 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, Optional
+
+# Priority levels, lower is served first
+PRIORITY_OPS = 0
+PRIORITY_CHAT = 1
+PRIORITY_TASK = 2
+
+OVERFLOW_POLICIES = ("merge", "drop_oldest", "drop_newest")
+
+
+@dataclass
+class QueuedWhisper:
+    message: Any                  # the WhisperMessage
+    priority: int
+    cost: float
+    enqueued_at: float = field(default_factory=time.monotonic)
+    last_arrival: float = field(default_factory=time.monotonic)
+    merged: int = 1               # whispers folded into this entry
+
+
+@dataclass
+class _PlayerQueue:
+    entries: Deque[QueuedWhisper] = field(default_factory=deque)
+    virtual_time: float = 0.0     # fair-queuing finish tag of the last entry served
+    tokens: float = 0.0           # rate-limit bucket
+    refilled_at: float = field(default_factory=time.monotonic)
+    in_flight: bool = False
+
+
+def priority_classifier(ops: Iterable[str] = (), short_chars: int = 40) -> Callable[[Any], int]:
+    """Ops first, then short chat-like whispers, then everything else (build tasks, long requests)."""
+    op_names: FrozenSet[str] = frozenset(ops)
+
+    def classify(whisper) -> int:
+        if whisper.username in op_names:
+            return PRIORITY_OPS
+        if len(whisper.message) <= short_chars:
+            return PRIORITY_CHAT
+        return PRIORITY_TASK
+    return classify
+
+
+class WhisperScheduler:
+    """
+    Bounded, fair whisper queue shared by the processor's worker pool.
+
+    - Fairness: start-time fair queuing across players (a deficit-style round robin
+      where a whisper costs 1 + len/cost_chars), so one player's backlog can't
+      bury anyone else. Whispers of one player stay in order, and a player whose
+      conversation is in flight isn't served again until done() is called.
+    - Priorities: classify(whisper) -> level, served strictly by level; a whisper
+      gains one level per `aging` seconds of waiting so low levels can't starve.
+    - Backpressure: at most per_player_capacity whispers per player and capacity
+      overall. On overflow the new whisper is merged into the player's last queued
+      one ("merge"), replaces the oldest ("drop_oldest") or is refused ("drop_newest").
+      Over the global limit, the player with the longest queue gives up an entry.
+    - Rate limiting: a token bucket per player (rate whispers/s, burst) gates when
+      the player's next whisper may start; queued whispers wait rather than drop.
+    - Coalescing: with coalesce on, a whisper from a player who already has one
+      queued (typically because their conversation is in flight) is folded into it,
+      so "come here" / "actually go to the tree" / "hurry" become one turn.
+      coalesce_window additionally holds a player's whisper until they have been
+      quiet that long (at most max_coalesce_delay after the first one).
+
+    put() and done() must run on the event loop thread.
+    """
+
+    def __init__(self, capacity: int = 256, per_player_capacity: int = 8, overflow: str = "merge",
+                 classify: Optional[Callable[[Any], int]] = None, aging: float = 30.0,
+                 cost_chars: int = 200, rate: Optional[float] = None, burst: float = 3.0,
+                 coalesce: bool = True, coalesce_window: float = 0.0, max_coalesce_delay: float = 2.0,
+                 max_coalesced_chars: int = 1000):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        self.capacity = capacity
+        self.per_player_capacity = per_player_capacity
+        self.overflow = overflow
+        self.classify = classify or priority_classifier()
+        self.aging = aging
+        self.cost_chars = cost_chars
+        self.rate = rate
+        self.burst = burst
+        self.coalesce = coalesce
+        self.coalesce_window = coalesce_window
+        self.max_coalesce_delay = max_coalesce_delay
+        self.max_coalesced_chars = max_coalesced_chars
+
+        self._players: Dict[str, _PlayerQueue] = {}
+        self._depth = 0
+        self._virtual_time = 0.0
+        self._changed = asyncio.Event()
+
+        # Metrics
+        self.enqueued = 0
+        self.dequeued = 0
+        self.merged = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.deferred = 0  # waits for a rate limit or coalesce window
+        self._waits: Deque[float] = deque(maxlen=1000)
+
+    # -----------------------------
+    # Producer side
+    # -----------------------------
+    def put(self, whisper) -> bool:
+        """Queue a whisper. Returns False if it was refused (drop_newest on a full queue)."""
+        player = self._players.setdefault(whisper.username, _PlayerQueue(tokens=self.burst))
+        entry = QueuedWhisper(message=whisper, priority=self.classify(whisper), cost=self._cost(whisper))
+        self.enqueued += 1
+
+        if self.coalesce and player.entries and self._can_fold(player.entries[-1], whisper):
+            self._fold(player.entries[-1], entry)
+            self.coalesced += 1
+        elif len(player.entries) >= self.per_player_capacity and not self._make_room(whisper.username):
+            if not self._overflow_into(player, entry):
+                return False
+        elif self._depth >= self.capacity and not self._evict_longest(exclude=None):
+            if not self._overflow_into(player, entry):
+                return False
+        else:
+            player.entries.append(entry)
+            self._depth += 1
+
+        self._changed.set()
+        return True
+
+    def _make_room(self, username: str) -> bool:
+        # Player queue is full: drop_oldest frees a slot, other policies don't
+        if self.overflow != "drop_oldest":
+            return False
+        player = self._players[username]
+        player.entries.popleft()
+        self._depth -= 1
+        self.dropped += 1
+        return True
+
+    def _overflow_into(self, player: _PlayerQueue, entry: QueuedWhisper) -> bool:
+        if self.overflow == "merge" and player.entries and (
+            getattr(player.entries[-1].message, "kind", None) == getattr(entry.message, "kind", None)
+        ):
+            self._fold(player.entries[-1], entry)
+            self.merged += 1
+            return True
+        self.dropped += 1
+        return False
+
+    def _evict_longest(self, exclude: Optional[str]) -> bool:
+        """Global queue full: the longest player queue loses its oldest whisper."""
+        candidates = [(len(p.entries), name) for name, p in self._players.items() if name != exclude and p.entries]
+        if not candidates:
+            return False
+        _, victim = max(candidates)
+        self._players[victim].entries.popleft()
+        self._depth -= 1
+        self.dropped += 1
+        return True
+
+    def _can_fold(self, last: QueuedWhisper, whisper) -> bool:
+        # Only like with like: a delegated task update never merges into a player's whisper
+        return (getattr(last.message, "kind", None) == getattr(whisper, "kind", None)
+                and len(last.message.message) + len(whisper.message) < self.max_coalesced_chars)
+
+    @staticmethod
+    def _fold(last: QueuedWhisper, entry: QueuedWhisper):
+        # Keeps the first whisper's timestamp, so latency still counts from the oldest
+        last.message.message = f"{last.message.message}\n{entry.message.message}"
+        last.priority = min(last.priority, entry.priority)
+        last.cost += entry.cost
+        last.last_arrival = entry.last_arrival
+        last.merged += entry.merged
+
+    def _cost(self, whisper) -> float:
+        return 1.0 + len(whisper.message) / self.cost_chars
+
+    # -----------------------------
+    # Consumer side
+    # -----------------------------
+    async def get(self):
+        """Wait for the next whisper to run. Its player counts as in flight until done()."""
+        while True:
+            self._changed.clear()
+            entry, username, retry_in = self._select(time.monotonic())
+            if entry is not None:
+                self._players[username].in_flight = True
+                self.dequeued += 1
+                self._waits.append(time.monotonic() - entry.enqueued_at)
+                return entry.message
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=retry_in)
+            except asyncio.TimeoutError:
+                pass
+
+    def done(self, username: str):
+        player = self._players.get(username)
+        if player is None:
+            return
+        player.in_flight = False
+        if not player.entries:
+            self._refill(player, time.monotonic())
+            if not self.rate or player.tokens >= self.burst:
+                # Forget idle players once their bucket is full again; the fairness
+                # tag of a returning player restarts at the current virtual time
+                del self._players[username]
+        self._changed.set()
+
+    def _select(self, now: float):
+        best = None
+        best_key = None
+        retry_in: Optional[float] = None
+        idle = []
+        for username, player in self._players.items():
+            if player.in_flight:
+                continue
+            wait = self._refill(player, now)
+            if not player.entries:
+                if not self.rate or player.tokens >= self.burst:
+                    idle.append(username)
+                continue
+            if wait > 0:
+                retry_in = wait if retry_in is None else min(retry_in, wait)
+                continue
+            head = player.entries[0]
+            if self.coalesce_window:
+                settle = min(head.last_arrival + self.coalesce_window,
+                             head.enqueued_at + self.max_coalesce_delay) - now
+                if settle > 0:
+                    retry_in = settle if retry_in is None else min(retry_in, settle)
+                    continue
+            level = head.priority - (int((now - head.enqueued_at) / self.aging) if self.aging else 0)
+            start = max(player.virtual_time, self._virtual_time)
+            key = (level, start, head.enqueued_at)
+            if best_key is None or key < best_key:
+                best, best_key = username, key
+        for username in idle:
+            del self._players[username]
+
+        if best is None:
+            if retry_in is not None:
+                self.deferred += 1
+            return None, None, retry_in
+
+        player = self._players[best]
+        entry = player.entries.popleft()
+        self._depth -= 1
+        start = best_key[1]
+        player.virtual_time = start + entry.cost
+        self._virtual_time = start
+        if self.rate:
+            player.tokens -= 1.0
+        return entry, best, None
+
+    def _refill(self, player: _PlayerQueue, now: float) -> float:
+        """Seconds until the player may start another whisper (0 if now)."""
+        if not self.rate:
+            return 0.0
+        player.tokens = min(self.burst, player.tokens + (now - player.refilled_at) * self.rate)
+        player.refilled_at = now
+        if player.tokens >= 1.0:
+            return 0.0
+        return (1.0 - player.tokens) / self.rate
+
+    # -----------------------------
+    # Metrics
+    # -----------------------------
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def in_flight(self) -> int:
+        return sum(1 for player in self._players.values() if player.in_flight)
+
+    def is_in_flight(self, username: str) -> bool:
+        player = self._players.get(username)
+        return player is not None and player.in_flight
+
+    def depth_by_player(self) -> Dict[str, int]:
+        return {name: len(player.entries) for name, player in self._players.items() if player.entries}
+
+    def metrics(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+        now = time.monotonic()
+        oldest = max((now - p.entries[0].enqueued_at for p in self._players.values() if p.entries), default=0.0)
+        return {
+            "depth": self._depth,
+            "capacity": self.capacity,
+            "players_waiting": sum(1 for p in self._players.values() if p.entries),
+            "in_flight": self.in_flight(),
+            "enqueued": self.enqueued,
+            "dequeued": self.dequeued,
+            "merged": self.merged,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "deferred_waits": self.deferred,
+            "wait_mean_s": round(sum(waits) / len(waits), 4) if waits else 0.0,
+            "wait_p95_s": round(waits[min(len(waits) - 1, int(0.95 * len(waits)))], 4) if waits else 0.0,
+            "oldest_wait_s": round(oldest, 4),
+        }
+
+    def clear(self):
+        self._players.clear()
+        self._depth = 0
@@ -0,0 +1,197 @@
+// Bulk world queries for the Python side.
+// Each Python -> Node call through the `javascript` bridge is a cross-process round
+// trip, so region scans run entirely in Node and come back as one JSON string.
+
+// Snapshot of the cube of blocks within `radius` of the bot, palette encoded.
+// `states` is flattened in x, y, z order (z fastest); each entry indexes `palette`.
+function snapshotRegion(bot, radius) {
+    const origin = bot.entity.position.floored()
+    const size = 2 * radius + 1
+    const palette = []
+    const stateIds = []
+    const paletteIndex = new Map()
+    const states = new Array(size * size * size)
+    const pos = origin.clone()
+
+    let i = 0
+    for (let dx = -radius; dx <= radius; dx++) {
+        for (let dy = -radius; dy <= radius; dy++) {
+            for (let dz = -radius; dz <= radius; dz++) {
+                pos.set(origin.x + dx, origin.y + dy, origin.z + dz)
+                const stateId = bot.world.getBlockStateId(pos)  // undefined in unloaded chunks
+                const key = stateId === undefined ? -1 : stateId
+                let index = paletteIndex.get(key)
+                if (index === undefined) {
+                    index = palette.length
+                    paletteIndex.set(key, index)
+                    stateIds.push(key)
+                    const block = key >= 0 ? bot.registry.blocksByStateId[key] : null
+                    palette.push(block ? block.name : 'unloaded')
+                }
+                states[i++] = index
+            }
+        }
+    }
+
+    return JSON.stringify({
+        origin: { x: origin.x, y: origin.y, z: origin.z },
+        radius,
+        palette,
+        stateIds,
+        states
+    })
+}
+
+// Streams entity changes to Python in batches: spawn/move/update/gone events are
+// collected in Node and flushed every `intervalMs` as one JSON string, instead of
+// Python reading each moved entity's fields over the bridge.
+function watchEntities(bot, onBatch, intervalMs = 100) {
+    const pending = new Map()  // id -> record, or null once gone
+
+    const upsert = (entity) => {
+        if (!entity || entity === bot.entity || !entity.position) return
+        pending.set(entity.id, {
+            id: entity.id,
+            type: entity.type,
+            name: entity.name || entity.displayName || entity.username || 'unknown',
+            x: entity.position.x,
+            y: entity.position.y,
+            z: entity.position.z
+        })
+    }
+    const gone = (entity) => { if (entity) pending.set(entity.id, null) }
+
+    for (const entity of Object.values(bot.entities)) upsert(entity)
+    bot.on('entitySpawn', upsert)
+    bot.on('entityMoved', upsert)
+    bot.on('entityUpdate', upsert)
+    bot.on('entityGone', gone)
+
+    const flush = () => {
+        if (pending.size === 0) return
+        const batch = []
+        for (const [id, record] of pending) batch.push(record || { id, gone: true })
+        pending.clear()
+        onBatch(JSON.stringify(batch))
+    }
+    flush()
+    const timer = setInterval(flush, intervalMs)
+
+    return {
+        stop() {
+            clearInterval(timer)
+            bot.removeListener('entitySpawn', upsert)
+            bot.removeListener('entityMoved', upsert)
+            bot.removeListener('entityUpdate', upsert)
+            bot.removeListener('entityGone', gone)
+        }
+    }
+}
+
+// Streams the game context (position, health, food, time, weather) to Python.
+// move/health/time/rain events only mark it dirty; every `intervalMs` the context
+// is read inside Node and sent as one JSON string, and only when it changed.
+function watchContext(bot, onChange, intervalMs = 250) {
+    let dirty = true
+    let lastSent = null
+    const markDirty = () => { dirty = true }
+    const events = ['move', 'health', 'time', 'rain', 'weatherUpdate', 'spawn', 'respawn']
+    for (const event of events) bot.on(event, markDirty)
+
+    const read = () => {
+        const pos = bot.entity.position
+        return {
+            position: { x: Math.round(pos.x), y: Math.round(pos.y), z: Math.round(pos.z) },
+            health: bot.health,
+            food: bot.food,
+            time: bot.time ? bot.time.timeOfDay : null,
+            weather: bot.thunderState > 0 ? 'thunder' : (bot.isRaining ? 'rain' : 'clear')
+        }
+    }
+
+    const flush = () => {
+        if (!dirty || !bot.entity || !bot.entity.position) return
+        dirty = false
+        const payload = JSON.stringify(read())
+        if (payload !== lastSent) {
+            lastSent = payload
+            onChange(payload)
+        }
+    }
+    flush()
+    const timer = setInterval(flush, intervalMs)
+
+    return {
+        stop() {
+            clearInterval(timer)
+            for (const event of events) bot.removeListener(event, markDirty)
+        }
+    }
+}
+
+// Reports which kinds of world state changed, for invalidating cached tool results.
+// Events only add their group to a pending set; every `intervalMs` the set is sent
+// as one JSON array, so a stream of move or blockUpdate events costs one call.
+function watchChanges(bot, onChange, intervalMs = 100) {
+    const groups = {
+        position: ['move', 'forcedMove', 'spawn', 'respawn'],
+        blocks: ['blockUpdate', 'chunkColumnLoad'],
+        entities: ['entitySpawn', 'entityGone', 'entityMoved'],
+        status: ['health', 'time', 'rain', 'weatherUpdate'],
+    }
+    const pending = new Set()
+    const listeners = []
+    const listen = (emitter, event, group) => {
+        const mark = () => { pending.add(group) }
+        emitter.on(event, mark)
+        listeners.push([emitter, event, mark])
+    }
+    for (const [group, events] of Object.entries(groups)) {
+        for (const event of events) listen(bot, event, group)
+    }
+    listen(bot, 'respawn', 'inventory')
+    // Results laid out around the bot's block (look_around) only go stale when it
+    // enters another block, not on every sub-block move or head turn
+    let lastBlock = null
+    const markBlock = () => {
+        if (!bot.entity || !bot.entity.position) return
+        const p = bot.entity.position.floored()
+        const key = `${p.x},${p.y},${p.z}`
+        if (key !== lastBlock) {
+            lastBlock = key
+            pending.add('block_position')
+        }
+    }
+    for (const event of groups.position) {
+        bot.on(event, markBlock)
+        listeners.push([bot, event, markBlock])
+    }
+    // bot.inventory may not exist until the bot has spawned
+    let inventory = null
+    const watchInventory = () => {
+        if (inventory || !bot.inventory) return
+        inventory = bot.inventory
+        listen(inventory, 'updateSlot', 'inventory')
+        pending.add('inventory')
+    }
+    watchInventory()
+    bot.on('spawn', watchInventory)
+
+    const flush = () => {
+        if (pending.size === 0) return
+        const changed = JSON.stringify([...pending])
+        pending.clear()
+        onChange(changed)
+    }
+    const timer = setInterval(flush, intervalMs)
+
+    return {
+        stop() {
+            clearInterval(timer)
+            bot.removeListener('spawn', watchInventory)
+            for (const [emitter, event, mark] of listeners) emitter.removeListener(event, mark)
+        }
+    }
+}
+
+module.exports = { snapshotRegion, watchEntities, watchContext, watchChanges }
@@ -0,0 +1,123 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from bridge_profiler import unwrap
+
+AIR_BLOCKS = ("air", "cave_air", "void_air")
+# Palette entry world_query.js uses for cells in chunks the client hasn't loaded
+UNLOADED = "unloaded"
+# A radius-r snapshot holds (2r + 1)^3 block states, serialized across the bridge
+MAX_SNAPSHOT_RADIUS = 16
+
+_world_query = None
+
+
+def load_world_query():
+    # Loaded lazily so this module (and VoxelSnapshot) work without a Node bridge
+    global _world_query
+    if _world_query is None:
+        from javascript import require
+        _world_query = require('./world_query.js')
+    return _world_query
+
+
+def fetch_snapshot(bot, radius: int = 5) -> "VoxelSnapshot":
+    """Scan the cube around the bot in a single bridge round trip."""
+    radius = int(radius)
+    if not 1 <= radius <= MAX_SNAPSHOT_RADIUS:
+        raise ValueError(f"Snapshot radius must be between 1 and {MAX_SNAPSHOT_RADIUS}, got {radius}")
+    payload = load_world_query().snapshotRegion(unwrap(bot), radius)
+    return VoxelSnapshot.from_json(payload)
+
+
+# -----------------------------
+# Region snapshot
+# -----------------------------
+@dataclass
+class VoxelSnapshot:
+    origin: Dict[str, int]  # block position the scan is centred on
+    radius: int
+    palette: List[str]  # block names, indexed by `states`
+    states: np.ndarray  # (size, size, size) palette indices, axes x, y, z
+    state_ids: Optional[List[int]] = None  # block-state id per palette entry
+
+    @classmethod
+    def from_json(cls, payload: str) -> "VoxelSnapshot":
+        data = json.loads(payload)
+        size = 2 * data["radius"] + 1
+        dtype = np.uint8 if len(data["palette"]) <= 256 else np.uint16
+        states = np.asarray(data["states"], dtype=dtype).reshape(size, size, size)
+        return cls(
+            origin=data["origin"],
+            radius=data["radius"],
+            palette=data["palette"],
+            states=states,
+            state_ids=data.get("stateIds"),
+        )
+
+    @property
+    def size(self) -> int:
+        return 2 * self.radius + 1
+
+    def offsets(self) -> np.ndarray:
+        """(3, size, size, size) relative x/y/z offset of every cell."""
+        return np.indices(self.states.shape) - self.radius
+
+    def mask(self, names: Optional[Iterable[str]] = None, exclude: Iterable[str] = AIR_BLOCKS) -> np.ndarray:
+        """Boolean mask of cells whose block name is in `names` (any, if None) and not in `exclude`."""
+        wanted = set(names) if names is not None else None
+        excluded = set(exclude)
+        keep = [
+            i for i, name in enumerate(self.palette)
+            if name not in excluded and name != UNLOADED and (wanted is None or name in wanted)
+        ]
+        return np.isin(self.states, keep)
+
+    def blocks(self, names: Optional[Iterable[str]] = None, max_distance: Optional[float] = None,
+               limit: Optional[int] = None, exclude: Iterable[str] = AIR_BLOCKS) -> List[Dict[str, Any]]:
+        """Matching blocks nearest-first, with positions relative to the origin."""
+        mask = self.mask(names, exclude)
+        coords = np.argwhere(mask) - self.radius  # (n, 3) relative offsets
+        if not len(coords):
+            return []
+        dist_sq = (coords ** 2).sum(axis=1)
+        if max_distance is not None:
+            within = dist_sq <= max_distance ** 2
+            coords, dist_sq = coords[within], dist_sq[within]
+        order = np.argsort(dist_sq, kind="stable")
+        if limit is not None:
+            order = order[:limit]
+
+        cells = self.states[mask]
+        if max_distance is not None:
+            cells = cells[within]
+        return [
+            {
+                "name": self.palette[int(cells[i])],
+                "position": {"x": int(coords[i][0]), "y": int(coords[i][1]), "z": int(coords[i][2])},
+                "distance": round(float(np.sqrt(dist_sq[i])), 2),
+            }
+            for i in order
+        ]
+
+    def nearest(self, name: str) -> Optional[Dict[str, Any]]:
+        found = self.blocks(names=[name], limit=1)
+        return found[0] if found else None
+
+    def counts(self, exclude: Iterable[str] = AIR_BLOCKS) -> Dict[str, int]:
+        """Number of cells per block name. Unloaded cells aren't blocks; see unloaded()."""
+        tally = np.bincount(self.states.ravel(), minlength=len(self.palette))
+        excluded = set(exclude) | {UNLOADED}
+        return {
+            name: int(tally[i]) for i, name in enumerate(self.palette)
+            if tally[i] and name not in excluded
+        }
+
+    def unloaded(self) -> int:
+        """Number of cells in chunks that aren't loaded."""
+        if UNLOADED not in self.palette:
+            return 0
+        return int(np.count_nonzero(self.states == self.palette.index(UNLOADED)))
@@ -0,0 +1,114 @@
+"""
+Calls/sec against the local mcp-server.py, with and without session pooling.
+
+- per-call: a fresh Client session per call, as mcp-client.py used to do
+  (HTTP session + initialize handshake every time)
+- pooled: MCPSessionPool with persistent sessions shared by all callers
+
+    python mcp-server.py &
+    python bench_client_pool.py --calls 300 --concurrency 8
+    python bench_client_pool.py --spawn           # start mcp-server.py itself
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from fastmcp import Client
+
+from client_pool import MCPSessionPool
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mcp-server.py")
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else float("nan")
+
+
+async def run_mode(call, calls: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    remaining = iter(range(calls))
+
+    async def caller():
+        for _ in remaining:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "calls_per_s": calls / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+    }
+
+
+async def bench(args) -> Dict[str, Dict[str, float]]:
+    arguments = {"n_dice": 3}
+
+    async def per_call():
+        async with Client(args.url) as client:
+            await client.call_tool(args.tool, arguments)
+
+    results = {}
+    await per_call()  # warm up the server
+    results["per-call"] = await run_mode(per_call, args.calls, args.concurrency)
+    async with MCPSessionPool(args.url, size=args.sessions) as pool:
+        await pool.call_tool(args.tool, arguments)
+        results["pooled"] = await run_mode(lambda: pool.call_tool(args.tool, arguments),
+                                           args.calls, args.concurrency)
+        results["pooled"]["reconnects"] = pool.stats.reconnects
+    return results
+
+
+async def wait_for_server(url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with Client(url) as client:
+                await client.list_tools()
+            return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000/mcp/")
+    parser.add_argument("--tool", default="roll_dice")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=2, help="pooled sessions")
+    parser.add_argument("--spawn", action="store_true", help="start mcp-server.py for the run")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, SERVER_SCRIPT], stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.DEVNULL)
+    try:
+        asyncio.run(wait_for_server(args.url))
+        results = asyncio.run(bench(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(10)
+
+    print(f"{args.calls} calls of {args.tool}, concurrency {args.concurrency}")
+    for mode, stats in results.items():
+        print(f"{mode:>9}: {stats['calls_per_s']:7.1f} calls/s, p50 {stats['p50_ms']:6.1f} ms, "
+              f"p95 {stats['p95_ms']:6.1f} ms")
+    print(f"Speedup: {results['pooled']['calls_per_s'] / results['per-call']['calls_per_s']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
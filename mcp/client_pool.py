@@ -0,0 +1,215 @@
+"""
+Pool of persistent, initialized MCP client sessions.
+
+Opening a fastmcp Client per call costs an HTTP session plus the MCP initialize
+handshake every time. The pool opens `size` sessions once and keeps them:
+
+- call_tool() picks the least busy session. Each session multiplexes up to
+  max_in_flight concurrent requests (streamable HTTP matches responses by id).
+- A session that fails with a connection error is reopened, and the call is
+  retried once on the fresh session. Set retry=False for tools that must not
+  run twice.
+- list_tools() is cached for tools_ttl seconds, or until refresh=True.
+
+    async with MCPSessionPool("http://127.0.0.1:8000/mcp/", size=2) as pool:
+        result = await pool.call_tool("roll_dice", {"n_dice": 3})
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import anyio
+import httpx
+from fastmcp import Client
+from mcp.types import CONNECTION_CLOSED
+
+# Failures that mean the session (not the tool) is broken
+CONNECTION_ERRORS = (
+    httpx.TransportError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    # The SDK reports a dropped stream as an MCP error with code CONNECTION_CLOSED
+    code = getattr(getattr(error, "error", None), "code", None)
+    return isinstance(error, CONNECTION_ERRORS) or code == CONNECTION_CLOSED
+
+
+@dataclass
+class PoolStats:
+    calls: int = 0
+    errors: int = 0
+    reconnects: int = 0
+    retries: int = 0
+    tool_list_hits: int = 0
+    tool_list_misses: int = 0
+    max_in_flight: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+@dataclass
+class _PooledSession:
+    index: int
+    client: Optional[Client] = None
+    in_flight: int = 0
+    generation: int = 0  # bumped on every reconnect
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    slots: Optional[asyncio.Semaphore] = None
+
+
+class MCPSessionPool:
+    """
+    - target: server URL (or anything fastmcp.Client accepts)
+    - size: persistent sessions to keep open
+    - max_in_flight: concurrent requests per session; callers wait beyond that
+    - client_factory: builds a Client for target, e.g. to pass auth or timeouts
+    """
+
+    def __init__(self, target: Any, size: int = 2, max_in_flight: int = 16, tools_ttl: float = 300.0,
+                 client_factory: Optional[Callable[[Any], Client]] = None):
+        self.target = target
+        self.size = size
+        self.max_in_flight = max_in_flight
+        self.tools_ttl = tools_ttl
+        self.client_factory = client_factory or Client
+        self.stats = PoolStats()
+        self._sessions = [_PooledSession(index=i) for i in range(size)]
+        self._tools: Optional[List[Any]] = None
+        self._tools_at = 0.0
+        self._tools_lock: Optional[asyncio.Lock] = None
+        self._in_flight = 0
+
+    async def __aenter__(self) -> "MCPSessionPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        """Open every session up front, so the first calls don't pay for the handshakes."""
+        await asyncio.gather(*(self._ensure_connected(session) for session in self._sessions))
+
+    async def close(self):
+        for session in self._sessions:
+            async with session.lock:
+                await self._disconnect(session)
+
+    # -----------------------------
+    # Calls
+    # -----------------------------
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None,
+                        timeout: Optional[float] = None, progress_handler=None, retry: bool = True):
+        """Same as Client.call_tool, on a pooled session."""
+        session = self._pick()
+        if session.slots is None:
+            session.slots = asyncio.Semaphore(self.max_in_flight)
+        async with session.slots:
+            session.in_flight += 1
+            self._in_flight += 1
+            self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+            self.stats.calls += 1
+            try:
+                return await self._call(session, name, arguments, timeout, progress_handler, retry)
+            finally:
+                session.in_flight -= 1
+                self._in_flight -= 1
+
+    async def _call(self, session: _PooledSession, name, arguments, timeout, progress_handler, retry: bool):
+        attempts = 2 if retry else 1
+        for attempt in range(attempts):
+            client, generation = await self._ensure_connected(session)
+            try:
+                return await client.call_tool(name, arguments or {}, timeout=timeout,
+                                              progress_handler=progress_handler)
+            except Exception as e:
+                if not is_connection_error(e):
+                    self.stats.errors += 1
+                    raise
+                await self._reset(session, generation)
+                if attempt + 1 == attempts:
+                    self.stats.errors += 1
+                    raise
+                self.stats.retries += 1
+
+    async def list_tools(self, refresh: bool = False) -> List[Any]:
+        """The server's tools, fetched once per tools_ttl seconds and shared by all callers."""
+        if self._tools_lock is None:
+            self._tools_lock = asyncio.Lock()
+        async with self._tools_lock:
+            fresh = self._tools is not None and time.monotonic() - self._tools_at < self.tools_ttl
+            if fresh and not refresh:
+                self.stats.tool_list_hits += 1
+                return self._tools
+            self.stats.tool_list_misses += 1
+            session = self._pick()
+            for attempt in range(2):
+                client, generation = await self._ensure_connected(session)
+                try:
+                    self._tools = await client.list_tools()
+                    break
+                except Exception as e:
+                    if attempt or not is_connection_error(e):
+                        raise
+                    await self._reset(session, generation)
+            self._tools_at = time.monotonic()
+            return self._tools
+
+    def invalidate_tools(self):
+        self._tools = None
+
+    # -----------------------------
+    # Sessions
+    # -----------------------------
+    def _pick(self) -> _PooledSession:
+        # Least busy; ties go to the lowest index, so light traffic stays on one session
+        return min(self._sessions, key=lambda session: session.in_flight)
+
+    async def _ensure_connected(self, session: _PooledSession):
+        client = session.client
+        if client is not None and client.is_connected():
+            return client, session.generation
+        async with session.lock:
+            if session.client is None or not session.client.is_connected():
+                await self._disconnect(session)
+                client = self.client_factory(self.target)
+                await client.__aenter__()
+                if session.generation:
+                    self.stats.reconnects += 1
+                session.client = client
+                session.generation += 1
+                # The server may have restarted with different tools
+                self._tools = None
+            return session.client, session.generation
+
+    async def _reset(self, session: _PooledSession, generation: int):
+        """Drop a broken session, unless a concurrent caller already replaced it."""
+        async with session.lock:
+            if session.generation == generation:
+                await self._disconnect(session)
+
+    @staticmethod
+    async def _disconnect(session: _PooledSession):
+        client, session.client = session.client, None
+        if client is not None:
+            try:
+                await client.__aexit__(None, None, None)
+            except Exception:
+                pass
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            **self.stats.as_dict(),
+            "sessions": [
+                {"connected": s.client is not None and s.client.is_connected(), "in_flight": s.in_flight,
+                 "connects": s.generation}
+                for s in self._sessions
+            ],
+        }
@@ -1,11 +1,16 @@
 import asyncio
-from fastmcp import Client
+from client_pool import MCPSessionPool
 
-client = Client("http://127.0.0.1:8000/mcp/")
+# Initialized sessions are kept open and reused by every call
+pool = MCPSessionPool("http://127.0.0.1:8000/mcp/")
 
-async def call_tool(name: str):
-    async with client:
-        result = await client.call_tool(name, {"name": name})
-        print(result)
+async def call_tool(name: str, arguments: dict):
+    result = await pool.call_tool(name, arguments)
+    print(result)
 
-asyncio.run(call_tool("roll_dice"))
\ No newline at end of file
+async def main():
+    async with pool:
+        print([tool.name for tool in await pool.list_tools()])
+        await call_tool("roll_dice", {"n_dice": 3})
+
+asyncio.run(main())
@@ -0,0 +1,193 @@
+"""
+MCP server for one Minecraft bot: every MinecraftBot tool (look_around,
+get_inventory, mine_block, place_block, craft_item...) plus move_to, published
+over FastMCP HTTP. Several agent processes can drive one bot connection and
+one Node bridge through it, instead of each logging in its own bot.
+
+- Tools are generated from MinecraftBot.tool_registry, so the MCP schemas are
+  the same strict schemas the function-calling agent sends to the model.
+- Calls run concurrently, within a session and across sessions. Exclusive tools
+  (movement, digging, placing...) take turns on the bot's body in FIFO order.
+  Read-only tools never wait for them.
+- Long actions send progress notifications while they run. move_to reports the
+  fraction of the distance covered, other actions report elapsed seconds, and
+  a call queued behind others says so first.
+
+    python minecraft-mcp-server.py --username MCPBot --mc-host localhost --port 8002
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import traceback
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from fastmcp import FastMCP
+from fastmcp.exceptions import ToolError
+from fastmcp.server.dependencies import get_context
+from fastmcp.tools import Tool, ToolResult
+from mcp.types import ToolAnnotations
+from pydantic import PrivateAttr
+
+# The bot code lives next door in function-calling/, which isn't a package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "function-calling"))
+
+from actions import ActionTracker  # noqa: E402
+from tool_registry import ToolArgumentError, ToolRegistry, ToolSpec, UnknownToolError, tool  # noqa: E402
+
+# MCP context of the call being served, for tools that report their own progress
+_request_context: ContextVar[Optional[Any]] = ContextVar("minecraft_mcp_context", default=None)
+
+
+class BotTool(Tool):
+    """A ToolSpec served over MCP; calls go through MinecraftToolServer.call."""
+    _spec: ToolSpec = PrivateAttr()
+    _server: Any = PrivateAttr()
+
+    @classmethod
+    def from_spec(cls, spec: ToolSpec, server: "MinecraftToolServer") -> "BotTool":
+        bot_tool = cls(
+            name=spec.name,
+            description=spec.description,
+            parameters=spec.schema["parameters"],
+            annotations=ToolAnnotations(readOnlyHint=not spec.exclusive),
+        )
+        bot_tool._spec = spec
+        bot_tool._server = server
+        return bot_tool
+
+    async def run(self, arguments: Dict[str, Any]) -> ToolResult:
+        result = await self._server.call(self._spec, arguments, get_context())
+        return ToolResult(content=json.dumps(result, default=str), structured_content=result)
+
+
+class MinecraftToolServer:
+    """
+    Runs MinecraftBot tools for MCP clients.
+
+    - minecraft: a MinecraftBot (or anything with @tool methods) wrapping the bot
+    - GoalNear: pathfinder goal class used by move_to
+    - progress_interval: seconds between progress notifications
+    """
+
+    def __init__(self, minecraft, GoalNear, move_timeout: float = 60.0, progress_interval: float = 1.0,
+                 name: str = "Minecraft Bot"):
+        self.minecraft = minecraft
+        self.GoalNear = GoalNear
+        self.progress_interval = progress_interval
+        self.actions = ActionTracker(minecraft.bot, progress_interval=progress_interval,
+                                     default_timeout=move_timeout)
+        self.tools = ToolRegistry.combine(
+            ToolRegistry.from_class(type(minecraft)).bind(minecraft),
+            ToolRegistry.from_class(MinecraftToolServer).bind(self),
+        )
+        # One body: exclusive tools run one at a time, in arrival order (asyncio.Lock is FIFO)
+        self._body_lock = asyncio.Lock()
+        self._waiting = 0
+        self.mcp = FastMCP(name=name)
+        for spec_name in self.tools.names():
+            self.mcp.add_tool(BotTool.from_spec(self.tools.get(spec_name), self))
+
+    async def call(self, spec: ToolSpec, arguments: Dict[str, Any], ctx) -> Dict[str, Any]:
+        try:
+            spec.validate(arguments)  # fail bad calls before they queue for the body
+        except ToolArgumentError as e:
+            raise ToolError(str(e))
+        token = _request_context.set(ctx)
+        try:
+            if spec.exclusive:
+                if self._body_lock.locked():
+                    await ctx.report_progress(0, None, f"Waiting for {self._waiting + 1} earlier action(s)")
+                self._waiting += 1
+                try:
+                    await self._body_lock.acquire()
+                finally:
+                    self._waiting -= 1
+                try:
+                    result = await self._run(spec, arguments, ctx)
+                finally:
+                    self._body_lock.release()
+            else:
+                result = await self._run(spec, arguments, ctx)
+        finally:
+            _request_context.reset(token)
+        if isinstance(result, dict) and result.get("status") == "error":
+            raise ToolError(json.dumps(result, default=str))
+        return result if isinstance(result, dict) else {"status": "success", "result": result}
+
+    async def _run(self, spec: ToolSpec, arguments: Dict[str, Any], ctx):
+        call = asyncio.ensure_future(self.tools.dispatch(spec.name, arguments))
+        try:
+            if spec.exclusive and not spec.metadata.get("reports_progress"):
+                # Elapsed-time progress for actions that can't measure their own
+                started = time.monotonic()
+                while not call.done():
+                    await asyncio.wait({call}, timeout=self.progress_interval)
+                    if not call.done():
+                        elapsed = time.monotonic() - started
+                        await ctx.report_progress(elapsed, None, f"{spec.name} running for {elapsed:.0f}s")
+            return await call
+        except (UnknownToolError, ToolArgumentError) as e:
+            raise ToolError(str(e))
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except ToolError:
+            raise
+        except Exception as e:
+            traceback.print_exc()
+            raise ToolError(f"{spec.name} failed: {e}")
+
+    # -----------------------------
+    # Server tools
+    # -----------------------------
+    @tool(
+        description=(
+            "Move the bot to a specific position in the world. Reports progress while moving and "
+            "returns once the bot has arrived or the move failed, with the final outcome and position"
+        ),
+        params={"timeout": "Seconds to wait before giving up"},
+        exclusive=True,
+        reports_progress=True
+    )
+    async def move_to(self, x: float, y: float, z: float, timeout: Optional[float] = None) -> Dict[str, Any]:
+        ctx = _request_context.get()
+        pending = set()
+
+        def report_progress(action):
+            if ctx is not None:
+                message = f"{action.progress:.0%} of the way to ({x}, {y}, {z}) after {action.elapsed:.0f}s"
+                update = asyncio.ensure_future(ctx.report_progress(action.progress, 1.0, message))
+                pending.add(update)
+                update.add_done_callback(pending.discard)
+
+        result = await self.actions.move_to(x, y, z, self.GoalNear(x, y, z, 1), timeout=timeout,
+                                            on_progress=report_progress)
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--username", default="MCPBot")
+    parser.add_argument("--mc-host", default="localhost")
+    parser.add_argument("--mc-port", type=int, default=25565)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--move-timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    # Imported here: this starts the Node bridge and connects the bot
+    from functions import MinecraftBot, goals
+
+    minecraft = MinecraftBot(args.username, args.mc_host, args.mc_port, move_timeout=args.move_timeout)
+    server = MinecraftToolServer(minecraft, goals.GoalNear, move_timeout=args.move_timeout)
+    server.mcp.run(transport="http", host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# client_pool.py sits in mcp/, which isn't a package (and would shadow the mcp SDK if it were)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
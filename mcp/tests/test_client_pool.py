@@ -0,0 +1,142 @@
+import asyncio
+
+import anyio
+import pytest
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+
+from client_pool import MCPSessionPool, is_connection_error
+
+server = FastMCP("pool-test")
+
+
+@server.tool
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+@server.tool
+async def slow_echo(text: str) -> str:
+    await asyncio.sleep(0.1)
+    return text
+
+
+@server.tool
+def broken() -> str:
+    raise ValueError("tool bug")
+
+
+class Factory:
+    """client_factory over the in-memory transport; drop_next makes calls fail like a dropped connection."""
+
+    def __init__(self):
+        self.clients = []
+        self.drop_next = 0
+
+    def __call__(self, target):
+        factory = self
+
+        class DroppingClient(Client):
+            async def call_tool(self, *args, **kwargs):
+                if factory.drop_next:
+                    factory.drop_next -= 1
+                    raise anyio.ClosedResourceError()
+                return await super().call_tool(*args, **kwargs)
+
+        client = DroppingClient(target)
+        self.clients.append(client)
+        return client
+
+
+def run(body, size=2, **options):
+    factory = Factory()
+
+    async def main():
+        async with MCPSessionPool(server, size=size, client_factory=factory, **options) as pool:
+            return await body(pool)
+
+    return asyncio.run(main()), factory
+
+
+def test_sessions_are_opened_once_and_reused():
+    async def body(pool):
+        return [(await pool.call_tool("add", {"a": i, "b": 1})).data for i in range(10)], pool.status()
+
+    (results, status), factory = run(body)
+    assert results == list(range(1, 11))
+    assert len(factory.clients) == 2
+    assert [session["connects"] for session in status["sessions"]] == [1, 1]
+    assert status["calls"] == 10 and status["reconnects"] == 0
+
+
+def test_concurrency_is_capped_per_session():
+    async def body(pool):
+        results = await asyncio.gather(*(pool.call_tool("slow_echo", {"text": str(i)}) for i in range(8)))
+        return [result.data for result in results], pool.stats
+
+    (results, stats), factory = run(body, size=2, max_in_flight=2)
+    assert results == [str(i) for i in range(8)]
+    assert len(factory.clients) == 2
+    assert stats.max_in_flight == 4
+
+
+def test_dropped_session_is_reopened_and_the_call_retried():
+    async def body(pool):
+        pool.client_factory.drop_next = 1
+        result = await pool.call_tool("add", {"a": 2, "b": 2})
+        return result.data, pool.status()
+
+    (result, status), factory = run(body, size=1)
+    assert result == 4
+    assert (status["retries"], status["reconnects"], status["errors"]) == (1, 1, 0)
+    assert len(factory.clients) == 2
+    assert status["sessions"] == [{"connected": True, "in_flight": 0, "connects": 2}]
+
+
+def test_no_retry_when_disabled():
+    async def body(pool):
+        pool.client_factory.drop_next = 1
+        with pytest.raises(anyio.ClosedResourceError):
+            await pool.call_tool("add", {"a": 1, "b": 1}, retry=False)
+        # The next call gets a fresh session
+        return (await pool.call_tool("add", {"a": 1, "b": 1})).data, pool.stats
+
+    (result, stats), _ = run(body, size=1)
+    assert result == 2
+    assert (stats.errors, stats.retries, stats.reconnects) == (1, 0, 1)
+
+
+def test_closed_session_reconnects_on_next_use():
+    async def body(pool):
+        await pool._sessions[0].client.__aexit__(None, None, None)
+        return (await pool.call_tool("add", {"a": 1, "b": 2})).data, pool.stats
+
+    (result, stats), _ = run(body, size=1)
+    assert result == 3
+    assert stats.reconnects == 1 and stats.retries == 0
+
+
+def test_tool_errors_are_not_retried():
+    async def body(pool):
+        with pytest.raises(ToolError) as raised:
+            await pool.call_tool("broken")
+        return raised.value, pool.stats
+
+    (error, stats), factory = run(body, size=1)
+    assert not is_connection_error(error)
+    assert (stats.errors, stats.retries, stats.reconnects) == (1, 0, 0)
+    assert len(factory.clients) == 1
+
+
+def test_tool_list_is_cached_until_a_reconnect():
+    async def body(pool):
+        first = await pool.list_tools()
+        await pool.list_tools()
+        pool.client_factory.drop_next = 1
+        await pool.call_tool("add", {"a": 0, "b": 0})  # reconnects: the server may have new tools
+        await pool.list_tools()
+        return sorted(tool.name for tool in first), pool.stats
+
+    (names, stats), _ = run(body, size=1)
+    assert names == ["add", "broken", "slow_echo"]
+    assert (stats.tool_list_hits, stats.tool_list_misses) == (1, 2)